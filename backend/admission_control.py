@@ -0,0 +1,77 @@
+"""
+Admission control and load shedding for trt_infer.py
+
+Decides at the door whether a request (or /stream frame) may enter the
+inference queue, from per-endpoint concurrency limits, the images in
+flight and the scheduler's queue depth. Needs only the scheduler's
+queue_depth() and batch_seconds, so it imports (and is tested) without
+TensorRT.
+"""
+import math
+import threading
+
+
+class Rejected(Exception):
+    """Admission refused: status is 429 or 503"""
+    def __init__(self, status, reason, retry_after):
+        super().__init__(reason)
+        self.status = status
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Bounds concurrent requests per endpoint and images / queued batches
+    overall, so an overloaded server answers at once with 429/503 and a
+    Retry-After instead of queueing work that clients will give up on.
+    """
+    def __init__(self, scheduler, limits, max_images, max_batches):
+        self.scheduler = scheduler
+        self.limits = limits
+        self.max_images = max_images
+        self.max_batches = max_batches
+        self.lock = threading.Lock()
+        self.active = {}  # endpoint -> admitted requests
+        self.images = 0
+        self.shed = {}  # "endpoint:reason" -> count
+
+    def admit(self, endpoint, images):
+        """Reserve capacity for a request or raise Rejected"""
+        with self.lock:
+            active = self.active.get(endpoint, 0)
+            if active >= self.limits.get(endpoint, math.inf):
+                status, reason = 429, "too_many_requests"
+            elif self.images and self.images + images > self.max_images:
+                # A request bigger than the whole budget still runs alone
+                status, reason = 503, "too_many_images"
+            elif self.scheduler.queue_depth() >= self.max_batches:
+                status, reason = 503, "queue_full"
+            else:
+                self.active[endpoint] = active + 1
+                self.images += images
+                return
+            self.count(endpoint, reason)
+        raise Rejected(status, reason, self.retry_after())
+
+    def release(self, endpoint, images):
+        with self.lock:
+            self.active[endpoint] -= 1
+            self.images -= images
+
+    def count(self, endpoint, reason):
+        key = f"{endpoint}:{reason}"
+        self.shed[key] = self.shed.get(key, 0) + 1
+
+    def retry_after(self):
+        """Seconds until the current queue should have drained"""
+        return max(1, math.ceil(self.scheduler.queue_depth() * self.scheduler.batch_seconds))
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "active": dict(self.active),
+                "inflight_images": self.images,
+                "limits": dict(self.limits, images=self.max_images, queued_batches=self.max_batches),
+                "shed": dict(self.shed)
+            }
@@ -1,29 +1,241 @@
 import os
+
+# Socket.IO server mode: 'threading' (development) or 'eventlet' / 'gevent'
+# for production serving of many concurrent streams. Green-thread modes
+# must patch the standard library before anything else is imported.
+ASYNC_MODE = os.environ.get('SOCKETIO_ASYNC_MODE', 'threading')
+BLOCKING_WORKERS = int(os.environ.get('BLOCKING_WORKERS', 16))
+if ASYNC_MODE == 'eventlet':
+    os.environ.setdefault('EVENTLET_THREADPOOL_SIZE', str(BLOCKING_WORKERS))
+    import eventlet
+    import eventlet.tpool
+    eventlet.monkey_patch()
+elif ASYNC_MODE == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+    import gevent
+
 import uuid
-from datetime import datetime
-from flask import Flask, request, jsonify, send_from_directory
+import time
+import hashlib
+from datetime import datetime, timedelta
+from flask import Flask, Response, request, jsonify, send_from_directory, send_file, make_response, abort, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit, join_room
 from werkzeug.utils import secure_filename
+from werkzeug.security import safe_join
+from urllib.parse import quote
+import mimetypes
+from sqlalchemy import text, inspect, event, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import multiprocessing
+import sqlite3
+from sqlalchemy.orm import deferred
+from PIL import Image
+import io
+import csv
+import json
 import base64
 import random
+import difflib
+import numpy as np
+import threading
+import heapq
+import functools
+import itertools
+import bisect
+import math
+from collections import namedtuple
+from session_store import create_session_store
+from response_cache import ResponseCache
+from transcript_archive import pack_words, start_time_range, unpack_words
 
 app = Flask(__name__)
 CORS(app)
 
 # Configuration
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///recordings.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///recordings.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    # One connection per blocking worker, plus some for REST requests
+    'poolclass': QueuePool,
+    'pool_size': BLOCKING_WORKERS,
+    'max_overflow': 8,
+    'connect_args': {'timeout': 30} if app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite') else {}
+}
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 500 * 1024 * 1024  # 500MB max file size
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 
-# Ensure upload folder exists
+# Chunked uploads: partial files live here until finalized
+app.config['PARTIAL_UPLOAD_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'partial')
+app.config['UPLOAD_CHUNK_SIZE'] = 8 * 1024 * 1024  # suggested chunk size for clients
+app.config['UPLOAD_BUFFER_SIZE'] = 1024 * 1024  # bytes read from the socket at a time
+app.config['UPLOAD_STALE_AFTER'] = 24 * 60 * 60  # seconds without progress
+app.config['UPLOAD_CLEANUP_INTERVAL'] = 10 * 60  # seconds
+
+# Serving /uploads: cache lifetime, and optional offload to the front end.
+# UPLOAD_ACCEL_REDIRECT_PREFIX is an nginx `internal` location aliased to
+# UPLOAD_FOLDER; USE_X_SENDFILE is Flask's own switch for Apache/lighttpd.
+app.config['UPLOAD_CACHE_MAX_AGE'] = 7 * 24 * 60 * 60  # seconds
+app.config['UPLOAD_ACCEL_REDIRECT_PREFIX'] = os.environ.get('UPLOAD_ACCEL_REDIRECT_PREFIX')
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE') == '1'
+
+# Thumbnails are decoded once and stored as fixed-size JPEG variants
+app.config['THUMBNAIL_FOLDER'] = 'thumbnails'
+app.config['THUMBNAIL_SIZES'] = {'sm': (160, 90), 'md': (320, 180), 'lg': (640, 360)}
+app.config['THUMBNAIL_QUALITY'] = 80
+app.config['THUMBNAIL_CACHE_MAX_AGE'] = 365 * 24 * 60 * 60  # URLs are versioned
+
+# Transcript compaction: a frame whose text is at least this similar to the
+# region's open segment only extends that segment instead of storing words
+app.config['SEGMENT_SIMILARITY_THRESHOLD'] = 0.85
+
+# Frame bytes a single Socket.IO connection may have being processed at once
+app.config['MAX_INFLIGHT_BYTES_PER_CONNECTION'] = 4 * 1024 * 1024
+
+# Server-driven capture rate. OCR_CAPACITY_FPS is how many region crops per
+# second the deployment can OCR; it is shared evenly by streaming sessions
+# (counted across all workers through the session store).
+app.config['OCR_CAPACITY_FPS'] = float(os.environ.get('OCR_CAPACITY_FPS', 50))
+app.config['CAPTURE_MIN_INTERVAL_MS'] = 250
+app.config['CAPTURE_MAX_INTERVAL_MS'] = 5000
+app.config['CAPTURE_LATENCY_BUDGET_MS'] = 500
+app.config['CAPTURE_JPEG_QUALITY'] = (0.4, 0.8)  # (min, max)
+app.config['RATE_CONTROL_MIN_PERIOD'] = 1.0  # seconds between updates per session
+
+# Blocking work (SQLAlchemy, OCR) from Socket.IO handlers runs on a bounded
+# pool of OS threads. Calls beyond BLOCKING_QUEUE_LIMIT waiting are refused,
+# and a handler gives up on its result after HANDLER_TIMEOUT seconds.
+app.config['BLOCKING_WORKERS'] = BLOCKING_WORKERS
+app.config['BLOCKING_QUEUE_LIMIT'] = int(os.environ.get('BLOCKING_QUEUE_LIMIT', 256))
+app.config['HANDLER_TIMEOUT'] = float(os.environ.get('HANDLER_TIMEOUT', 10))
+
+# Streaming state shared by all workers. SESSION_STORE_URL is memory:// (one
+# process) or a redis:// URL; SOCKETIO_MESSAGE_QUEUE (usually the same Redis)
+# lets an emit reach a client connected to another worker. Stream state
+# outlives its connection by STREAM_RESUME_TTL seconds so a client can
+# reconnect, to any worker, and resume; a stream without frames for
+# STREAM_LIVE_WINDOW seconds no longer counts towards OCR capacity.
+app.config['SESSION_STORE_URL'] = os.environ.get('SESSION_STORE_URL', 'memory://')
+app.config['SOCKETIO_MESSAGE_QUEUE'] = os.environ.get('SOCKETIO_MESSAGE_QUEUE')
+app.config['STREAM_RESUME_TTL'] = 300
+app.config['STREAM_LIVE_WINDOW'] = 30
+
+# Offline re-OCR of uploaded videos (see reocr.py). Jobs are persisted in
+# reocr_jobs and run on REOCR_WORKERS local processes; sampled crops go to
+# the OCR service at OCR_SERVICE_URL in batches of REOCR_BATCH_SIZE.
+app.config['OCR_SERVICE_URL'] = os.environ.get('OCR_SERVICE_URL', 'http://localhost:5050/recognize')
+app.config['REOCR_WORKERS'] = int(os.environ.get('REOCR_WORKERS', 1))
+app.config['REOCR_MODEL'] = 'english_iitd'
+app.config['REOCR_BATCH_SIZE'] = 200
+app.config['REOCR_JPEG_QUALITY'] = 90
+app.config['REOCR_CHANGE_THRESHOLD'] = 6.0  # mean grey-level difference (0-255)
+app.config['REOCR_MAX_GAP'] = 10.0  # seconds between samples of an unchanged region
+app.config['REOCR_OCR_TIMEOUT'] = 300  # seconds per OCR service call
+app.config['REOCR_POLL_INTERVAL'] = 5  # seconds
+app.config['REOCR_JOB_TIMEOUT'] = 4 * 60 * 60  # running longer than this: requeued
+
+# Serialized GET /api/recordings[/<uuid>] responses, kept per process up to
+# RESPONSE_CACHE_MAX_BYTES and revalidated by ETag. Browsers may reuse a
+# completed recording's response for RESPONSE_CACHE_COMPLETED_MAX_AGE
+# seconds without asking; anything else is revalidated on every request.
+app.config['RESPONSE_CACHE_MAX_BYTES'] = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+app.config['RESPONSE_CACHE_COMPLETED_MAX_AGE'] = 60
+# Live frames only change a recording's word counts and timestamps in the
+# list, so they move the list's version at most this often per recording
+app.config['RESPONSE_CACHE_LIST_REFRESH'] = 5  # seconds
+
+# Cold tier. Words of recordings created more than ARCHIVE_AFTER_DAYS ago
+# are packed into one compressed blob per region (region_archives, see
+# transcript_archive.py) and their region_words rows deleted; read
+# endpoints unpack them on demand. 0 turns the background archiver off.
+app.config['ARCHIVE_AFTER_DAYS'] = float(os.environ.get('ARCHIVE_AFTER_DAYS', 30))
+app.config['ARCHIVE_INTERVAL'] = 60 * 60  # seconds between passes
+app.config['ARCHIVE_BATCH_SIZE'] = 20  # recordings per pass
+app.config['ARCHIVE_CACHE_SIZE'] = 64  # unpacked region archives kept in memory
+
+# Ensure upload folders exist
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+os.makedirs(app.config['PARTIAL_UPLOAD_FOLDER'], exist_ok=True)
+os.makedirs(app.config['THUMBNAIL_FOLDER'], exist_ok=True)
 
 db = SQLAlchemy(app)
-socketio = SocketIO(app, cors_allowed_origins="*", max_http_buffer_size=10 * 1024 * 1024)
+socketio = SocketIO(
+    app,
+    async_mode=ASYNC_MODE,
+    cors_allowed_origins="*",
+    max_http_buffer_size=10 * 1024 * 1024,
+    message_queue=app.config['SOCKETIO_MESSAGE_QUEUE']
+)
+session_store = create_session_store(app.config['SESSION_STORE_URL'])
+response_cache = ResponseCache(app.config['RESPONSE_CACHE_MAX_BYTES'])
+
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL lets readers proceed while a handler commits"""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.close()
+
+class Overloaded(Exception):
+    """The blocking pool already has BLOCKING_QUEUE_LIMIT calls waiting"""
+
+blocking_pool = ThreadPoolExecutor(max_workers=BLOCKING_WORKERS, thread_name_prefix='blocking') \
+    if ASYNC_MODE == 'threading' else None
+blocking_slots = threading.BoundedSemaphore(BLOCKING_WORKERS + app.config['BLOCKING_QUEUE_LIMIT'])
+if ASYNC_MODE == 'gevent':
+    gevent.get_hub().threadpool.maxsize = BLOCKING_WORKERS
+
+def call_in_app_context(fn, *args):
+    with app.app_context():
+        return fn(*args)
+
+def run_blocking(fn, *args, timeout=None):
+    """
+    Run fn(*args) on a real OS thread inside an app context and wait for it.
+    Under eventlet/gevent only the calling green thread waits, so other
+    events keep being served. Raises Overloaded when the pool's queue is
+    full and TimeoutError after `timeout` (default HANDLER_TIMEOUT) seconds.
+    A call that times out keeps its slot until it actually finishes, since
+    it still holds a worker thread.
+    """
+    timeout = timeout or app.config['HANDLER_TIMEOUT']
+    if not blocking_slots.acquire(blocking=False):
+        raise Overloaded('Server busy')
+    # Released from the hub (green modes) or the worker once the call is done
+    release = lambda _: blocking_slots.release()
+    try:
+        if ASYNC_MODE == 'eventlet':
+            call = eventlet.spawn(eventlet.tpool.execute, call_in_app_context, fn, *args)
+            call.link(release)
+        elif ASYNC_MODE == 'gevent':
+            call = gevent.get_hub().threadpool.spawn(call_in_app_context, fn, *args)
+            call.rawlink(release)
+        else:
+            call = blocking_pool.submit(call_in_app_context, fn, *args)
+            call.add_done_callback(release)
+    except BaseException:
+        blocking_slots.release()
+        raise
+
+    if ASYNC_MODE == 'eventlet':
+        try:
+            with eventlet.Timeout(timeout):
+                return call.wait()
+        except eventlet.Timeout:
+            raise TimeoutError(f'{fn.__name__} timed out after {timeout}s')
+    if ASYNC_MODE == 'gevent':
+        try:
+            return call.get(timeout=timeout)
+        except gevent.Timeout:
+            raise TimeoutError(f'{fn.__name__} timed out after {timeout}s')
+    return call.result(timeout=timeout)
 
 # Models (same as provided)
 class Recording(db.Model):
@@ -41,8 +253,16 @@ class Recording(db.Model):
     duration = db.Column(db.Integer, default=0)
     file_size = db.Column(db.BigInteger, default=0)
     mime_type = db.Column(db.String(50), default='video/webm')
-    thumbnail = db.Column(db.Text, nullable=True)
+    # Legacy inline base64 thumbnail; moved into the thumbnail store at startup
+    thumbnail = deferred(db.Column(db.Text, nullable=True))
+    thumbnail_key = db.Column(db.String(64), nullable=True)
     status = db.Column(db.String(20), default='recording')  # recording, completed
+    # Transcript counters, maintained during ingestion (see bump_transcript_counters)
+    word_count = db.Column(db.Integer, default=0)
+    first_timestamp = db.Column(db.Float, nullable=True)
+    last_timestamp = db.Column(db.Float, nullable=True)
+    # Transcript time of the video's first frame, fixed by the first re-OCR
+    video_start = db.Column(db.Float, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(
         db.DateTime,
@@ -56,7 +276,7 @@ class Recording(db.Model):
         order_by='Region.region_index'
     )
 
-    def to_dict(self):
+    def to_dict(self, include_transcript=True):
         return {
             'id': self.id,
             'uuid': self.uuid,
@@ -65,13 +285,25 @@ class Recording(db.Model):
             'duration': self.duration,
             'file_size': self.file_size,
             'mime_type': self.mime_type,
-            'thumbnail': self.thumbnail,
+            'thumbnail_url': self.thumbnail_url('sm'),
+            'thumbnails': {
+                size: self.thumbnail_url(size)
+                for size in app.config['THUMBNAIL_SIZES']
+            } if self.thumbnail_key else None,
             'status': self.status,
+            'word_count': self.word_count or 0,
+            'first_timestamp': self.first_timestamp,
+            'last_timestamp': self.last_timestamp,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat(),
-            'regions': [region.to_dict() for region in self.regions]
+            'regions': [region.to_dict(include_transcript) for region in self.regions]
         }
 
+    def thumbnail_url(self, size):
+        if not self.thumbnail_key:
+            return None
+        return f"/api/recordings/{self.uuid}/thumbnail/{size}?v={self.thumbnail_key}"
+
 class Region(db.Model):
     __tablename__ = 'regions'
     id = db.Column(db.Integer, primary_key=True)
@@ -81,6 +313,15 @@ class Region(db.Model):
         nullable=False
     )
     region_index = db.Column(db.Integer, nullable=False)
+    # Rectangle in source-frame (video) pixels; NULL for regions created
+    # before geometry was stored
+    x = db.Column(db.Integer, nullable=True)
+    y = db.Column(db.Integer, nullable=True)
+    w = db.Column(db.Integer, nullable=True)
+    h = db.Column(db.Integer, nullable=True)
+    word_count = db.Column(db.Integer, default=0)
+    first_timestamp = db.Column(db.Float, nullable=True)
+    last_timestamp = db.Column(db.Float, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     words = db.relationship(
         'RegionWord',
@@ -88,6 +329,12 @@ class Region(db.Model):
         cascade='all, delete-orphan',
         order_by='RegionWord.id'
     )
+    segments = db.relationship(
+        'TranscriptSegment',
+        backref='region',
+        cascade='all, delete-orphan',
+        order_by='TranscriptSegment.start_time'
+    )
     __table_args__ = (
         db.UniqueConstraint(
             'recording_id',
@@ -100,13 +347,33 @@ class Region(db.Model):
     def name(self):
         return f"region{self.region_index}"
 
-    def to_dict(self):
-        return {
+    @property
+    def geometry(self):
+        if None in (self.x, self.y, self.w, self.h):
+            return None
+        return {'x': self.x, 'y': self.y, 'w': self.w, 'h': self.h}
+
+    def to_dict(self, include_transcript=True):
+        data = {
             'id': self.id,
             'name': self.name,
             'region_index': self.region_index,
-            'words': [word.to_dict() for word in self.words]
+            'geometry': self.geometry,
+            'word_count': self.word_count or 0,
+            'first_timestamp': self.first_timestamp,
+            'last_timestamp': self.last_timestamp
         }
+        if include_transcript:
+            data['words'] = [word.to_dict() for word in self.transcript_words()]
+            data['segments'] = [segment.to_dict() for segment in self.segments]
+        return data
+
+    def transcript_words(self):
+        """RegionWord rows merged with the region's archived words, in id order"""
+        archived = archived_words(self.id)
+        if not archived:
+            return self.words
+        return list(heapq.merge(archived, self.words, key=lambda word: word.id))
 
 class RegionWord(db.Model):
     __tablename__ = 'region_words'
@@ -121,6 +388,12 @@ class RegionWord(db.Model):
     end_time = db.Column(db.Float, nullable=True)
     confidence = db.Column(db.Float, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    __table_args__ = (
+        db.Index('ix_region_words_region_start', 'region_id', 'start_time'),
+        # Ids are never reused: archived words keep theirs, and their
+        # search index entries, after the rows are deleted
+        {'sqlite_autoincrement': True},
+    )
 
     def to_dict(self):
         return {
@@ -131,9 +404,662 @@ class RegionWord(db.Model):
             'confidence': self.confidence
         }
 
-# Initialize database
-with app.app_context():
-    db.create_all()
+class TranscriptSegment(db.Model):
+    """
+    A span of time during which a region showed the same text.
+    Consecutive frames with (near-)identical OCR output are folded into one
+    segment; only the frame that opens a segment stores RegionWord rows.
+    """
+    __tablename__ = 'transcript_segments'
+    id = db.Column(db.Integer, primary_key=True)
+    region_id = db.Column(
+        db.Integer,
+        db.ForeignKey('regions.id', ondelete='CASCADE'),
+        nullable=False
+    )
+    text = db.Column(db.Text, nullable=False)
+    start_time = db.Column(db.Float, nullable=True)
+    end_time = db.Column(db.Float, nullable=True)
+    confidence = db.Column(db.Float, nullable=True)
+    frame_count = db.Column(db.Integer, default=1)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    __table_args__ = (
+        db.Index('ix_transcript_segments_region_start', 'region_id', 'start_time'),
+    )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'text': self.text,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'confidence': self.confidence,
+            'frame_count': self.frame_count
+        }
+
+class RegionArchive(db.Model):
+    """
+    Cold-tier words of a region: its region_words rows packed into one
+    compressed columnar blob (transcript_archive.pack_words). The words
+    stay in the search index; read paths merge them back in by id.
+    """
+    __tablename__ = 'region_archives'
+    region_id = db.Column(
+        db.Integer,
+        db.ForeignKey('regions.id', ondelete='CASCADE'),
+        primary_key=True
+    )
+    word_count = db.Column(db.Integer, nullable=False)
+    # Range of the words' start_times (NULL if none has one), so windowed
+    # reads can skip archives without unpacking them
+    first_start_time = db.Column(db.Float)
+    last_start_time = db.Column(db.Float)
+    data = deferred(db.Column(db.LargeBinary, nullable=False))
+    packed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    region = db.relationship(
+        'Region',
+        backref=db.backref('archive', uselist=False, cascade='all, delete-orphan')
+    )
+
+class UploadSession(db.Model):
+    __tablename__ = 'upload_sessions'
+    id = db.Column(
+        db.String(36),
+        primary_key=True,
+        default=lambda: str(uuid.uuid4())
+    )
+    recording_id = db.Column(
+        db.Integer,
+        db.ForeignKey('recordings.id', ondelete='CASCADE'),
+        nullable=False
+    )
+    filename = db.Column(db.String(255), nullable=False)
+    partial_path = db.Column(db.String(500), nullable=False)
+    total_size = db.Column(db.BigInteger, nullable=False)
+    received_size = db.Column(db.BigInteger, default=0)
+    mime_type = db.Column(db.String(50), default='video/webm')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(
+        db.DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow
+    )
+    recording = db.relationship(
+        'Recording',
+        backref=db.backref('uploads', cascade='all, delete-orphan')
+    )
+
+    def to_dict(self):
+        return {
+            'upload_id': self.id,
+            'filename': self.filename,
+            'total_size': self.total_size,
+            'offset': self.received_size,
+            'chunk_size': app.config['UPLOAD_CHUNK_SIZE'],
+            'complete': self.received_size >= self.total_size
+        }
+
+class ReOcrJob(db.Model):
+    """
+    Offline re-OCR of a recording's uploaded video (see reocr.py).
+    queued -> running -> completed | failed
+    """
+    __tablename__ = 'reocr_jobs'
+    id = db.Column(
+        db.String(36),
+        primary_key=True,
+        default=lambda: str(uuid.uuid4())
+    )
+    recording_id = db.Column(
+        db.Integer,
+        db.ForeignKey('recordings.id', ondelete='CASCADE'),
+        nullable=False
+    )
+    status = db.Column(db.String(20), default='queued', index=True)
+    mode = db.Column(db.String(20), default='replace')  # replace, refine
+    params = db.Column(db.Text, nullable=False)  # JSON: regions, model_name
+    frames_decoded = db.Column(db.Integer, default=0)
+    samples = db.Column(db.Integer, default=0)
+    regions_updated = db.Column(db.Integer, default=0)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    recording = db.relationship(
+        'Recording',
+        backref=db.backref('reocr_jobs', cascade='all, delete-orphan')
+    )
+
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'recording_uuid': self.recording.uuid,
+            'status': self.status,
+            'mode': self.mode,
+            'params': json.loads(self.params),
+            'frames_decoded': self.frames_decoded,
+            'samples': self.samples,
+            'regions_updated': self.regions_updated,
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+def text_similarity(a, b):
+    if a == b:
+        return 1.0
+    return difflib.SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+def bump_transcript_counters(recording_id, region_id, words_added, start_time, end_time):
+    """
+    Keep word counts and first/last timestamps current as frames arrive,
+    with in-place UPDATEs rather than loading rows. SQLite's two-argument
+    min()/max() return NULL if either side is NULL, hence the coalesce.
+    """
+    for model, row_id in ((Region, region_id), (Recording, recording_id)):
+        values = {
+            'first_timestamp': db.func.coalesce(db.func.min(model.first_timestamp, start_time), start_time),
+            'last_timestamp': db.func.coalesce(db.func.max(model.last_timestamp, end_time), end_time)
+        }
+        if words_added:
+            values['word_count'] = db.func.coalesce(model.word_count, 0) + words_added
+        model.query.filter_by(id=row_id).update(values, synchronize_session=False)
+
+def recompute_transcript_counters(recording_id=None):
+    """
+    Rebuild counters with one aggregate UPDATE per table, for all
+    recordings whose counters were never filled in, or for one recording
+    after its transcript was replaced wholesale.
+    """
+    if recording_id is None:
+        region_filter = 'WHERE word_count IS NULL'
+        recording_filter = 'WHERE word_count IS NULL'
+    else:
+        region_filter = 'WHERE recording_id = :recording_id'
+        recording_filter = 'WHERE id = :recording_id'
+
+    db.session.execute(text(
+        'UPDATE regions SET '
+        'word_count = (SELECT COUNT(*) FROM region_words w WHERE w.region_id = regions.id) '
+        '  + COALESCE((SELECT a.word_count FROM region_archives a WHERE a.region_id = regions.id), 0), '
+        'first_timestamp = (SELECT MIN(s.start_time) FROM transcript_segments s WHERE s.region_id = regions.id), '
+        'last_timestamp = (SELECT MAX(s.end_time) FROM transcript_segments s WHERE s.region_id = regions.id) '
+        + region_filter
+    ), {'recording_id': recording_id})
+    db.session.execute(text(
+        'UPDATE recordings SET '
+        'word_count = (SELECT COALESCE(SUM(r.word_count), 0) FROM regions r WHERE r.recording_id = recordings.id), '
+        'first_timestamp = (SELECT MIN(r.first_timestamp) FROM regions r WHERE r.recording_id = recordings.id), '
+        'last_timestamp = (SELECT MAX(r.last_timestamp) FROM regions r WHERE r.recording_id = recordings.id) '
+        + recording_filter
+    ), {'recording_id': recording_id})
+    db.session.commit()
+
+def transcript_origin(recording):
+    """
+    Transcript time that corresponds to the start of the video: the first
+    segment, else the first word, else 0 (never None, which the player
+    would wait on forever)
+    """
+    if recording.video_start is not None:
+        return recording.video_start
+    for model in (TranscriptSegment, RegionWord):
+        start = db.session.query(
+            db.func.min(model.start_time)
+        ).join(Region).filter(Region.recording_id == recording.id).scalar()
+        if start is not None:
+            return start
+    return 0.0
+
+def segment_key(recording_uuid, region_index):
+    """Session store key of a region's open segment while streaming"""
+    return f'stream:{recording_uuid}:segment:{region_index}'
+
+def save_region_frame(stream, region_index, region_id, timestamp, frame_words):
+    """
+    Fold one frame of OCR output into the region's transcript.
+    stream: the stream state from the session store
+    frame_words: [{'word', 'start_time', 'end_time', 'confidence'}, ...]
+
+    If the text matches the region's open segment, only its end_time and
+    frame_count move forward. Otherwise the open segment is closed at this
+    frame's timestamp and a new segment (plus its RegionWord rows) is opened.
+    The open segment is kept in the session store, so frames of one stream
+    may be handled by different workers. The caller commits.
+    Returns (segment_dict, saved_words); saved_words is empty when the
+    frame was folded into the open segment.
+    """
+    frame_text = ' '.join(w['word'] for w in frame_words)
+    frame_end = max([w['end_time'] for w in frame_words], default=timestamp)
+    key = segment_key(stream['recording_uuid'], region_index)
+    ttl = app.config['STREAM_RESUME_TTL']
+    current = session_store.get(key)
+    if current and current.pop('region_id', None) != region_id:
+        current = None  # regions were recreated since the segment was opened
+
+    threshold = app.config['SEGMENT_SIMILARITY_THRESHOLD']
+    if current and text_similarity(current['text'], frame_text) >= threshold:
+        current['end_time'] = max(current['end_time'], frame_end)
+        current['frame_count'] += 1
+        TranscriptSegment.query.filter_by(id=current['id']).update({
+            'end_time': current['end_time'],
+            'frame_count': current['frame_count']
+        })
+        bump_transcript_counters(stream['recording_id'], region_id, 0, timestamp, frame_end)
+        session_store.set(key, dict(current, region_id=region_id), ttl)
+        return current, []
+
+    if current:
+        TranscriptSegment.query.filter_by(id=current['id']).update({
+            'end_time': max(current['end_time'], timestamp)
+        })
+
+    confidences = [w['confidence'] for w in frame_words if w['confidence'] is not None]
+    segment = TranscriptSegment(
+        region_id=region_id,
+        text=frame_text,
+        start_time=timestamp,
+        end_time=frame_end,
+        confidence=round(sum(confidences) / len(confidences), 4) if confidences else None,
+        frame_count=1
+    )
+    db.session.add(segment)
+
+    saved_words = []
+    for word_data in frame_words:
+        word = RegionWord(
+            region_id=region_id,
+            word=word_data['word'],
+            start_time=word_data['start_time'],
+            end_time=word_data['end_time'],
+            confidence=word_data['confidence']
+        )
+        db.session.add(word)
+        saved_words.append(word)
+
+    bump_transcript_counters(stream['recording_id'], region_id, len(saved_words), timestamp, frame_end)
+    db.session.flush()
+    session_store.set(key, dict(segment.to_dict(), region_id=region_id), ttl)
+    return segment.to_dict(), saved_words
+
+def backfill_segments():
+    """
+    Build segments for regions recorded before compaction existed.
+    Words of one frame are contiguous (each starts where the previous one
+    ended), which is how frames are recovered from region_words.
+    """
+    regions = Region.query.filter(
+        Region.words.any(),
+        ~Region.segments.any()
+    ).all()
+
+    for region in regions:
+        session = {}
+        frame = []
+        words = RegionWord.query.filter_by(region_id=region.id).order_by(RegionWord.id)
+        for word in words.yield_per(1000):
+            previous_end = frame[-1]['end_time'] if frame else None
+            if frame and (
+                word.start_time is None
+                or previous_end is None
+                or abs(word.start_time - previous_end) > 1e-6
+            ):
+                fold_legacy_frame(session, region, frame)
+                frame = []
+            frame.append({
+                'word': word.word,
+                'start_time': word.start_time,
+                'end_time': word.end_time if word.end_time is not None else word.start_time,
+                'confidence': word.confidence
+            })
+        if frame:
+            fold_legacy_frame(session, region, frame)
+        db.session.commit()
+
+    return len(regions)
+
+def fold_legacy_frame(session, region, frame):
+    """Like save_region_frame, but the words already exist"""
+    frame_text = ' '.join(w['word'] for w in frame)
+    current = session.get('segment')
+    if current and text_similarity(current.text, frame_text) >= app.config['SEGMENT_SIMILARITY_THRESHOLD']:
+        current.end_time = max(current.end_time or 0, frame[-1]['end_time'] or 0)
+        current.frame_count += 1
+        return
+
+    if current:
+        current.end_time = max(current.end_time or 0, frame[0]['start_time'] or 0)
+
+    confidences = [w['confidence'] for w in frame if w['confidence'] is not None]
+    session['segment'] = TranscriptSegment(
+        region_id=region.id,
+        text=frame_text,
+        start_time=frame[0]['start_time'],
+        end_time=frame[-1]['end_time'],
+        confidence=round(sum(confidences) / len(confidences), 4) if confidences else None,
+        frame_count=1
+    )
+    db.session.add(session['segment'])
+
+# Full-text index over transcribed words. A regular FTS5 table keyed by
+# region_words.id, so hits carry region_id/start_time without a join back
+# to region_words. Kept in sync by triggers on insert/update/delete; rows
+# deleted because they were archived keep their entries (the delete
+# trigger is recreated on startup so older databases pick that up).
+SEARCH_INDEX_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS region_words_fts USING fts5(
+        word,
+        region_id UNINDEXED,
+        start_time UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS region_words_fts_ai AFTER INSERT ON region_words
+    BEGIN
+        INSERT INTO region_words_fts(rowid, word, region_id, start_time)
+        VALUES (new.id, new.word, new.region_id, new.start_time);
+    END
+    """,
+    "DROP TRIGGER IF EXISTS region_words_fts_ad",
+    """
+    CREATE TRIGGER region_words_fts_ad AFTER DELETE ON region_words
+    WHEN NOT EXISTS (SELECT 1 FROM region_archives WHERE region_id = old.region_id)
+    BEGIN
+        DELETE FROM region_words_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS region_words_fts_au
+    AFTER UPDATE OF word, start_time ON region_words
+    BEGIN
+        UPDATE region_words_fts
+        SET word = new.word, start_time = new.start_time
+        WHERE rowid = old.id;
+    END
+    """,
+]
+
+SEARCH_MATCHES_PER_REGION = 3
+SEARCH_MAX_CANDIDATES = 1000
+SEARCH_SNIPPET_WORDS = 5
+SEARCH_SNIPPET_ID_WINDOW = 64
+
+def init_search_index():
+    """Create the FTS index and triggers, backfilling existing words once"""
+    for statement in SEARCH_INDEX_DDL:
+        db.session.execute(text(statement))
+
+    indexed = db.session.execute(
+        text('SELECT rowid FROM region_words_fts LIMIT 1')
+    ).first()
+    if indexed is None:
+        db.session.execute(text(
+            'INSERT INTO region_words_fts(rowid, word, region_id, start_time) '
+            'SELECT id, word, region_id, start_time FROM region_words'
+        ))
+    db.session.commit()
+
+class ThumbnailStore:
+    """
+    On-disk store for recording thumbnails.
+    Incoming images (base64 / data URLs) are decoded once and written as
+    fixed-size JPEG variants under <root>/<recording_uuid>/<key>_<size>.jpg.
+    The key is a content hash, so URLs carrying it can be cached forever.
+    """
+    def __init__(self, root, sizes, quality):
+        self.root = root
+        self.sizes = sizes
+        self.quality = quality
+
+    def path(self, recording_uuid, key, size):
+        return os.path.join(self.root, recording_uuid, f"{key}_{size}.jpg")
+
+    def save(self, recording_uuid, base64_str):
+        """Decode, resize and store all variants; returns the new key"""
+        if base64_str.startswith('data:'):
+            base64_str = base64_str.split(',', 1)[1]
+
+        raw = base64.b64decode(base64_str)
+        key = hashlib.sha1(raw).hexdigest()[:16]
+
+        image = Image.open(io.BytesIO(raw))
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+
+        # Variants are written under temporary names and renamed into
+        # place, so the thumbnail being replaced keeps serving until the
+        # new one is complete; only then are the old files removed.
+        directory = os.path.join(self.root, recording_uuid)
+        os.makedirs(directory, exist_ok=True)
+        written = {}
+        try:
+            for size, box in self.sizes.items():
+                variant = image.copy()
+                variant.thumbnail(box, Image.LANCZOS)
+                temp_path = f"{self.path(recording_uuid, key, size)}.{uuid.uuid4().hex}.tmp"
+                written[temp_path] = self.path(recording_uuid, key, size)
+                variant.save(temp_path, 'JPEG', quality=self.quality, optimize=True)
+            for temp_path, path in written.items():
+                os.replace(temp_path, path)
+        except Exception:
+            for temp_path in written:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            raise
+
+        keep = {os.path.basename(path) for path in written.values()}
+        for name in os.listdir(directory):
+            if name not in keep and not name.endswith('.tmp'):
+                try:
+                    os.remove(os.path.join(directory, name))
+                except FileNotFoundError:
+                    pass  # removed by a concurrent save
+
+        return key
+
+    def delete(self, recording_uuid):
+        directory = os.path.join(self.root, recording_uuid)
+        if os.path.isdir(directory):
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+            os.rmdir(directory)
+
+thumbnail_store = ThumbnailStore(
+    app.config['THUMBNAIL_FOLDER'],
+    app.config['THUMBNAIL_SIZES'],
+    app.config['THUMBNAIL_QUALITY']
+)
+
+# Columns added after the first release. db.create_all() does not alter
+# existing tables, so missing columns are added here on startup.
+SCHEMA_UPGRADES = {
+    'recordings': {
+        'thumbnail_key': 'VARCHAR(64)',
+        'word_count': 'INTEGER',
+        'first_timestamp': 'FLOAT',
+        'last_timestamp': 'FLOAT',
+        'video_start': 'FLOAT',
+    },
+    'regions': {
+        'x': 'INTEGER',
+        'y': 'INTEGER',
+        'w': 'INTEGER',
+        'h': 'INTEGER',
+        'word_count': 'INTEGER',
+        'first_timestamp': 'FLOAT',
+        'last_timestamp': 'FLOAT',
+    },
+    'region_archives': {
+        'first_start_time': 'FLOAT',
+        'last_start_time': 'FLOAT',
+    },
+}
+
+def upgrade_schema():
+    inspector = inspect(db.engine)
+    added = set()
+    for table, columns in SCHEMA_UPGRADES.items():
+        existing = {column['name'] for column in inspector.get_columns(table)}
+        for column, ddl in columns.items():
+            if column not in existing:
+                db.session.execute(text(f'ALTER TABLE {table} ADD COLUMN {column} {ddl}'))
+                added.add((table, column))
+    db.session.commit()
+
+    if ('region_archives', 'first_start_time') in added:
+        for archive in RegionArchive.query.all():
+            archive.first_start_time, archive.last_start_time = start_time_range(unpack_words(archive.data))
+        db.session.commit()
+
+    # Indexes declared on models that predate them
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+
+    upgrade_word_ids()
+
+def upgrade_word_ids():
+    """
+    Rebuild a region_words table created without AUTOINCREMENT. Without it
+    SQLite hands out max(id) + 1 of the rows left, so once words are
+    archived (or the newest rows deleted) new words could take ids that
+    archived words and their search index entries still use. The
+    sequence starts above every id in the table or the search index.
+    Triggers go with the old table; init_search_index() recreates them.
+    """
+    if db.engine.dialect.name != 'sqlite':
+        return
+    ddl = db.session.execute(text(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'region_words'"
+    )).scalar()
+    if ddl is None or 'AUTOINCREMENT' in ddl.upper():
+        return
+
+    highest = db.session.execute(text('SELECT MAX(id) FROM region_words')).scalar() or 0
+    has_index = db.session.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE name = 'region_words_fts'"
+    )).first()
+    if has_index:
+        highest = max(highest, db.session.execute(
+            text('SELECT MAX(rowid) FROM region_words_fts')
+        ).scalar() or 0)
+
+    columns = ', '.join(column.name for column in RegionWord.__table__.columns)
+    for trigger in ('region_words_fts_ai', 'region_words_fts_ad', 'region_words_fts_au'):
+        db.session.execute(text(f'DROP TRIGGER IF EXISTS {trigger}'))
+    db.session.execute(text('DROP INDEX IF EXISTS ix_region_words_region_start'))
+    db.session.execute(text('ALTER TABLE region_words RENAME TO region_words_old'))
+    RegionWord.__table__.create(bind=db.session.connection())
+    db.session.execute(text(
+        f'INSERT INTO region_words ({columns}) SELECT {columns} FROM region_words_old'
+    ))
+    db.session.execute(text('DROP TABLE region_words_old'))
+    db.session.execute(text("DELETE FROM sqlite_sequence WHERE name = 'region_words'"))
+    db.session.execute(
+        text("INSERT INTO sqlite_sequence (name, seq) VALUES ('region_words', :seq)"),
+        {'seq': highest}
+    )
+    db.session.commit()
+
+def migrate_inline_thumbnails(batch_size=50):
+    """Move legacy base64 thumbnails out of the recordings table"""
+    moved = 0
+    while True:
+        batch = Recording.query.filter(
+            Recording.thumbnail.isnot(None),
+            Recording.thumbnail != ''
+        ).limit(batch_size).all()
+        if not batch:
+            break
+
+        for recording in batch:
+            try:
+                recording.thumbnail_key = thumbnail_store.save(recording.uuid, recording.thumbnail)
+                moved += 1
+            except Exception as e:
+                print(f'Dropping undecodable thumbnail of {recording.uuid}: {e}')
+            recording.thumbnail = None
+
+        db.session.commit()
+
+    return moved
+
+@app.cli.command('migrate-thumbnails')
+def migrate_thumbnails_command():
+    """Move inline base64 thumbnails into the thumbnail store"""
+    print(f'Moved {migrate_inline_thumbnails()} thumbnails')
+
+# Initialize database; not in re-OCR workers, which import this module
+# as __mp_main__ (see get_reocr_pool)
+if __name__ != '__mp_main__':
+    with app.app_context():
+        db.create_all()
+        upgrade_schema()
+        init_search_index()
+        migrate_inline_thumbnails()
+        backfill_segments()
+        recompute_transcript_counters()
+
+# ==================== Response cache ====================
+
+# Session store counters versioning cached responses: one per recording,
+# and one for the recording list that moves with any of them
+RECORDINGS_VERSION = 'version:recordings'
+
+def recording_version_key(recording_uuid):
+    return f'version:recording:{recording_uuid}'
+
+def invalidate_recording(recording_uuid, list_changed=True):
+    """
+    Call after committing any change to a recording, its regions or its
+    transcript, so cached responses that include it are rebuilt.
+    Pass list_changed=False when no status, title or thumbnail changed:
+    the list is then rebuilt at most every RESPONSE_CACHE_LIST_REFRESH
+    seconds for this recording instead of on every streamed frame.
+    """
+    session_store.incr(recording_version_key(recording_uuid))
+    if not list_changed:
+        refreshed = f'version:recordings:refreshed:{recording_uuid}'
+        if session_store.get(refreshed):
+            return
+        session_store.set(refreshed, 1, ttl=app.config['RESPONSE_CACHE_LIST_REFRESH'])
+    session_store.incr(RECORDINGS_VERSION)
+
+def cached_json_response(cache_key, version_keys, build):
+    """
+    200 JSON response from response_cache, or 304 if the client's
+    If-None-Match still matches. build() returns (payload, completed), or
+    None for a 404; completed responses may be reused by the browser.
+    The version is read before building, so a write that lands meanwhile
+    only makes the new entry stale, never hides the write.
+    """
+    version = tuple(session_store.get(key) or 0 for key in version_keys)
+    cached = response_cache.get(cache_key, version)
+    if cached:
+        body, etag, completed = cached
+    else:
+        built = build()
+        if built is None:
+            return jsonify({
+                'success': False,
+                'error': 'Recording not found'
+            }), 404
+        payload, completed = built
+        body = app.json.dumps({'success': True, 'data': payload}).encode()
+        etag = hashlib.sha1(body).hexdigest()
+        response_cache.put(cache_key, version, (body, etag, completed), len(body), sticky=completed)
+
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    if completed:
+        response.cache_control.private = True
+        response.cache_control.max_age = app.config['RESPONSE_CACHE_COMPLETED_MAX_AGE']
+    else:
+        response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 # ==================== REST APIs ====================
 
@@ -146,36 +1072,189 @@ def get_recordings():
         search = request.args.get('search', '', type=str)
         status = request.args.get('status', None, type=str)
         
-        query = Recording.query
-        
-        # Status filter
-        if status:
-            query = query.filter(Recording.status == status)
-        
-        # Search filter
-        if search:
-            query = query.filter(Recording.title.ilike(f'%{search}%'))
-        
-        # Pagination
-        pagination = query.order_by(Recording.created_at.desc()).paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'recordings': [rec.to_dict() for rec in pagination.items],
+        def build():
+            query = Recording.query
+            
+            # Status filter
+            if status:
+                query = query.filter(Recording.status == status)
+            
+            # Search filter
+            if search:
+                query = query.filter(Recording.title.ilike(f'%{search}%'))
+            
+            # Pagination
+            pagination = query.order_by(Recording.created_at.desc()).paginate(
+                page=page,
+                per_page=per_page,
+                error_out=False
+            )
+            
+            return {
+                'recordings': [rec.to_dict(include_transcript=False) for rec in pagination.items],
                 'total': pagination.total,
                 'page': pagination.page,
                 'per_page': pagination.per_page,
                 'total_pages': pagination.pages,
                 'has_next': pagination.has_next,
                 'has_prev': pagination.has_prev
+            }, False
+        
+        return cached_json_response(
+            ('recordings', page, per_page, search, status), [RECORDINGS_VERSION], build
+        )
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def build_match_query(search):
+    """
+    Turn free text into an FTS5 MATCH expression.
+    Each whitespace-separated term is quoted (so user input can't inject
+    FTS syntax) and prefix-matched; terms are OR-ed and ranked by bm25.
+    """
+    terms = [t.replace('"', '""') for t in search.split() if t.strip('"')]
+    return ' OR '.join(f'"{term}"*' for term in terms)
+
+def build_snippet(region_id, word_id):
+    """Surrounding words of a hit from the same region, with the hit marked"""
+    rows = db.session.execute(
+        text(
+            'SELECT id, word FROM region_words '
+            'WHERE region_id = :region_id AND id BETWEEN :low AND :high '
+            'ORDER BY id'
+        ),
+        {
+            'region_id': region_id,
+            'low': word_id - SEARCH_SNIPPET_ID_WINDOW,
+            'high': word_id + SEARCH_SNIPPET_ID_WINDOW
+        }
+    ).all()
+    archived = [
+        word for word in archived_words(region_id)
+        if word_id - SEARCH_SNIPPET_ID_WINDOW <= word.id <= word_id + SEARCH_SNIPPET_ID_WINDOW
+    ]
+    if archived:
+        rows = sorted(rows + archived, key=lambda row: row.id)
+
+    position = next((i for i, row in enumerate(rows) if row.id == word_id), None)
+    if position is None:
+        return None
+
+    before = rows[max(position - SEARCH_SNIPPET_WORDS, 0):position]
+    after = rows[position + 1:position + 1 + SEARCH_SNIPPET_WORDS]
+    return ' '.join(
+        [row.word for row in before]
+        + [f'<mark>{rows[position].word}</mark>']
+        + [row.word for row in after]
+    )
+
+# Search transcribed words across all recordings
+@app.route('/api/search', methods=['GET'])
+def search_transcripts():
+    """
+    Full-text search over OCR output.
+    Results are grouped per region and ranked by bm25; each result carries
+    the recording, the region and the first matching start_time offsets
+    with a short snippet of surrounding words. Only the best
+    SEARCH_MAX_CANDIDATES word hits are grouped; total_capped says the
+    total may be higher than reported.
+    """
+    try:
+        search = request.args.get('q', '', type=str).strip()
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = min(max(request.args.get('per_page', 10, type=int), 1), 100)
+
+        match_query = build_match_query(search)
+        if not match_query:
+            return jsonify({
+                'success': False,
+                'error': 'q is required'
+            }), 400
+
+        # Only the best SEARCH_MAX_CANDIDATES hits by bm25 are grouped, so a
+        # common term costs the same as a rare one; FTS5 serves
+        # ORDER BY rank LIMIT from a bounded heap
+        candidates = db.session.execute(
+            text(
+                'SELECT rowid AS id, word, region_id, start_time, rank AS score '
+                'FROM region_words_fts WHERE region_words_fts MATCH :query '
+                'ORDER BY rank LIMIT :candidates'
+            ),
+            {'query': match_query, 'candidates': SEARCH_MAX_CANDIDATES}
+        ).all()
+        capped = len(candidates) == SEARCH_MAX_CANDIDATES
+
+        grouped = {}
+        for hit in candidates:
+            grouped.setdefault(hit.region_id, []).append(hit)
+        ranked = sorted(
+            grouped.values(),
+            key=lambda hits: (
+                sum(hit.score for hit in hits),
+                min((hit.start_time for hit in hits if hit.start_time is not None), default=0)
+            )
+        )
+
+        regions = {
+            region.id: region
+            for region in Region.query.filter(Region.id.in_(list(grouped))).all()
+        }
+        # Hits of regions deleted since they were indexed are not results
+        ranked = [hits for hits in ranked if hits[0].region_id in regions]
+        total = len(ranked)
+
+        results = []
+        for hits in ranked[(page - 1) * per_page:page * per_page]:
+            region = regions[hits[0].region_id]
+            matches = sorted(
+                hits,
+                key=lambda hit: (hit.start_time is None, hit.start_time or 0)
+            )[:SEARCH_MATCHES_PER_REGION]
+
+            recording = region.recording
+            results.append({
+                'recording': {
+                    'uuid': recording.uuid,
+                    'title': recording.title,
+                    'status': recording.status,
+                    'created_at': recording.created_at.isoformat()
+                },
+                'region': {
+                    'id': region.id,
+                    'name': region.name,
+                    'region_index': region.region_index
+                },
+                'hits': len(hits),
+                'score': round(-sum(hit.score for hit in hits), 4),
+                'matches': [{
+                    'word_id': match.id,
+                    'word': match.word,
+                    'start_time': match.start_time,
+                    'snippet': build_snippet(region.id, match.id)
+                } for match in matches]
+            })
+
+        total_pages = (total + per_page - 1) // per_page
+
+        return jsonify({
+            'success': True,
+            'data': {
+                'results': results,
+                'total': total,
+                # total counts only regions among the best candidates
+                'total_capped': capped,
+                'page': page,
+                'per_page': per_page,
+                'total_pages': total_pages,
+                'has_next': page < total_pages,
+                'has_prev': page > 1
             }
         }), 200
-        
+
     except Exception as e:
         return jsonify({
             'success': False,
@@ -205,13 +1284,15 @@ def initialize_recording():
         # Create recording entry
         recording = Recording(
             title=title,
-            thumbnail=thumbnail,
             status='recording'
         )
         
         db.session.add(recording)
         db.session.flush()  # Get the ID without committing
         
+        if thumbnail:
+            recording.thumbnail_key = thumbnail_store.save(recording.uuid, thumbnail)
+        
         # Create regions if specified
         regions = []
         if num_regions > 0:
@@ -224,6 +1305,7 @@ def initialize_recording():
                 regions.append(region)
         
         db.session.commit()
+        invalidate_recording(recording.uuid)
         
         return jsonify({
             'success': True,
@@ -300,10 +1382,11 @@ def upload_recording_video(recording_uuid):
         recording.updated_at = datetime.utcnow()
         
         db.session.commit()
+        invalidate_recording(recording.uuid)
         
         return jsonify({
             'success': True,
-            'data': recording.to_dict(),
+            'data': recording.to_dict(include_transcript=False),
             'message': 'Video uploaded successfully'
         }), 200
         
@@ -314,12 +1397,294 @@ def upload_recording_video(recording_uuid):
             'error': str(e)
         }), 500
 
-# API 3: Create/Update regions for a recording
-@app.route('/api/recordings/<recording_uuid>/regions', methods=['POST'])
+# API 2C: Chunked, resumable video upload
+# init -> PUT chunk(s) at offset -> finalize with checksum
+@app.route('/api/recordings/<recording_uuid>/uploads', methods=['POST'])
+def init_chunked_upload(recording_uuid):
+    """
+    Start (or resume) a chunked upload
+    Expected data: {
+        'filename': 'recording.webm',
+        'total_size': 123456789,
+        'mime_type': 'video/webm'
+    }
+
+    If an unfinished upload of the same file already exists for this
+    recording, it is returned with its current offset so the client can
+    continue from there instead of starting over.
+    """
+    try:
+        recording = Recording.query.filter_by(uuid=recording_uuid).first()
+
+        if not recording:
+            return jsonify({
+                'success': False,
+                'error': 'Recording not found'
+            }), 404
+
+        data = request.get_json() or {}
+        filename = secure_filename(data.get('filename') or '') or 'recording.webm'
+        total_size = data.get('total_size')
+
+        if not isinstance(total_size, int) or total_size < 1:
+            return jsonify({
+                'success': False,
+                'error': 'total_size must be a positive integer'
+            }), 400
+
+        upload = UploadSession.query.filter_by(
+            recording_id=recording.id,
+            filename=filename,
+            total_size=total_size
+        ).first()
+
+        if upload and os.path.exists(upload.partial_path):
+            upload.received_size = os.path.getsize(upload.partial_path)
+        else:
+            if upload:
+                db.session.delete(upload)
+            upload = UploadSession(
+                recording_id=recording.id,
+                filename=filename,
+                total_size=total_size,
+                mime_type=data.get('mime_type') or 'video/webm'
+            )
+            upload.id = str(uuid.uuid4())
+            upload.partial_path = os.path.join(
+                app.config['PARTIAL_UPLOAD_FOLDER'], f"{upload.id}.part"
+            )
+            open(upload.partial_path, 'wb').close()
+            db.session.add(upload)
+
+        db.session.commit()
+
+        return jsonify({
+            'success': True,
+            'data': upload.to_dict()
+        }), 201
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def get_upload_session(recording_uuid, upload_id):
+    return UploadSession.query.join(Recording).filter(
+        UploadSession.id == upload_id,
+        Recording.uuid == recording_uuid
+    ).first()
+
+@app.route('/api/recordings/<recording_uuid>/uploads/<upload_id>', methods=['GET'])
+def get_chunked_upload(recording_uuid, upload_id):
+    """Current offset of an upload, used by clients to resume"""
+    upload = get_upload_session(recording_uuid, upload_id)
+
+    if not upload:
+        return jsonify({
+            'success': False,
+            'error': 'Upload not found'
+        }), 404
+
+    # The partial file is the source of truth; a dropped PUT may have
+    # written bytes without committing the new offset
+    if os.path.exists(upload.partial_path):
+        upload.received_size = os.path.getsize(upload.partial_path)
+
+    return jsonify({
+        'success': True,
+        'data': upload.to_dict()
+    }), 200
+
+@app.route('/api/recordings/<recording_uuid>/uploads/<upload_id>', methods=['PUT'])
+def put_upload_chunk(recording_uuid, upload_id):
+    """
+    Append a chunk at ?offset=N (raw request body)
+    The body is streamed straight into the partial file in bounded reads,
+    never through request.files. offset must equal the bytes already
+    received; otherwise 409 is returned with the offset to resume from.
+    """
+    try:
+        upload = get_upload_session(recording_uuid, upload_id)
+
+        if not upload:
+            return jsonify({
+                'success': False,
+                'error': 'Upload not found'
+            }), 404
+
+        offset = request.args.get('offset', type=int)
+        received = os.path.getsize(upload.partial_path)
+
+        if offset != received:
+            return jsonify({
+                'success': False,
+                'error': 'Offset mismatch',
+                'data': {'offset': received}
+            }), 409
+
+        remaining = upload.total_size - received
+        if (request.content_length or 0) > remaining:
+            return jsonify({
+                'success': False,
+                'error': 'Chunk exceeds declared total_size'
+            }), 400
+
+        buffer_size = app.config['UPLOAD_BUFFER_SIZE']
+        with open(upload.partial_path, 'r+b') as f:
+            f.seek(offset)
+            try:
+                while remaining > 0:
+                    buf = request.stream.read(min(buffer_size, remaining))
+                    if not buf:
+                        break
+                    f.write(buf)
+                    remaining -= len(buf)
+            finally:
+                # Keep whatever arrived before a dropped connection
+                f.flush()
+                upload.received_size = f.tell()
+
+        upload.updated_at = datetime.utcnow()
+        db.session.commit()
+
+        return jsonify({
+            'success': True,
+            'data': upload.to_dict()
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/recordings/<recording_uuid>/uploads/<upload_id>/finalize', methods=['POST'])
+def finalize_chunked_upload(recording_uuid, upload_id):
+    """
+    Verify and publish a completed upload
+    Expected data: {
+        'sha256': 'hex digest of the whole file',
+        'duration': 42
+    }
+    """
+    try:
+        upload = get_upload_session(recording_uuid, upload_id)
+
+        if not upload:
+            return jsonify({
+                'success': False,
+                'error': 'Upload not found'
+            }), 404
+
+        data = request.get_json() or {}
+        received = os.path.getsize(upload.partial_path)
+
+        if received != upload.total_size:
+            return jsonify({
+                'success': False,
+                'error': 'Upload incomplete',
+                'data': {'offset': received}
+            }), 409
+
+        expected = (data.get('sha256') or '').lower()
+        if expected:
+            digest = hashlib.sha256()
+            with open(upload.partial_path, 'rb') as f:
+                for buf in iter(lambda: f.read(app.config['UPLOAD_BUFFER_SIZE']), b''):
+                    digest.update(buf)
+            if digest.hexdigest() != expected:
+                return jsonify({
+                    'success': False,
+                    'error': 'Checksum mismatch'
+                }), 422
+
+        recording = upload.recording
+        unique_filename = f"{recording.uuid}_{upload.filename}"
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
+        os.replace(upload.partial_path, filepath)
+
+        recording.filename = upload.filename
+        recording.filepath = filepath
+        recording.duration = data.get('duration', recording.duration)
+        recording.file_size = received
+        recording.mime_type = upload.mime_type
+        recording.status = 'completed'
+        recording.updated_at = datetime.utcnow()
+
+        db.session.delete(upload)
+        db.session.commit()
+        invalidate_recording(recording.uuid)
+
+        return jsonify({
+            'success': True,
+            'data': recording.to_dict(include_transcript=False),
+            'message': 'Video uploaded successfully'
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def cleanup_stale_uploads():
+    """Drop upload sessions (and partial files) that stopped making progress"""
+    cutoff = datetime.utcnow() - timedelta(seconds=app.config['UPLOAD_STALE_AFTER'])
+    stale = UploadSession.query.filter(UploadSession.updated_at < cutoff).all()
+
+    for upload in stale:
+        if os.path.exists(upload.partial_path):
+            os.remove(upload.partial_path)
+        db.session.delete(upload)
+
+    db.session.commit()
+    return len(stale)
+
+def upload_cleanup_loop():
+    while True:
+        socketio.sleep(app.config['UPLOAD_CLEANUP_INTERVAL'])
+        try:
+            removed = run_blocking(cleanup_stale_uploads, timeout=300)
+            if removed:
+                print(f'Removed {removed} stale partial uploads')
+        except Exception as e:
+            print(f'Upload cleanup error: {e}')
+
+def parse_region_geometry(items):
+    """
+    [{'region_index', 'x', 'y', 'w', 'h'}, ...] from a request body.
+    Raises ValueError for a malformed or empty rectangle, or one that
+    starts left of or above the frame.
+    """
+    regions = []
+    for item in items:
+        try:
+            region = {key: int(item[key]) for key in ('region_index', 'x', 'y', 'w', 'h')}
+        except (KeyError, TypeError, ValueError):
+            raise ValueError('Each region needs integer region_index, x, y, w and h')
+        if region['w'] <= 0 or region['h'] <= 0:
+            raise ValueError(f"Region {region['region_index']} is empty")
+        if region['x'] < 0 or region['y'] < 0:
+            raise ValueError(f"Region {region['region_index']} starts outside the frame")
+        regions.append(region)
+    return regions
+
+# API 3: Create/Update regions for a recording
+@app.route('/api/recordings/<recording_uuid>/regions', methods=['POST'])
 def create_regions(recording_uuid):
     """
     Create or update regions for a recording
     Can be called after initialize or separately
+    Expected data: {
+        'num_regions': 2
+    }
+    or, with geometry in source-frame pixels (region_index is the position): {
+        'regions': [{'x': 0, 'y': 0, 'w': 640, 'h': 120}, ...]
+    }
     """
     try:
         recording = Recording.query.filter_by(uuid=recording_uuid).first()
@@ -331,7 +1696,23 @@ def create_regions(recording_uuid):
             }), 404
         
         data = request.get_json()
-        num_regions = data.get('num_regions', 1)
+        geometry = data.get('regions')
+        
+        if geometry is not None:
+            try:
+                if not isinstance(geometry, list) or not all(isinstance(g, dict) for g in geometry):
+                    raise ValueError('regions must be a list of rectangles')
+                geometry = parse_region_geometry(
+                    [dict(g, region_index=i) for i, g in enumerate(geometry)]
+                )
+            except ValueError as e:
+                return jsonify({
+                    'success': False,
+                    'error': str(e)
+                }), 400
+            num_regions = len(geometry)
+        else:
+            num_regions = data.get('num_regions', 1)
         
         if not isinstance(num_regions, int) or num_regions < 1:
             return jsonify({
@@ -340,7 +1721,11 @@ def create_regions(recording_uuid):
             }), 400
         
         # Delete existing regions if any
+        drop_region_archives([region.id for region in recording.regions])
         Region.query.filter_by(recording_id=recording.id).delete()
+        recording.word_count = 0
+        recording.first_timestamp = None
+        recording.last_timestamp = None
         
         # Create new regions
         created_regions = []
@@ -349,10 +1734,13 @@ def create_regions(recording_uuid):
                 recording_id=recording.id,
                 region_index=i
             )
+            if geometry:
+                region.x, region.y, region.w, region.h = (geometry[i][k] for k in ('x', 'y', 'w', 'h'))
             db.session.add(region)
             created_regions.append(region)
         
         db.session.commit()
+        invalidate_recording(recording.uuid)
         
         return jsonify({
             'success': True,
@@ -374,25 +1762,339 @@ def create_regions(recording_uuid):
 @app.route('/api/recordings/<recording_uuid>', methods=['GET'])
 def get_recording(recording_uuid):
     try:
-        recording = Recording.query.filter_by(uuid=recording_uuid).first()
+        # ?transcript=0 returns only the header and region list; the
+        # transcript is then paged per region from /transcript
+        include_transcript = request.args.get('transcript', '1') not in ('0', 'false')
         
-        if not recording:
+        def build():
+            recording = Recording.query.filter_by(uuid=recording_uuid).first()
+            if not recording:
+                return None
+            data = recording.to_dict(include_transcript)
+            data['time_origin'] = transcript_origin(recording)
+            return data, recording.status == 'completed'
+        
+        return cached_json_response(
+            ('recording', recording_uuid, include_transcript),
+            [recording_version_key(recording_uuid)],
+            build
+        )
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def transcript_cursor(row):
+    """
+    Cursors are '<start_time>:<id>' of the last row returned; a row without
+    a start_time (legacy words) gives 'null:<id>', which sorts first
+    """
+    return f"{'null' if row.start_time is None else row.start_time}:{row.id}"
+
+def parse_transcript_cursor(cursor):
+    """(start_time or None, id) of a transcript_cursor()"""
+    start_time, row_id = cursor.rsplit(':', 1)
+    return (None if start_time == 'null' else float(start_time)), int(row_id)
+
+# Time-windowed, paged transcript of one region
+@app.route('/api/recordings/<recording_uuid>/regions/<int:region_index>/transcript', methods=['GET'])
+def get_region_transcript(recording_uuid, region_index):
+    """
+    Words or segments of a region in a [start, end) time window
+    Query params:
+        kind: 'segments' (default) or 'words'
+        start, end: window bounds in transcript time (optional)
+        limit: page size (default 200, max 1000)
+        cursor: next_cursor from the previous page
+
+    Rows are read in (start_time, id) order through the
+    (region_id, start_time) index, so the player can fetch the transcript
+    lazily as playback moves forward. The first page of a segment window
+    also includes the segment already on screen at `start`.
+    """
+    try:
+        region = Region.query.join(Recording).filter(
+            Recording.uuid == recording_uuid,
+            Region.region_index == region_index
+        ).first()
+
+        if not region:
             return jsonify({
                 'success': False,
-                'error': 'Recording not found'
+                'error': 'Region not found'
             }), 404
-        
+
+        kind = request.args.get('kind', 'segments', type=str)
+        model = {'segments': TranscriptSegment, 'words': RegionWord}.get(kind)
+        if model is None:
+            return jsonify({
+                'success': False,
+                'error': "kind must be 'segments' or 'words'"
+            }), 400
+
+        start = request.args.get('start', None, type=float)
+        end = request.args.get('end', None, type=float)
+        limit = min(max(request.args.get('limit', 200, type=int), 1), 1000)
+        cursor = request.args.get('cursor', None, type=str)
+
+        query = model.query.filter(model.region_id == region.id)
+        if start is not None:
+            query = query.filter(model.start_time >= start)
+        if end is not None:
+            query = query.filter(model.start_time < end)
+
+        cursor_time = cursor_id = None
+        if cursor:
+            try:
+                cursor_time, cursor_id = parse_transcript_cursor(cursor)
+            except ValueError:
+                return jsonify({
+                    'success': False,
+                    'error': 'Invalid cursor'
+                }), 400
+            if cursor_time is None:
+                # NULL start_times sort first, then every timed row
+                query = query.filter(db.or_(
+                    model.start_time.isnot(None),
+                    db.and_(model.start_time.is_(None), model.id > cursor_id)
+                ))
+            else:
+                query = query.filter(db.or_(
+                    model.start_time > cursor_time,
+                    db.and_(model.start_time == cursor_time, model.id > cursor_id)
+                ))
+
+        rows = query.order_by(model.start_time, model.id).limit(limit + 1).all()
+        if kind == 'words':
+            # The same window and order over the region's archived words
+            after = (cursor_time is not None, cursor_time or 0.0, cursor_id) if cursor else None
+            archived = list(itertools.islice(
+                archived_words_in_window(region.id, start, end, after), limit + 1
+            ))
+            if archived:
+                rows = sorted(rows + archived, key=transcript_order)[:limit + 1]
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        items = [row.to_dict() for row in rows]
+        if kind == 'segments' and start is not None and not cursor:
+            on_screen = TranscriptSegment.query.filter(
+                TranscriptSegment.region_id == region.id,
+                TranscriptSegment.start_time < start
+            ).order_by(TranscriptSegment.start_time.desc()).first()
+            if on_screen and on_screen.end_time is not None and on_screen.end_time > start:
+                items.insert(0, on_screen.to_dict())
+
         return jsonify({
             'success': True,
-            'data': recording.to_dict()
+            'data': {
+                'region_index': region.region_index,
+                'kind': kind,
+                'items': items,
+                'next_cursor': transcript_cursor(rows[-1]) if has_more else None
+            }
         }), 200
-        
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+EXPORT_FORMATS = {
+    'srt': 'application/x-subrip',
+    'vtt': 'text/vtt',
+    'jsonl': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+EXPORT_FLUSH_BYTES = 64 * 1024
+
+def iter_transcript_rows(recording_id, source, region_index=None, start=None, end=None):
+    """
+    Transcript rows in start_time order straight from a server-side cursor.
+    Rows are plain tuples (no ORM objects) fetched in batches, so memory
+    stays constant however long the recording is.
+    """
+    model = TranscriptSegment if source == 'segments' else RegionWord
+    text_column = model.text if source == 'segments' else model.word
+
+    stmt = select(
+        Region.region_index,
+        model.id,
+        text_column.label('text'),
+        model.start_time,
+        model.end_time,
+        model.confidence
+    ).join(Region, Region.id == model.region_id).where(
+        Region.recording_id == recording_id
+    )
+    if region_index is not None:
+        stmt = stmt.where(Region.region_index == region_index)
+    if start is not None:
+        stmt = stmt.where(model.start_time >= start)
+    if end is not None:
+        stmt = stmt.where(model.start_time < end)
+    stmt = stmt.order_by(model.start_time, model.id)
+
+    result = db.session.execute(stmt.execution_options(stream_results=True, yield_per=1000))
+    if source == 'words':
+        archived = archived_transcript_rows(recording_id, region_index, start, end)
+        if archived:
+            result = heapq.merge(archived, result, key=transcript_order)
+    for row in result:
+        yield row
+
+def transcript_order(row):
+    """Sort key matching ORDER BY start_time, id (SQLite sorts NULL first)"""
+    return (row.start_time is not None, row.start_time or 0.0, row.id)
+
+def format_timestamp(seconds, separator):
+    millis = int(round(max(seconds or 0.0, 0.0) * 1000))
+    hours, millis = divmod(millis, 3600000)
+    minutes, millis = divmod(millis, 60000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+def render_export(rows, export_format, origin):
+    """Yield the export body piece by piece; times are relative to origin"""
+    if export_format == 'vtt':
+        yield 'WEBVTT\n\n'
+    elif export_format == 'csv':
+        yield 'region_index,id,start_time,end_time,offset_start,offset_end,confidence,text\n'
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if export_format == 'csv' else None
+
+    for number, row in enumerate(rows, start=1):
+        offset_start = (row.start_time or origin) - origin
+        offset_end = (row.end_time if row.end_time is not None else row.start_time or origin) - origin
+
+        if export_format in ('srt', 'vtt'):
+            separator = ',' if export_format == 'srt' else '.'
+            if export_format == 'srt':
+                buffer.write(f"{number}\n")
+            buffer.write(
+                f"{format_timestamp(offset_start, separator)} --> "
+                f"{format_timestamp(offset_end, separator)}\n"
+                f"[Region {row.region_index}] {row.text}\n\n"
+            )
+        elif export_format == 'jsonl':
+            buffer.write(json.dumps({
+                'region_index': row.region_index,
+                'id': row.id,
+                'text': row.text,
+                'start_time': row.start_time,
+                'end_time': row.end_time,
+                'offset_start': round(offset_start, 3),
+                'offset_end': round(offset_end, 3),
+                'confidence': row.confidence
+            }, ensure_ascii=False) + '\n')
+        else:
+            writer.writerow([
+                row.region_index, row.id, row.start_time, row.end_time,
+                round(offset_start, 3), round(offset_end, 3), row.confidence, row.text
+            ])
+
+        if buffer.tell() >= EXPORT_FLUSH_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+# Export a transcript as SRT / WebVTT / JSONL / CSV
+@app.route('/api/recordings/<recording_uuid>/export', methods=['GET'])
+def export_transcript(recording_uuid):
+    """
+    Stream a transcript download
+    Query params:
+        format: srt | vtt | jsonl | csv (default srt)
+        source: segments (default) | words
+        region: region_index to export (default: all regions)
+        start, end: [start, end) window in transcript time
+    Subtitle times are offsets from the recording's first segment, which
+    lines them up with the uploaded video.
+    """
+    try:
+        recording = Recording.query.filter_by(uuid=recording_uuid).first()
+
+        if not recording:
+            return jsonify({
+                'success': False,
+                'error': 'Recording not found'
+            }), 404
+
+        export_format = request.args.get('format', 'srt', type=str)
+        source = request.args.get('source', 'segments', type=str)
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({
+                'success': False,
+                'error': f"format must be one of {', '.join(EXPORT_FORMATS)}"
+            }), 400
+        if source not in ('segments', 'words'):
+            return jsonify({
+                'success': False,
+                'error': "source must be 'segments' or 'words'"
+            }), 400
+
+        region_index = request.args.get('region', None, type=int)
+        start = request.args.get('start', None, type=float)
+        end = request.args.get('end', None, type=float)
+
+        origin = transcript_origin(recording) or 0.0
+
+        rows = iter_transcript_rows(recording.id, source, region_index, start, end)
+        filename = f"{secure_filename(recording.title) or 'recording'}.{export_format}"
+
+        return Response(
+            stream_with_context(render_export(rows, export_format, origin)),
+            mimetype=EXPORT_FORMATS[export_format],
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+        )
+
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+# Serve a recording thumbnail variant
+@app.route('/api/recordings/<recording_uuid>/thumbnail/<size>', methods=['GET'])
+def get_thumbnail(recording_uuid, size):
+    """
+    Thumbnail URLs carry the content key (?v=...), so responses are
+    cacheable for a long time; ETag/If-None-Match gives 304s on revalidation.
+    """
+    recording = Recording.query.filter_by(uuid=recording_uuid).first()
+
+    if not recording or not recording.thumbnail_key or size not in app.config['THUMBNAIL_SIZES']:
+        return jsonify({
+            'success': False,
+            'error': 'Thumbnail not found'
+        }), 404
+
+    path = thumbnail_store.path(recording.uuid, recording.thumbnail_key, size)
+    if not os.path.exists(path):
+        return jsonify({
+            'success': False,
+            'error': 'Thumbnail not found'
+        }), 404
+
+    response = send_file(
+        os.path.abspath(path),
+        mimetype='image/jpeg',
+        conditional=True,
+        etag=f"{recording.thumbnail_key}-{size}",
+        max_age=app.config['THUMBNAIL_CACHE_MAX_AGE']
+    )
+    response.cache_control.public = True
+    if request.args.get('v') == recording.thumbnail_key:
+        response.cache_control.immutable = True
+    return response
+
 # Update recording details
 @app.route('/api/recordings/<recording_uuid>', methods=['PATCH'])
 def update_recording(recording_uuid):
@@ -411,16 +2113,21 @@ def update_recording(recording_uuid):
         if 'title' in data:
             recording.title = data['title']
         if 'thumbnail' in data:
-            recording.thumbnail = data['thumbnail']
+            if data['thumbnail']:
+                recording.thumbnail_key = thumbnail_store.save(recording.uuid, data['thumbnail'])
+            else:
+                thumbnail_store.delete(recording.uuid)
+                recording.thumbnail_key = None
         if 'duration' in data:
             recording.duration = data['duration']
         
         recording.updated_at = datetime.utcnow()
         db.session.commit()
+        invalidate_recording(recording.uuid)
         
         return jsonify({
             'success': True,
-            'data': recording.to_dict(),
+            'data': recording.to_dict(include_transcript=False),
             'message': 'Recording updated successfully'
         }), 200
         
@@ -446,9 +2153,15 @@ def delete_recording(recording_uuid):
         # Delete file if exists
         if recording.filepath and os.path.exists(recording.filepath):
             os.remove(recording.filepath)
+        for upload in recording.uploads:
+            if os.path.exists(upload.partial_path):
+                os.remove(upload.partial_path)
+        thumbnail_store.delete(recording.uuid)
+        drop_region_archives([region.id for region in recording.regions])
         
         db.session.delete(recording)
         db.session.commit()
+        invalidate_recording(recording_uuid)
         
         return jsonify({
             'success': True,
@@ -462,10 +2175,618 @@ def delete_recording(recording_uuid):
             'error': str(e)
         }), 500
 
+# ==================== Cold-tier archive ====================
+
+@functools.lru_cache(maxsize=app.config['ARCHIVE_CACHE_SIZE'])
+def unpack_region_archive(region_id, packed_at):
+    """Keyed by packed_at as well, so a re-packed archive is read afresh"""
+    data = db.session.query(RegionArchive.data).filter_by(region_id=region_id).scalar()
+    return tuple(unpack_words(data)) if data else ()
+
+def archived_words(region_id):
+    """ArchivedWord tuples of a region's archive in id order; () if none"""
+    packed_at = db.session.query(RegionArchive.packed_at).filter_by(region_id=region_id).scalar()
+    if packed_at is None:
+        return ()
+    return unpack_region_archive(region_id, packed_at)
+
+@functools.lru_cache(maxsize=app.config['ARCHIVE_CACHE_SIZE'])
+def sorted_region_archive(region_id, packed_at):
+    """A region's archived words in transcript_order, with their sort keys"""
+    words = sorted(unpack_region_archive(region_id, packed_at), key=transcript_order)
+    return tuple(words), [transcript_order(word) for word in words]
+
+def archived_words_in_window(region_id, start=None, end=None, after=None):
+    """
+    Archived words of a region in transcript_order, with start_time in
+    [start, end) and sorting after the transcript_order key `after`.
+    Words without a start_time are only in unbounded windows. An archive
+    whose start_time range misses the window isn't unpacked, and words
+    are produced lazily, so callers can stop after the rows they need.
+    """
+    archive = db.session.query(
+        RegionArchive.packed_at, RegionArchive.first_start_time, RegionArchive.last_start_time
+    ).filter_by(region_id=region_id).first()
+    if archive is None:
+        return
+    packed_at, first, last = archive
+    if start is not None and (last is None or last < start):
+        return
+    if end is not None and (first is None or first >= end):
+        return
+    if after is not None and after[0] and (last is None or last < after[1]):
+        return
+
+    # Word ids are positive, so (True, t, -1) sorts before every word at t
+    lower = after or (False, 0.0, -1)
+    if start is not None or end is not None:
+        lower = max(lower, (True, -math.inf if start is None else start, -1))
+    words, keys = sorted_region_archive(region_id, packed_at)
+    for word in itertools.islice(words, bisect.bisect_right(keys, lower), None):
+        if end is not None and word.start_time >= end:
+            return
+        yield word
+
+TranscriptRow = namedtuple('TranscriptRow', 'region_index id text start_time end_time confidence')
+
+def archived_transcript_rows(recording_id, region_index=None, start=None, end=None):
+    """
+    Archived words of a recording as iter_transcript_rows() rows, sorted
+    by transcript_order. Archives outside [start, end) aren't unpacked.
+    """
+    query = db.session.query(Region.id, Region.region_index).join(
+        RegionArchive, RegionArchive.region_id == Region.id
+    ).filter(Region.recording_id == recording_id)
+    if region_index is not None:
+        query = query.filter(Region.region_index == region_index)
+
+    rows = [
+        TranscriptRow(index, word.id, word.word, word.start_time, word.end_time, word.confidence)
+        for region_id, index in query.all()
+        for word in archived_words_in_window(region_id, start, end)
+    ]
+    return sorted(rows, key=transcript_order)
+
+def drop_region_archives(region_ids):
+    """
+    Delete these regions' archives with their words' search entries, which
+    no region_words delete will remove any more. Flushed; the caller commits.
+    """
+    for archive in RegionArchive.query.filter(RegionArchive.region_id.in_(region_ids)).all():
+        word_ids = [word.id for word in unpack_words(archive.data)]
+        for i in range(0, len(word_ids), 500):
+            db.session.execute(text(
+                'DELETE FROM region_words_fts WHERE rowid IN (%s)'
+                % ','.join(str(int(word_id)) for word_id in word_ids[i:i + 500])
+            ))
+        db.session.delete(archive)
+    db.session.flush()
+
+def archive_region(region):
+    """
+    Pack the region's region_words rows (merged into any archive it
+    already has) and delete them. Words stored meanwhile get higher ids
+    (region_words is AUTOINCREMENT) and stay for the next pass. The
+    caller commits. Returns the number of words archived.
+    """
+    rows = db.session.query(
+        RegionWord.id, RegionWord.word, RegionWord.start_time, RegionWord.end_time, RegionWord.confidence
+    ).filter(RegionWord.region_id == region.id).all()
+    if not rows:
+        return 0
+
+    archive = region.archive
+    words = [tuple(row) for row in rows]
+    if archive:
+        words += unpack_words(archive.data)
+    else:
+        archive = RegionArchive(region_id=region.id)
+        db.session.add(archive)
+    archive.data = pack_words(words)
+    archive.word_count = len(words)
+    archive.first_start_time, archive.last_start_time = start_time_range(words)
+    archive.packed_at = datetime.utcnow()
+    # The archive row must exist before the delete, so the words keep
+    # their search index entries (see region_words_fts_ad)
+    db.session.flush()
+
+    RegionWord.query.filter(
+        RegionWord.region_id == region.id,
+        RegionWord.id <= max(row.id for row in rows)
+    ).delete(synchronize_session=False)
+    return len(rows)
+
+def archive_old_recordings(batch_size=None):
+    """
+    Move the words of up to batch_size recordings older than
+    ARCHIVE_AFTER_DAYS into region archives, one transaction per
+    recording. Returns (recordings, words) archived.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=app.config['ARCHIVE_AFTER_DAYS'])
+    recordings = Recording.query.filter(
+        Recording.created_at < cutoff,
+        Recording.regions.any(Region.words.any())
+    ).limit(batch_size or app.config['ARCHIVE_BATCH_SIZE']).all()
+
+    words = 0
+    for recording in recordings:
+        try:
+            words += sum(archive_region(region) for region in recording.regions)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+    return len(recordings), words
+
+def archive_loop():
+    while True:
+        socketio.sleep(app.config['ARCHIVE_INTERVAL'])
+        try:
+            recordings, words = run_blocking(archive_old_recordings, timeout=600)
+            if recordings:
+                print(f'Archived {words} words of {recordings} recordings')
+        except Exception as e:
+            print(f'Archive error: {e}')
+
+@app.cli.command('archive-transcripts')
+def archive_transcripts_command():
+    """Archive every recording past ARCHIVE_AFTER_DAYS now, then VACUUM"""
+    total_recordings = total_words = 0
+    while True:
+        recordings, words = archive_old_recordings()
+        if not recordings:
+            break
+        total_recordings += recordings
+        total_words += words
+    print(f'Archived {total_words} words of {total_recordings} recordings')
+    # Deleted rows only free pages inside the file; VACUUM gives them back
+    with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        connection.execute(text('VACUUM'))
+
+# ==================== Offline re-OCR ====================
+
+reocr_pool = None
+reocr_running = {}  # job id -> Future, for jobs running in this process
+
+def get_reocr_pool():
+    """
+    Worker processes come from a forkserver: forking this process directly
+    could copy a lock held by one of its threads (or green threads) and
+    deadlock the child. The server preloads reocr, so each worker starts
+    with OpenCV imported. Workers only run reocr.run_reocr; when app.py is
+    the main script they import it as __mp_main__, which skips startup.
+    """
+    global reocr_pool
+    if reocr_pool is None:
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(['reocr'])
+        reocr_pool = ProcessPoolExecutor(
+            max_workers=app.config['REOCR_WORKERS'],
+            mp_context=context
+        )
+    return reocr_pool
+
+def claim_reocr_job():
+    """
+    Mark the oldest queued job running (runs on the blocking pool).
+    The UPDATE only matches a queued row, so with several server processes
+    each job is claimed once. Returns (job_id, video_path, regions, options)
+    or None when nothing is queued.
+    """
+    # Jobs whose process died (e.g. a restart) go back to the queue
+    stale = datetime.utcnow() - timedelta(seconds=app.config['REOCR_JOB_TIMEOUT'])
+    ReOcrJob.query.filter(
+        ReOcrJob.status == 'running',
+        ReOcrJob.started_at < stale,
+        ReOcrJob.id.notin_(list(reocr_running))
+    ).update({'status': 'queued'}, synchronize_session=False)
+    db.session.commit()
+
+    queued = ReOcrJob.query.filter_by(status='queued').order_by(ReOcrJob.created_at).limit(10).all()
+    for job in queued:
+        claimed = ReOcrJob.query.filter_by(id=job.id, status='queued').update(
+            {'status': 'running', 'started_at': datetime.utcnow()},
+            synchronize_session=False
+        )
+        db.session.commit()
+        if claimed:
+            break
+    else:
+        return None
+
+    params = json.loads(job.params)
+    options = {
+        'ocr_url': app.config['OCR_SERVICE_URL'],
+        'ocr_timeout': app.config['REOCR_OCR_TIMEOUT'],
+        'model_name': params['model_name'],
+        'batch_size': app.config['REOCR_BATCH_SIZE'],
+        'jpeg_quality': app.config['REOCR_JPEG_QUALITY'],
+        'change_threshold': app.config['REOCR_CHANGE_THRESHOLD'],
+        'max_gap': app.config['REOCR_MAX_GAP'],
+        'similarity_threshold': app.config['SEGMENT_SIMILARITY_THRESHOLD']
+    }
+    return job.id, job.recording.filepath, params['regions'], options
+
+def replace_region_transcripts(job, result):
+    """
+    Write re-OCR output as the transcripts of the job's regions.
+    'replace' swaps every processed region's transcript; 'refine' keeps the
+    live transcript of regions where re-OCR found no text.
+    Returns the number of regions rewritten.
+    """
+    recording = job.recording
+    if recording.video_start is None:
+        # Live timestamps are wall-clock; the video starts at the first frame
+        recording.video_start = transcript_origin(recording) or 0.0
+    base_time = recording.video_start
+
+    regions = {r.region_index: r for r in recording.regions}
+    updated = {
+        regions[region_index]: segments
+        for region_index, segments in result['regions'].items()
+        if region_index in regions and (segments or job.mode == 'replace')
+    }
+    region_ids = [region.id for region in updated]
+    drop_region_archives(region_ids)
+    RegionWord.query.filter(RegionWord.region_id.in_(region_ids)).delete(synchronize_session=False)
+    TranscriptSegment.query.filter(TranscriptSegment.region_id.in_(region_ids)).delete(synchronize_session=False)
+
+    for region, segments in updated.items():
+        for data in segments:
+            db.session.add(TranscriptSegment(
+                region_id=region.id,
+                text=data['text'],
+                start_time=base_time + data['start_time'],
+                end_time=base_time + data['end_time'],
+                confidence=data['confidence'],
+                frame_count=data['frame_count']
+            ))
+            db.session.add_all([RegionWord(
+                region_id=region.id,
+                word=word['word'][:100],
+                start_time=base_time + word['start_time'],
+                end_time=base_time + word['end_time'],
+                confidence=word['confidence']
+            ) for word in data['words']])
+    return len(updated)
+
+def finish_reocr_job(job_id, future):
+    """Store a finished job's result (runs on the blocking pool)"""
+    job = ReOcrJob.query.filter_by(id=job_id).first()
+    if job is None:
+        return  # the recording was deleted meanwhile
+
+    try:
+        result = future.result()
+        job.regions_updated = replace_region_transcripts(job, result)
+        job.frames_decoded = result['frames_decoded']
+        job.samples = result['samples']
+        job.status = 'completed'
+    except Exception as e:
+        db.session.rollback()
+        job.status = 'failed'
+        job.error = str(e) or e.__class__.__name__
+    job.finished_at = datetime.utcnow()
+    db.session.commit()
+
+    if job.status == 'completed':
+        recompute_transcript_counters(job.recording_id)
+        invalidate_recording(job.recording.uuid)
+
+def reocr_dispatch_loop():
+    """Hand queued jobs to the process pool and collect finished ones"""
+    import reocr  # OpenCV is only needed once jobs run
+
+    while True:
+        socketio.sleep(app.config['REOCR_POLL_INTERVAL'])
+        try:
+            for job_id, future in list(reocr_running.items()):
+                if future.done():
+                    run_blocking(finish_reocr_job, job_id, future, timeout=600)
+                    del reocr_running[job_id]
+
+            while len(reocr_running) < app.config['REOCR_WORKERS']:
+                claimed = run_blocking(claim_reocr_job)
+                if not claimed:
+                    break
+                job_id, video_path, regions, options = claimed
+                reocr_running[job_id] = get_reocr_pool().submit(reocr.run_reocr, video_path, regions, options)
+        except Exception as e:
+            print(f'Re-OCR dispatch error: {e}')
+
+# Queue offline re-OCR of the uploaded video
+@app.route('/api/recordings/<recording_uuid>/reocr', methods=['POST'])
+def create_reocr_job(recording_uuid):
+    """
+    Expected data: {
+        'regions': [{'region_index': 0, 'x': 0, 'y': 0, 'w': 640, 'h': 120}, ...],
+        'mode': 'replace' | 'refine',
+        'model_name': 'english_iitd'
+    }
+    Region geometry is in video pixels. Without 'regions', every region
+    with stored geometry is re-OCRed.
+    """
+    try:
+        recording = Recording.query.filter_by(uuid=recording_uuid).first()
+
+        if not recording:
+            return jsonify({
+                'success': False,
+                'error': 'Recording not found'
+            }), 404
+
+        if not recording.filepath or not os.path.exists(recording.filepath):
+            return jsonify({
+                'success': False,
+                'error': 'Recording has no uploaded video'
+            }), 409
+
+        data = request.get_json() or {}
+        mode = data.get('mode', 'replace')
+        if mode not in ('replace', 'refine'):
+            return jsonify({
+                'success': False,
+                'error': "mode must be 'replace' or 'refine'"
+            }), 400
+
+        try:
+            regions = parse_region_geometry(data.get('regions') or [
+                dict(r.geometry, region_index=r.region_index)
+                for r in recording.regions if r.geometry
+            ])
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+
+        known = {r.region_index for r in recording.regions}
+        unknown = sorted({r['region_index'] for r in regions} - known)
+        if not regions or unknown:
+            return jsonify({
+                'success': False,
+                'error': f'Unknown region_index: {unknown}' if unknown else 'regions is required'
+            }), 400
+
+        job = ReOcrJob(
+            recording_id=recording.id,
+            mode=mode,
+            params=json.dumps({
+                'regions': regions,
+                'model_name': data.get('model_name') or app.config['REOCR_MODEL']
+            })
+        )
+        db.session.add(job)
+        db.session.commit()
+
+        return jsonify({
+            'success': True,
+            'data': job.to_dict(),
+            'message': 'Re-OCR job queued'
+        }), 202
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+# Re-OCR job status
+@app.route('/api/recordings/<recording_uuid>/reocr', methods=['GET'])
+def list_reocr_jobs(recording_uuid):
+    recording = Recording.query.filter_by(uuid=recording_uuid).first()
+
+    if not recording:
+        return jsonify({
+            'success': False,
+            'error': 'Recording not found'
+        }), 404
+
+    jobs = ReOcrJob.query.filter_by(recording_id=recording.id).order_by(ReOcrJob.created_at.desc())
+    return jsonify({
+        'success': True,
+        'data': [job.to_dict() for job in jobs]
+    }), 200
+
+@app.route('/api/recordings/<recording_uuid>/reocr/<job_id>', methods=['GET'])
+def get_reocr_job(recording_uuid, job_id):
+    job = ReOcrJob.query.join(Recording).filter(
+        Recording.uuid == recording_uuid,
+        ReOcrJob.id == job_id
+    ).first()
+
+    if not job:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found'
+        }), 404
+
+    return jsonify({
+        'success': True,
+        'data': job.to_dict()
+    }), 200
+
 # ==================== WebSocket for Image Processing ====================
 
-# Store active connections
-active_sessions = {}
+# Connection -> recording it is streaming. A Socket.IO connection stays on
+# one worker, so this map is process-local; the stream's own state (regions,
+# open segments, rate control) lives in session_store under stream_key().
+connection_streams = {}
+
+# Recordings that sent a frame within STREAM_LIVE_WINDOW, across all workers
+LIVE_STREAMS = 'live_streams'
+
+def stream_key(recording_uuid):
+    return f'stream:{recording_uuid}:state'
+
+def load_stream(sid):
+    """Stream state for a connection, or None if it isn't streaming"""
+    recording_uuid = connection_streams.get(sid)
+    return session_store.get_fields(stream_key(recording_uuid)) if recording_uuid else None
+
+def save_stream(stream, *fields):
+    """
+    Write these fields of the stream state (all of them when none are
+    named). Each field is stored on its own, so frames handled at the same
+    time, on this or another worker, don't overwrite each other's changes.
+    """
+    session_store.set_fields(
+        stream_key(stream['recording_uuid']),
+        {field: stream[field] for field in fields or stream if field in stream},
+        app.config['STREAM_RESUME_TTL']
+    )
+
+def live_stream_count():
+    return session_store.count_members(LIVE_STREAMS, app.config['STREAM_LIVE_WINDOW'])
+
+# Frame bytes / frames currently being processed, per connection
+inflight_bytes = {}
+inflight_frames = {}
+inflight_lock = threading.Lock()
+
+def reserve_inflight(sid, nbytes):
+    """Account for a frame; False if it would exceed the connection's cap"""
+    with inflight_lock:
+        current = inflight_bytes.get(sid, 0)
+        if current and current + nbytes > app.config['MAX_INFLIGHT_BYTES_PER_CONNECTION']:
+            return False
+        inflight_bytes[sid] = current + nbytes
+        inflight_frames[sid] = inflight_frames.get(sid, 0) + 1
+        return True
+
+def release_inflight(sid, nbytes):
+    with inflight_lock:
+        remaining = inflight_bytes.get(sid, 0) - nbytes
+        if remaining > 0:
+            inflight_bytes[sid] = remaining
+            inflight_frames[sid] -= 1
+        else:
+            inflight_bytes.pop(sid, None)
+            inflight_frames.pop(sid, None)
+
+class CaptureRatePolicy:
+    """
+    Decides how fast each streaming client should capture.
+    Every active session gets an equal share of OCR_CAPACITY_FPS. The
+    capture interval is the time needed to send all of a session's regions
+    within that share; if even the longest interval can't fit them, only
+    max_regions_per_tick regions are sent per tick (round-robin on the
+    client). A session whose measured latency or queue depth shows the
+    server falling behind is slowed down further and sends smaller JPEGs.
+    """
+    def __init__(self, config):
+        self.config = config
+
+    def observe(self, session, latency_ms, queue_depth):
+        """Fold one processed frame into the session's load estimate"""
+        stats = session.setdefault('load', {'latency_ms': latency_ms, 'queue_depth': queue_depth})
+        stats['latency_ms'] = 0.8 * stats['latency_ms'] + 0.2 * latency_ms
+        stats['queue_depth'] = 0.8 * stats['queue_depth'] + 0.2 * queue_depth
+
+    def decide(self, session, active_count):
+        config = self.config
+        min_interval = config['CAPTURE_MIN_INTERVAL_MS']
+        max_interval = config['CAPTURE_MAX_INTERVAL_MS']
+        min_quality, max_quality = config['CAPTURE_JPEG_QUALITY']
+
+        share = config['OCR_CAPACITY_FPS'] / max(active_count, 1)
+        regions = max(session['region_count'], 1)
+
+        interval = 1000.0 * regions / share
+        max_regions = regions
+        if interval > max_interval:
+            max_regions = max(1, int(share * max_interval / 1000.0))
+            interval = 1000.0 * max_regions / share
+
+        # > 1 means this session's frames wait longer than the budget
+        stats = session.get('load', {'latency_ms': 0.0, 'queue_depth': 0.0})
+        pressure = max(
+            stats['latency_ms'] / config['CAPTURE_LATENCY_BUDGET_MS'],
+            stats['queue_depth'] / regions
+        )
+        if pressure > 1:
+            interval *= pressure
+            quality = max_quality / pressure
+        else:
+            quality = max_quality
+
+        return {
+            'target_interval_ms': int(min(max(interval, min_interval), max_interval)),
+            'jpeg_quality': round(min(max(quality, min_quality), max_quality), 2),
+            'max_regions_per_tick': max_regions
+        }
+
+    def update(self, session, active_count):
+        """New settings for the session if they changed enough to send"""
+        now = time.time()  # wall clock: the session may move between workers
+        if now - session.get('rate_checked_at', 0) < self.config['RATE_CONTROL_MIN_PERIOD']:
+            return None
+        session['rate_checked_at'] = now
+
+        settings = self.decide(session, active_count)
+        previous = session.get('rate')
+        if previous and (
+            abs(settings['target_interval_ms'] - previous['target_interval_ms']) < 0.1 * previous['target_interval_ms']
+            and abs(settings['jpeg_quality'] - previous['jpeg_quality']) < 0.05
+            and settings['max_regions_per_tick'] == previous['max_regions_per_tick']
+        ):
+            return None
+
+        session['rate'] = settings
+        return settings
+
+capture_policy = CaptureRatePolicy(app.config)
+
+def decode_frame_payload(image):
+    """
+    JPEG bytes from a process_region_image payload.
+    Binary attachments arrive as bytes and are used as-is; the legacy
+    base64 / data URL string form is decoded.
+    """
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return image
+    if image.startswith('data:'):
+        image = image.split(',', 1)[1]
+    return base64.b64decode(image)
+
+def decode_full_frame(image):
+    """A full-frame payload as an H x W x 3 array; region crops are slices of it"""
+    with Image.open(io.BytesIO(decode_frame_payload(image))) as frame:
+        return np.asarray(frame.convert('RGB'))
+
+def perform_region_ocr(image, timestamp):
+    """
+    OCR one region crop (JPEG bytes or an RGB array).
+    Returns words laid out back to back from the frame timestamp:
+    [{'word', 'start_time', 'end_time', 'confidence'}, ...]
+    """
+    # Dummy OCR/Speech-to-text processing
+    # Generate random words for simulation
+    sample_words = ['The', 'quick', 'brown', 'fox', 'jumps', 'over', 'the', 'lazy', 'dog', 'Time', 'Year', 'People', 'Way', 'Day', 'Man', 'Thing', 'Woman', 'Life', 'Child', 'World', 'School', 'State', 'Family', 'Student', 'Group', 'Country', 'Problem']
+    
+    # Pick 3-5 random words
+    num_words = random.randint(3, 5)
+    selected_words = [random.choice(sample_words) for _ in range(num_words)]
+    
+    frame_words = []
+    current_time = timestamp
+    
+    for word in selected_words:
+        duration = round(random.uniform(0.3, 0.8), 2)
+        frame_words.append({
+            'word': word,
+            'start_time': current_time,
+            'end_time': current_time + duration,
+            'confidence': round(random.uniform(0.7, 0.99), 2)
+        })
+        current_time += duration
+    
+    return frame_words
+
+def perform_batch_ocr(crops, timestamp):
+    """OCR the region crops of one frame as a batch; one word list per crop"""
+    return [perform_region_ocr(crop, timestamp) for crop in crops]
 
 @socketio.on('connect')
 def handle_connect():
@@ -475,15 +2796,29 @@ def handle_connect():
 @socketio.on('disconnect')
 def handle_disconnect():
     print(f'Client disconnected: {request.sid}')
-    if request.sid in active_sessions:
-        del active_sessions[request.sid]
+    # The stream state is kept (STREAM_RESUME_TTL) so the client can resume
+    recording_uuid = connection_streams.pop(request.sid, None)
+    if recording_uuid:
+        session_store.remove_member(LIVE_STREAMS, recording_uuid)
+    with inflight_lock:
+        inflight_bytes.pop(request.sid, None)
+        inflight_frames.pop(request.sid, None)
+
+def load_stream_regions(recording_uuid):
+    """Recording and its regions for start_stream (runs on the blocking pool)"""
+    recording = Recording.query.filter_by(uuid=recording_uuid).first()
+    if not recording:
+        return None, []
+    regions = Region.query.filter_by(recording_id=recording.id).all()
+    return (recording.id, recording.uuid), [r.to_dict(include_transcript=False) for r in regions]
 
 @socketio.on('start_stream')
 def handle_start_stream(data):
     """
     Initialize streaming session for all regions
     Expected data: {
-        'recording_uuid': 'xxx-xxx-xxx'
+        'recording_uuid': 'xxx-xxx-xxx',
+        'resume': false
     }
     
     Frontend flow:
@@ -492,6 +2827,9 @@ def handle_start_stream(data):
     3. User clicks "Start Stream"
     4. This event is triggered
     5. Backend is ready to receive images for all regions
+    
+    After a reconnect (to this or any other worker) the client sends
+    resume: true, which keeps the stream's open segments and load stats.
     """
     try:
         recording_uuid = data.get('recording_uuid')
@@ -500,60 +2838,145 @@ def handle_start_stream(data):
             emit('error', {'message': 'recording_uuid is required'})
             return
         
-        recording = Recording.query.filter_by(uuid=recording_uuid).first()
+        recording, regions = run_blocking(load_stream_regions, recording_uuid)
         
         if not recording:
             emit('error', {'message': 'Recording not found'})
             return
         
-        regions = Region.query.filter_by(recording_id=recording.id).all()
-        
         if not regions:
             emit('error', {'message': 'No regions found. Please create regions first.'})
             return
         
-        # Store session info
-        active_sessions[request.sid] = {
-            'recording_id': recording.id,
-            'recording_uuid': recording.uuid,
-            'regions': {r.region_index: r.id for r in regions},
+        recording_id, recording_uuid = recording
+        
+        stream = session_store.get_fields(stream_key(recording_uuid)) if data.get('resume') else None
+        resumed = stream is not None
+        if not resumed:
+            # A new stream opens new segments and starts from fresh state
+            session_store.delete(
+                stream_key(recording_uuid),
+                *(segment_key(recording_uuid, r['region_index']) for r in regions)
+            )
+            stream = {'recording_uuid': recording_uuid}
+        
+        # Regions are reloaded in case they changed; keys are strings (JSON)
+        stream.update({
+            'recording_id': recording_id,
+            'regions': {str(r['region_index']): r['id'] for r in regions},
+            'geometry': {str(r['region_index']): r['geometry'] for r in regions if r['geometry']},
             'region_count': len(regions)
-        }
+        })
+        connection_streams[request.sid] = recording_uuid
+        session_store.touch_member(LIVE_STREAMS, recording_uuid)
         
         # Join room for this recording
-        join_room(f"recording_{recording.uuid}")
+        join_room(f"recording_{recording_uuid}")
+        
+        stream['rate'] = capture_policy.decide(stream, live_stream_count())
+        save_stream(stream)
+        emit('rate_control', stream['rate'])
         
         emit('stream_started', {
-            'recording_uuid': recording.uuid,
-            'regions': [r.to_dict() for r in regions],
+            'recording_uuid': recording_uuid,
+            'regions': regions,
             'region_count': len(regions),
+            'resumed': resumed,
+            'full_frame': len(stream.get('geometry', {})) == len(regions),
             'message': 'Stream started. Ready to receive images for all regions.'
         })
         
     except Exception as e:
         emit('error', {'message': str(e)})
 
+def ocr_and_save_frame(stream, region_index, region_id, timestamp, image_data):
+    """OCR one region crop and store it (runs on the blocking pool)"""
+    try:
+        frame_words = perform_region_ocr(decode_frame_payload(image_data), timestamp)
+        
+        # Save to database, folding repeated text into the open segment
+        segment, saved_words = save_region_frame(
+            stream, region_index, region_id, timestamp, frame_words
+        )
+        db.session.commit()
+        invalidate_recording(stream['recording_uuid'], list_changed=False)
+    except Exception:
+        db.session.rollback()
+        # The open segment may not have been committed; start a fresh one
+        session_store.delete(segment_key(stream['recording_uuid'], region_index))
+        raise
+    
+    return region_text_result(region_index, region_id, timestamp, frame_words, segment, saved_words)
+
+def region_text_result(region_index, region_id, timestamp, frame_words, segment, saved_words):
+    """Payload of a region_text_result event"""
+    return {
+        'region_index': region_index,
+        'region_id': region_id,
+        'timestamp': timestamp,
+        'words': [w.to_dict() for w in saved_words] or frame_words,
+        'text': ' '.join([w['word'] for w in frame_words]),
+        'segment': segment,
+        'text_changed': bool(saved_words)
+    }
+
+def ocr_and_save_full_frame(stream, region_indices, timestamp, image_data):
+    """
+    Decode one full frame, OCR the given regions from it in one batch and
+    store them in one transaction (runs on the blocking pool).
+    """
+    frame = decode_full_frame(image_data)
+    crops = {}
+    for region_index in region_indices:
+        g = stream['geometry'][str(region_index)]
+        # Clipped like reocr.crop_region; a negative start would wrap around
+        x, y = max(g['x'], 0), max(g['y'], 0)
+        crop = frame[y:g['y'] + g['h'], x:g['x'] + g['w']]  # a view, not a copy
+        if crop.size:
+            crops[region_index] = crop
+    
+    results = []
+    try:
+        for region_index, frame_words in zip(crops, perform_batch_ocr(list(crops.values()), timestamp)):
+            region_id = stream['regions'][str(region_index)]
+            segment, saved_words = save_region_frame(
+                stream, region_index, region_id, timestamp, frame_words
+            )
+            results.append((region_index, region_id, timestamp, frame_words, segment, saved_words))
+        db.session.commit()
+        invalidate_recording(stream['recording_uuid'], list_changed=False)
+    except Exception:
+        db.session.rollback()
+        session_store.delete(*(segment_key(stream['recording_uuid'], i) for i in crops))
+        raise
+    
+    return [region_text_result(*result) for result in results]
+
 @socketio.on('process_region_image')
-def handle_process_region_image(data):
+def handle_process_region_image(data, attachment=None):
     """
     Process image from a specific region
     Expected data: {
         'region_index': 0,
-        'image': 'base64_encoded_image',
+        'image': <JPEG bytes> or 'base64_encoded_image' (legacy),
         'timestamp': 1234.56
     }
+    The JPEG may also be sent as a second binary argument:
+    emit('process_region_image', {region_index, timestamp}, jpegBytes)
     
     Frontend sends images from all regions continuously
     Backend processes each and returns transcribed text
     """
+    image_data = attachment if attachment is not None else data.get('image')
+    reserved = 0
+    started = time.monotonic()
     try:
-        if request.sid not in active_sessions:
+        stream = load_stream(request.sid)
+        if stream is None:
             emit('error', {'message': 'Session not initialized. Call start_stream first'})
             return
         
-        session = active_sessions[request.sid]
         region_index = data.get('region_index')
-        image_data = data.get('image')
         timestamp = data.get('timestamp', 0.0)
         
         if region_index is None:
@@ -564,62 +2987,147 @@ def handle_process_region_image(data):
             emit('error', {'message': 'No image data provided'})
             return
         
-        if region_index not in session['regions']:
+        if str(region_index) not in stream['regions']:
             emit('error', {'message': f'Invalid region_index: {region_index}'})
             return
         
-        region_id = session['regions'][region_index]
+        if not reserve_inflight(request.sid, len(image_data)):
+            emit('frame_dropped', {
+                'region_index': region_index,
+                'timestamp': timestamp,
+                'reason': 'inflight_limit'
+            })
+            return
+        reserved = len(image_data)
         
-        # Dummy OCR/Speech-to-text processing
-        # Generate random words for simulation
-        sample_words = ['The', 'quick', 'brown', 'fox', 'jumps', 'over', 'the', 'lazy', 'dog', 'Time', 'Year', 'People', 'Way', 'Day', 'Man', 'Thing', 'Woman', 'Life', 'Child', 'World', 'School', 'State', 'Family', 'Student', 'Group', 'Country', 'Problem']
+        region_id = stream['regions'][str(region_index)]
+        try:
+            response_data = run_blocking(
+                ocr_and_save_frame, stream, region_index, region_id, timestamp, image_data
+            )
+        except Overloaded:
+            emit('frame_dropped', {
+                'region_index': region_index,
+                'timestamp': timestamp,
+                'reason': 'server_busy'
+            })
+            return
         
-        # Pick 3-5 random words
-        num_words = random.randint(3, 5)
-        selected_words = [random.choice(sample_words) for _ in range(num_words)]
+        # Send back to client
+        emit('region_text_result', response_data)
         
-        dummy_words = []
-        for word in selected_words:
-            dummy_words.append({
-                'word': word,
-                'confidence': round(random.uniform(0.7, 0.99), 2),
-                'duration': round(random.uniform(0.3, 0.8), 2)
-            })
+        # Feed this frame's cost back into the capture rate
+        with inflight_lock:
+            queue_depth = inflight_frames.get(request.sid, 1) - 1
+        session_store.touch_member(LIVE_STREAMS, stream['recording_uuid'])
+        capture_policy.observe(stream, (time.monotonic() - started) * 1000, queue_depth)
+        settings = capture_policy.update(stream, live_stream_count())
+        save_stream(stream, 'load', 'rate', 'rate_checked_at')
+        if settings:
+            emit('rate_control', settings)
         
+    except Exception as e:
+        emit('error', {'message': str(e), 'region_index': data.get('region_index')})
+    finally:
+        if reserved:
+            release_inflight(request.sid, reserved)
+
+@socketio.on('process_frame')
+def handle_process_frame(data, attachment=None):
+    """
+    Process one full frame for all regions
+    Expected data: {
+        'image': <JPEG bytes of the whole source frame>,
+        'timestamp': 1234.56
+    }
+    The frame may also be sent as a second binary argument, as with
+    process_region_image. The server crops every region with stored
+    geometry out of the decoded frame, so the client encodes one JPEG per
+    tick instead of one per region. Results arrive as region_text_result
+    events, one per region.
+    """
+    image_data = attachment if attachment is not None else data.get('image')
+    reserved = 0
+    started = time.monotonic()
+    try:
+        stream = load_stream(request.sid)
+        if stream is None:
+            emit('error', {'message': 'Session not initialized. Call start_stream first'})
+            return
         
-        # Save words to database
-        saved_words = []
-        current_time = timestamp
+        timestamp = data.get('timestamp', 0.0)
         
-        for word_data in dummy_words:
-            word = RegionWord(
-                region_id=region_id,
-                word=word_data['word'],
-                start_time=current_time,
-                end_time=current_time + word_data['duration'],
-                confidence=word_data['confidence']
-            )
-            db.session.add(word)
-            saved_words.append(word)
-            current_time += word_data['duration']
+        if not image_data:
+            emit('error', {'message': 'No image data provided'})
+            return
         
-        db.session.commit()
+        if not stream.get('geometry'):
+            emit('error', {'message': 'No region geometry stored. Send process_region_image instead'})
+            return
         
-        # Prepare response
-        response_data = {
-            'region_index': region_index,
-            'region_id': region_id,
-            'timestamp': timestamp,
-            'words': [w.to_dict() for w in saved_words],
-            'text': ' '.join([w.word for w in saved_words])
-        }
+        # When the server limits regions per tick, rotate through them
+        region_indices = sorted(int(i) for i in stream.get('geometry', {}))
+        max_regions = stream.get('rate', {}).get('max_regions_per_tick', len(region_indices))
+        if len(region_indices) > max_regions:
+            # Incremented in the store, so concurrent frames take different turns
+            start = session_store.incr_field(
+                stream_key(stream['recording_uuid']), 'next_region', max_regions,
+                app.config['STREAM_RESUME_TTL']
+            ) - max_regions
+            start %= len(region_indices)
+            region_indices = (region_indices[start:] + region_indices[:start])[:max_regions]
+        
+        if not reserve_inflight(request.sid, len(image_data)):
+            emit('frame_dropped', {
+                'timestamp': timestamp,
+                'reason': 'inflight_limit'
+            })
+            return
+        reserved = len(image_data)
         
-        # Send back to client
-        emit('region_text_result', response_data)
+        try:
+            results = run_blocking(
+                ocr_and_save_full_frame, stream, region_indices, timestamp, image_data
+            )
+        except Overloaded:
+            emit('frame_dropped', {
+                'timestamp': timestamp,
+                'reason': 'server_busy'
+            })
+            return
+        
+        for response_data in results:
+            emit('region_text_result', response_data)
+        
+        # Feed this frame's cost back into the capture rate
+        with inflight_lock:
+            queue_depth = inflight_frames.get(request.sid, 1) - 1
+        session_store.touch_member(LIVE_STREAMS, stream['recording_uuid'])
+        capture_policy.observe(stream, (time.monotonic() - started) * 1000, queue_depth)
+        settings = capture_policy.update(stream, live_stream_count())
+        save_stream(stream, 'load', 'rate', 'rate_checked_at')
+        if settings:
+            emit('rate_control', settings)
         
     except Exception as e:
-        db.session.rollback()
-        emit('error', {'message': str(e), 'region_index': data.get('region_index')})
+        emit('error', {'message': str(e)})
+    finally:
+        if reserved:
+            release_inflight(request.sid, reserved)
+
+def collect_stream_stats(recording_uuid):
+    """Per-region word counts for stop_stream (runs on the blocking pool)"""
+    recording = Recording.query.filter_by(uuid=recording_uuid).first()
+    
+    # Maintained counters; no RegionWord rows are loaded
+    region_stats = [{
+        'region_index': region.region_index,
+        'word_count': region.word_count or 0,
+        'first_timestamp': region.first_timestamp,
+        'last_timestamp': region.last_timestamp
+    } for region in recording.regions]
+    
+    return recording.word_count or 0, region_stats
 
 @socketio.on('stop_stream')
 def handle_stop_stream():
@@ -633,23 +3141,10 @@ def handle_stop_stream():
     4. Call upload API to save video
     """
     try:
-        if request.sid in active_sessions:
-            session = active_sessions[request.sid]
-            recording_uuid = session['recording_uuid']
-            
+        recording_uuid = connection_streams.get(request.sid)
+        if recording_uuid:
             # Get statistics
-            recording = Recording.query.filter_by(uuid=recording_uuid).first()
-            
-            total_words = 0
-            region_stats = []
-            
-            for region in recording.regions:
-                word_count = len(region.words)
-                total_words += word_count
-                region_stats.append({
-                    'region_index': region.region_index,
-                    'word_count': word_count
-                })
+            total_words, region_stats = run_blocking(collect_stream_stats, recording_uuid)
             
             emit('stream_stopped', {
                 'recording_uuid': recording_uuid,
@@ -658,7 +3153,15 @@ def handle_stop_stream():
                 'message': 'Stream stopped. You can now upload the video file.'
             })
             
-            del active_sessions[request.sid]
+            stream = session_store.get_fields(stream_key(recording_uuid)) or {}
+            session_store.delete(
+                stream_key(recording_uuid),
+                *(segment_key(recording_uuid, index) for index in stream.get('regions', {}))
+            )
+            session_store.remove_member(LIVE_STREAMS, recording_uuid)
+            del connection_streams[request.sid]
+            # The list may still show counts from before the last frames
+            invalidate_recording(recording_uuid)
         else:
             emit('error', {'message': 'No active session found'})
             
@@ -668,7 +3171,42 @@ def handle_stop_stream():
 # Serve uploaded files
 @app.route('/uploads/<path:filename>')
 def serve_file(filename):
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+    """
+    Serve recordings with Range (206) and conditional (ETag/Last-Modified,
+    304) support. The file body goes through wsgi.file_wrapper, which
+    servers such as gunicorn turn into sendfile(). When a front end is
+    configured, only the redirect header is sent and it streams the file.
+    """
+    # Compare resolved paths, so './partial/x' or 'a/../partial/x' can't
+    # reach unfinished uploads
+    path = safe_join(app.config['UPLOAD_FOLDER'], filename)
+    if path is None:
+        abort(404)
+    partial_dir = os.path.realpath(app.config['PARTIAL_UPLOAD_FOLDER'])
+    if os.path.commonpath([os.path.realpath(path), partial_dir]) == partial_dir:
+        abort(404)
+
+    accel_prefix = app.config['UPLOAD_ACCEL_REDIRECT_PREFIX']
+    if accel_prefix:
+        if not os.path.isfile(path):
+            abort(404)
+
+        response = make_response('')
+        response.headers['X-Accel-Redirect'] = f"{accel_prefix.rstrip('/')}/{quote(filename)}"
+        response.headers['Content-Type'] = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    else:
+        response = send_from_directory(
+            app.config['UPLOAD_FOLDER'],
+            filename,
+            conditional=True,
+            etag=True,
+            max_age=app.config['UPLOAD_CACHE_MAX_AGE']
+        )
+
+    response.headers['Accept-Ranges'] = 'bytes'
+    response.cache_control.public = True
+    response.cache_control.max_age = app.config['UPLOAD_CACHE_MAX_AGE']
+    return response
 
 # Health check endpoint
 @app.route('/api/health', methods=['GET'])
@@ -676,8 +3214,38 @@ def health_check():
     return jsonify({
         'success': True,
         'message': 'Server is running',
-        'timestamp': datetime.utcnow().isoformat()
+        'timestamp': datetime.utcnow().isoformat(),
+        'response_cache': response_cache.stats()
     }), 200
 
+background_tasks_started = False
+
+def start_background_tasks():
+    """
+    Start the upload cleanup, re-OCR dispatch and archive loops, once per
+    process. Called by the server entry point, not on import, so CLI
+    commands and tests that import the app don't run them.
+    """
+    global background_tasks_started
+    if background_tasks_started:
+        return
+    background_tasks_started = True
+    socketio.start_background_task(upload_cleanup_loop)
+    socketio.start_background_task(reocr_dispatch_loop)
+    if app.config['ARCHIVE_AFTER_DAYS'] > 0:
+        socketio.start_background_task(archive_loop)
+
 if __name__ == '__main__':
-    socketio.run(app, debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    # e.g. SOCKETIO_ASYNC_MODE=eventlet FLASK_DEBUG=0 python app.py
+    # Several workers: give each its own PORT, the same SESSION_STORE_URL and
+    # SOCKETIO_MESSAGE_QUEUE (redis://...), and a sticky load balancer in front
+    debug = os.environ.get('FLASK_DEBUG', '1' if ASYNC_MODE == 'threading' else '0') == '1'
+    # With the reloader, only the child process that serves runs the loops
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_tasks()
+    socketio.run(
+        app,
+        debug=debug,
+        host='0.0.0.0',
+        port=int(os.environ.get('PORT', 5000))
+    )
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+Size-classed pool of reusable buffers for trt_infer.py
+
+trt_infer.py leases pinned host and device buffers for each engine
+executor here and gives them back when the executor is retired. The pool
+only does the bookkeeping; the allocators are passed in, so it imports
+(and is tested) without pycuda or a GPU.
+"""
+import threading
+
+
+class PooledBuffer:
+    """A buffer leased from BufferPool; `size` is its size class in bytes"""
+    def __init__(self, kind, size, buffer):
+        self.kind = kind
+        self.size = size
+        self.buffer = buffer
+
+    def array(self, dtype, count):
+        """The leading count elements of a host buffer as dtype (a numpy dtype)"""
+        return self.buffer[:count * dtype.itemsize].view(dtype)
+
+
+class BufferPool:
+    """
+    Process-wide pool of pinned host and device buffers in size classes a
+    quarter of a power of two apart, so a buffer is at most 25% larger
+    than asked for. Executors lease their input/output buffers here and give
+    them back on cleanup, so switching or reloading models reuses memory
+    instead of pinning and allocating it again. Up to max_free_bytes of
+    idle buffers per kind are kept; beyond that they are freed.
+    allocate: kind -> callable(size) returning a new buffer; free: kind ->
+    callable(buffer) for memory that isn't released by garbage collection.
+    trt_infer.py passes pycuda's allocators, so leasing and releasing
+    device buffers needs a current CUDA context.
+    """
+    MIN_SIZE = 64 * 1024
+
+    def __init__(self, max_free_bytes, allocate, free=None):
+        self.max_free_bytes = max_free_bytes
+        self.allocate = allocate
+        self.free_buffer = free or {}
+        self.lock = threading.Lock()
+        self.free = {kind: {} for kind in allocate}  # kind -> size class -> [buffers]
+        self.stats = {
+            kind: {"leased": 0, "leased_bytes": 0, "free": 0, "free_bytes": 0, "hits": 0, "misses": 0}
+            for kind in self.free
+        }
+
+    @classmethod
+    def size_class(cls, nbytes):
+        """nbytes rounded up to 2**k, 1.25 * 2**k, 1.5 * 2**k or 1.75 * 2**k"""
+        if nbytes <= cls.MIN_SIZE:
+            return cls.MIN_SIZE
+        step = 1 << ((nbytes - 1).bit_length() - 3)
+        return -(-nbytes // step) * step
+
+    def lease(self, kind, nbytes):
+        size = self.size_class(nbytes)
+        buffer = None
+        with self.lock:
+            stats = self.stats[kind]
+            free = self.free[kind].get(size)
+            if free:
+                buffer = free.pop()
+                stats["hits"] += 1
+                stats["free"] -= 1
+                stats["free_bytes"] -= size
+            else:
+                stats["misses"] += 1
+            stats["leased"] += 1
+            stats["leased_bytes"] += size
+
+        if buffer is None:
+            buffer = self.allocate[kind](size)
+        return PooledBuffer(kind, size, buffer)
+
+    def release(self, lease):
+        with self.lock:
+            stats = self.stats[lease.kind]
+            stats["leased"] -= 1
+            stats["leased_bytes"] -= lease.size
+            if stats["free_bytes"] + lease.size <= self.max_free_bytes:
+                self.free[lease.kind].setdefault(lease.size, []).append(lease.buffer)
+                stats["free"] += 1
+                stats["free_bytes"] += lease.size
+                return
+
+        # Over the cap: give the memory back
+        free = self.free_buffer.get(lease.kind)
+        if free:
+            free(lease.buffer)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                kind: dict(stats, size_classes=sorted(size for size, free in self.free[kind].items() if free))
+                for kind, stats in self.stats.items()
+            }
@@ -0,0 +1,181 @@
+"""
+Priority scheduling of inference batches for trt_infer.py
+
+Requests are split into batch-sized chunks and queued by priority class;
+one worker thread runs them on the GPU through the model manager's
+executors. The scheduler only needs the manager's batch_size and
+lease(model_name), so it imports (and is tested) without TensorRT.
+"""
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+# Scheduling classes, most urgent first. Batches of a higher class always
+# run before queued batches of a lower one.
+PRIORITY_CLASSES = ("realtime", "interactive", "bulk")
+
+
+class DeadlineExceeded(Exception):
+    """A batch was still queued when its request's deadline passed"""
+
+
+class ClientDisconnected(Exception):
+    """The client went away while its batches were queued"""
+
+
+class ClassMetrics:
+    """Queueing statistics of one priority class"""
+    def __init__(self):
+        self.queued = 0
+        self.batches = 0
+        self.images = 0
+        self.expired = 0
+        self.failed = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.recent_waits = deque(maxlen=1000)
+
+    def observe_wait(self, seconds):
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+        self.recent_waits.append(seconds)
+
+    def to_dict(self):
+        waits = sorted(self.recent_waits)
+
+        def pct(p):
+            return round(waits[min(len(waits) - 1, int(len(waits) * p))] * 1000, 2) if waits else None
+
+        return {
+            "queued": self.queued,
+            "batches": self.batches,
+            "images": self.images,
+            "expired": self.expired,
+            "failed": self.failed,
+            "queue_wait_ms": {
+                "mean": round(self.wait_total / self.batches * 1000, 2) if self.batches else None,
+                "p50": pct(0.5),
+                "p95": pct(0.95),
+                "p99": pct(0.99),
+                "max": round(self.wait_max * 1000, 2)
+            }
+        }
+
+
+class InferenceJob:
+    """The batches of one request"""
+    def __init__(self, model_name, priority, deadline):
+        self.model_name = model_name
+        self.priority = priority
+        self.deadline = deadline
+        self.cancelled = False
+
+
+class InferenceScheduler:
+    """
+    One GPU worker thread fed from a priority queue of batch-sized chunks.
+    Requests are split into chunks of batch_size, so a large bulk request
+    holds the GPU for one batch at a time and realtime chunks queued
+    meanwhile run next. Within a class, chunks run in arrival order. A
+    chunk whose request is past its deadline (or already failed) is dropped
+    without being computed.
+    """
+    def __init__(self, manager):
+        self.manager = manager
+        self.queue = []  # heap of (class rank, sequence, job, images, future, enqueued_at)
+        self.sequence = itertools.count()
+        self.ready = threading.Condition()
+        self.metrics = {name: ClassMetrics() for name in PRIORITY_CLASSES}
+        self.batch_seconds = 0.05  # moving average of one batch's GPU time
+        threading.Thread(target=self.work, name="trt-scheduler", daemon=True).start()
+
+    def queue_depth(self):
+        return len(self.queue)
+
+    def new_job(self, model_name, priority="interactive", deadline=None):
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"priority must be one of {list(PRIORITY_CLASSES)}")
+        return InferenceJob(model_name, priority, deadline)
+
+    def submit(self, job, images):
+        """Queue images for job in batch-sized chunks; one Future per chunk"""
+        rank = PRIORITY_CLASSES.index(job.priority)
+        batch_size = self.manager.batch_size
+        futures = []
+        with self.ready:
+            for i in range(0, len(images), batch_size):
+                future = Future()
+                heapq.heappush(self.queue, (
+                    rank, next(self.sequence), job, images[i:i + batch_size], future, time.monotonic()
+                ))
+                futures.append(future)
+            self.metrics[job.priority].queued += len(futures)
+            self.ready.notify()
+        return futures
+
+    def run(self, images, model_name, priority="interactive", deadline=None, should_cancel=None):
+        """
+        Queue images in batches and yield each batch's results in order.
+        should_cancel is polled while waiting; when it returns True the
+        request's batches are dropped and ClientDisconnected is raised.
+        """
+        job = self.new_job(model_name, priority, deadline)
+        futures = self.submit(job, images)
+        try:
+            for future in futures:
+                while True:
+                    try:
+                        yield future.result(timeout=0.25 if should_cancel else None)
+                        break
+                    except FutureTimeout:
+                        if should_cancel():
+                            raise ClientDisconnected()
+        finally:
+            # Failed, expired, or the caller stopped: drop what's still queued
+            job.cancelled = True
+
+    def work(self):
+        while True:
+            with self.ready:
+                while not self.queue:
+                    self.ready.wait()
+                _, _, job, images, future, enqueued_at = heapq.heappop(self.queue)
+                metrics = self.metrics[job.priority]
+                metrics.queued -= 1
+
+            now = time.monotonic()
+            if job.cancelled:
+                future.cancel()
+                continue
+            if job.deadline is not None and now > job.deadline:
+                metrics.expired += 1
+                job.cancelled = True
+                future.set_exception(DeadlineExceeded(
+                    f"{job.priority} batch waited {(now - enqueued_at) * 1000:.0f}ms, past its deadline"
+                ))
+                continue
+
+            metrics.observe_wait(now - enqueued_at)
+            future.set_running_or_notify_cancel()
+            try:
+                with self.manager.lease(job.model_name) as executor:
+                    result = executor.execute_batch(images)
+            except Exception as e:
+                metrics.failed += 1
+                job.cancelled = True
+                future.set_exception(e)
+                continue
+            self.batch_seconds = 0.8 * self.batch_seconds + 0.2 * (time.monotonic() - now)
+            metrics.batches += 1
+            metrics.images += len(images)
+            future.set_result(result)
+
+    def snapshot(self):
+        with self.ready:
+            return {
+                "queue_depth": len(self.queue),
+                "classes": {name: m.to_dict() for name, m in self.metrics.items()}
+            }
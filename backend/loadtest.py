@@ -0,0 +1,382 @@
+"""
+Socket.IO load generator for the recording backend (app.py)
+
+Starts N simulated cameras, each running the same flow as Recording.jsx:
+initialize -> regions -> start_stream -> process_region_image (M regions
+at F fps, binary JPEG payloads) -> stop_stream -> chunked upload.
+With --full-frame, regions are created with geometry and each tick sends
+one process_frame with the regions stacked in a single JPEG.
+It reports event round-trip p50/p99, errors, database growth and server
+CPU, and writes the results as JSON for regression tracking.
+
+Usage:
+    # Start a throwaway app.py (fresh SQLite DB, dummy OCR) and load it
+    python loadtest.py --spawn --clients 50 --regions 4 --fps 1 --duration 60
+
+    # Load an already running server
+    python loadtest.py --url http://localhost:5000 --clients 10
+
+Requires python-socketio[client], numpy and opencv-python.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from datetime import datetime
+
+import cv2
+import numpy as np
+import socketio
+
+SAMPLE_WORDS = ['The', 'quick', 'brown', 'fox', 'jumps', 'over', 'the', 'lazy', 'dog', 'Exit', 'Platform', 'Gate']
+
+
+def make_jpegs(count, width, height, quality):
+    """Noisy frames with printed text, so payload sizes look like camera crops"""
+    frames = []
+    for _ in range(count):
+        img = np.random.randint(0, 60, (height, width, 3), dtype=np.uint8)
+        img[:] = cv2.GaussianBlur(img, (5, 5), 0)
+        text = ' '.join(random.choice(SAMPLE_WORDS) for _ in range(3))
+        cv2.putText(img, text, (5, height // 2), cv2.FONT_HERSHEY_SIMPLEX,
+                    height / 60.0, (255, 255, 255), 2, cv2.LINE_AA)
+        ok, buf = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, int(quality * 100)])
+        frames.append(buf.tobytes())
+    return frames
+
+
+def api(base_url, method, path, payload=None, body=None, content_type='application/json'):
+    if payload is not None:
+        body = json.dumps(payload).encode('utf-8')
+    req = urllib.request.Request(
+        base_url + path,
+        data=body,
+        method=method,
+        headers={'Content-Type': content_type}
+    )
+    with urllib.request.urlopen(req, timeout=60) as res:
+        return json.loads(res.read())
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    k = (len(values) - 1) * pct / 100.0
+    lo, hi = int(k), min(int(k) + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+class SimulatedClient(threading.Thread):
+    """One camera: the full Recording.jsx flow against the server"""
+
+    def __init__(self, client_id, args, frames, stats):
+        super().__init__(daemon=True)
+        self.client_id = client_id
+        self.args = args
+        self.frames = frames
+        self.stats = stats
+        self.pending = {}
+        self.pending_lock = threading.Lock()
+        self.interval = 1.0 / args.fps
+        self.started = threading.Event()
+        self.stopped = threading.Event()
+
+    def record(self, key, value=1):
+        with self.stats['lock']:
+            self.stats[key] = self.stats.get(key, 0) + value
+
+    def error(self, message):
+        with self.stats['lock']:
+            errors = self.stats['errors']
+            errors[message] = errors.get(message, 0) + 1
+
+    def on_result(self, data):
+        key = (data.get('region_index'), data.get('timestamp'))
+        with self.pending_lock:
+            sent_at = self.pending.pop(key, None)
+        if sent_at is not None:
+            with self.stats['lock']:
+                self.stats['rtt_ms'].append((time.perf_counter() - sent_at) * 1000)
+        self.record('received')
+
+    def on_dropped(self, data):
+        region_index, timestamp = data.get('region_index'), data.get('timestamp')
+        # A dropped full frame carries no region_index: all its regions are gone
+        indexes = range(self.args.regions) if region_index is None else [region_index]
+        with self.pending_lock:
+            for index in indexes:
+                self.pending.pop((index, timestamp), None)
+        self.record('dropped', len(indexes))
+
+    def on_rate_control(self, data):
+        if self.args.follow_rate_control:
+            self.interval = data['target_interval_ms'] / 1000.0
+
+    def run(self):
+        args = self.args
+        sio = socketio.Client(reconnection=False)
+        sio.on('region_text_result', self.on_result)
+        sio.on('frame_dropped', self.on_dropped)
+        sio.on('rate_control', self.on_rate_control)
+        sio.on('stream_started', lambda data: self.started.set())
+        sio.on('stream_stopped', lambda data: self.stopped.set())
+        sio.on('error', lambda data: self.error(data.get('message', 'unknown')))
+
+        try:
+            data = api(args.url, 'POST', '/api/recordings/initialize',
+                       {'title': f'loadtest client {self.client_id}', 'num_regions': 0})
+            recording_uuid = data['data']['recording_uuid']
+            if args.full_frame:
+                width, height = (int(v) for v in args.crop.split('x'))
+                api(args.url, 'POST', f'/api/recordings/{recording_uuid}/regions', {'regions': [
+                    {'x': 0, 'y': i * height, 'w': width, 'h': height} for i in range(args.regions)
+                ]})
+            else:
+                api(args.url, 'POST', f'/api/recordings/{recording_uuid}/regions',
+                    {'num_regions': args.regions})
+
+            sio.connect(args.url, transports=['websocket'])
+            sio.emit('start_stream', {'recording_uuid': recording_uuid})
+            if not self.started.wait(30):
+                raise TimeoutError('start_stream timed out')
+
+            deadline = time.monotonic() + args.duration
+            next_tick = time.monotonic()
+            while time.monotonic() < deadline:
+                timestamp = time.time()
+                if args.full_frame:
+                    self.send_frame(sio, timestamp)
+                else:
+                    self.send_regions(sio, timestamp)
+                next_tick += self.interval
+                time.sleep(max(0.0, next_tick - time.monotonic()))
+
+            # Give in-flight frames a moment to come back
+            settle = time.monotonic() + 5
+            while self.pending and time.monotonic() < settle:
+                time.sleep(0.05)
+            self.record('lost', len(self.pending))
+
+            sio.emit('stop_stream')
+            if not self.stopped.wait(30):
+                self.error('stop_stream timed out')
+
+            self.upload(recording_uuid)
+            self.record('completed')
+
+        except Exception as e:
+            self.error(f'{type(e).__name__}: {e}')
+        finally:
+            if sio.connected:
+                sio.disconnect()
+
+    def send_frame(self, sio, timestamp):
+        payload = random.choice(self.frames)
+        with self.pending_lock:
+            for region_index in range(self.args.regions):
+                self.pending[(region_index, timestamp)] = time.perf_counter()
+        sio.emit('process_frame', {'image': payload, 'timestamp': timestamp})
+        self.record('sent', self.args.regions)
+        self.record('bytes_sent', len(payload))
+
+    def send_regions(self, sio, timestamp):
+        for region_index in range(self.args.regions):
+            payload = random.choice(self.frames)
+            with self.pending_lock:
+                self.pending[(region_index, timestamp)] = time.perf_counter()
+            sio.emit('process_region_image', {
+                'region_index': region_index,
+                'image': payload,
+                'timestamp': timestamp
+            })
+            self.record('sent')
+            self.record('bytes_sent', len(payload))
+
+    def upload(self, recording_uuid):
+        video = os.urandom(self.args.video_kb * 1024)
+        base = f'/api/recordings/{recording_uuid}/uploads'
+        init = api(self.args.url, 'POST', base,
+                   {'filename': 'recording.webm', 'total_size': len(video), 'mime_type': 'video/webm'})
+        upload_id = init['data']['upload_id']
+        chunk_size = init['data']['chunk_size']
+        offset = init['data']['offset']
+        while offset < len(video):
+            res = api(self.args.url, 'PUT', f'{base}/{upload_id}?offset={offset}',
+                      body=video[offset:offset + chunk_size], content_type='application/octet-stream')
+            offset = res['data']['offset']
+        api(self.args.url, 'POST', f'{base}/{upload_id}/finalize',
+            {'sha256': hashlib.sha256(video).hexdigest(), 'duration': self.args.duration})
+
+
+def process_cpu_seconds(pid):
+    """utime + stime of a process, from /proc (Linux only)"""
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def db_snapshot(db_path):
+    if not db_path or not os.path.exists(db_path):
+        return None
+    size = sum(
+        os.path.getsize(db_path + suffix)
+        for suffix in ('', '-wal')
+        if os.path.exists(db_path + suffix)
+    )
+    snapshot = {'bytes': size}
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        for table in ('recordings', 'regions', 'region_words', 'transcript_segments'):
+            try:
+                snapshot[table] = conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+            except sqlite3.Error:
+                pass
+    finally:
+        conn.close()
+    return snapshot
+
+
+def spawn_server(args):
+    """Run app.py from a scratch directory with its own SQLite DB"""
+    workdir = tempfile.mkdtemp(prefix='ocr-loadtest-')
+    db_path = os.path.join(workdir, 'loadtest.db')
+    env = dict(
+        os.environ,
+        DATABASE_URL=f'sqlite:///{db_path}',
+        SOCKETIO_ASYNC_MODE=args.async_mode,
+        FLASK_DEBUG='0',
+        PORT=str(args.port)
+    )
+    app_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+    server = subprocess.Popen(
+        [sys.executable, app_path],
+        cwd=workdir,
+        env=env,
+        stdout=subprocess.DEVNULL if not args.server_output else None,
+        stderr=subprocess.STDOUT if not args.server_output else None
+    )
+
+    url = f'http://127.0.0.1:{args.port}'
+    for _ in range(100):
+        try:
+            api(url, 'GET', '/api/health')
+            return server, url, db_path, workdir
+        except Exception:
+            if server.poll() is not None:
+                raise RuntimeError('app.py exited during startup')
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError('app.py did not become healthy')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the recording Socket.IO backend')
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--spawn', action='store_true', help='start a local app.py with a scratch SQLite DB')
+    parser.add_argument('--port', type=int, default=5055, help='port for --spawn')
+    parser.add_argument('--async-mode', default='threading', help='SOCKETIO_ASYNC_MODE for --spawn')
+    parser.add_argument('--server-output', action='store_true', help='show spawned server logs')
+    parser.add_argument('--server-pid', type=int, help='pid to sample CPU from when not spawning')
+    parser.add_argument('--db', help='SQLite file to measure growth of when not spawning')
+    parser.add_argument('--clients', type=int, default=10)
+    parser.add_argument('--regions', type=int, default=4)
+    parser.add_argument('--fps', type=float, default=1.0)
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds of streaming per client')
+    parser.add_argument('--ramp', type=float, default=5.0, help='seconds over which clients start')
+    parser.add_argument('--crop', default='320x96', help='region crop size WxH')
+    parser.add_argument('--full-frame', action='store_true',
+                        help='send one frame per tick and let the server crop the regions')
+    parser.add_argument('--quality', type=float, default=0.6)
+    parser.add_argument('--video-kb', type=int, default=512, help='size of the uploaded fake video')
+    parser.add_argument('--follow-rate-control', action='store_true')
+    parser.add_argument('--output', default=f"loadtest-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    args = parser.parse_args()
+
+    server, workdir = None, None
+    db_path, server_pid = args.db, args.server_pid
+    if args.spawn:
+        server, args.url, db_path, workdir = spawn_server(args)
+        server_pid = server.pid
+
+    width, height = (int(v) for v in args.crop.split('x'))
+    frames = make_jpegs(16, width, height * (args.regions if args.full_frame else 1), args.quality)
+    stats = {'lock': threading.Lock(), 'rtt_ms': [], 'errors': {}}
+
+    try:
+        db_before = db_snapshot(db_path)
+        cpu_before = process_cpu_seconds(server_pid) if server_pid else None
+        wall_start = time.monotonic()
+
+        clients = [SimulatedClient(i, args, frames, stats) for i in range(args.clients)]
+        for client in clients:
+            client.start()
+            time.sleep(args.ramp / max(args.clients, 1))
+        for client in clients:
+            client.join()
+
+        wall = time.monotonic() - wall_start
+        cpu_after = process_cpu_seconds(server_pid) if server_pid else None
+        db_after = db_snapshot(db_path)
+    finally:
+        if server:
+            server.terminate()
+            server.wait(10)
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    rtt = stats['rtt_ms']
+    results = {
+        'config': {k: v for k, v in vars(args).items()},
+        'started_at': datetime.utcnow().isoformat(),
+        'wall_seconds': round(wall, 2),
+        'frames': {
+            'sent': stats.get('sent', 0),
+            'received': stats.get('received', 0),
+            'dropped': stats.get('dropped', 0),
+            'lost': stats.get('lost', 0),
+            'bytes_sent': stats.get('bytes_sent', 0),
+            'throughput_fps': round(stats.get('received', 0) / wall, 2) if wall else None
+        },
+        'rtt_ms': {
+            'count': len(rtt),
+            'p50': percentile(rtt, 50),
+            'p90': percentile(rtt, 90),
+            'p99': percentile(rtt, 99),
+            'max': max(rtt) if rtt else None
+        },
+        'clients_completed': stats.get('completed', 0),
+        'errors': stats['errors'],
+        'db': {
+            'before': db_before,
+            'after': db_after,
+            'growth': {
+                key: db_after[key] - db_before.get(key, 0)
+                for key in db_after
+            } if db_before and db_after else None
+        },
+        'server_cpu_percent': round(100 * (cpu_after - cpu_before) / wall, 1)
+        if cpu_before is not None and cpu_after is not None else None
+    }
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    print(json.dumps({k: results[k] for k in ('frames', 'rtt_ms', 'errors', 'server_cpu_percent')}, indent=2))
+    print(f'Results written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
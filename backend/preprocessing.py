@@ -0,0 +1,92 @@
+"""
+Host-side image preparation for trt_infer.py
+
+Turns PIL text crops into the input tensor of the recognition engines,
+and guesses their script for model routing. NumPy/PIL/OpenCV only, so it
+imports (and is tested) without TensorRT or a GPU.
+"""
+import cv2
+import numpy as np
+from PIL import Image
+
+# Engine input: C x H x W per image
+C = 3
+H = 32
+W = 128
+
+
+def preprocess_images(images, dtype, out=None):
+    """
+    PIL images as an N x C x H x W array of the engine's input dtype.
+    float32 / float16: resized and normalized to [-1, 1], the same as the
+    training transform (bicubic resize, ToTensor, Normalize(0.5, 0.5)).
+    uint8: resized only; such engines normalize on the device, and the
+    copy to the GPU is 4x smaller than float32.
+    """
+    if out is None:
+        out = np.empty((len(images), C, H, W), dtype=dtype)
+    for i, image in enumerate(images):
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        pixels = np.asarray(image.resize((W, H), Image.BICUBIC)).transpose(2, 0, 1)
+        if out.dtype == np.uint8:
+            out[i] = pixels
+        else:
+            out[i] = pixels * (2.0 / 255.0) - 1.0
+    return out
+
+
+def classify_script(image, headline_coverage=0.6):
+    """
+    Guess the script of a text crop (PIL image) from its ink profile:
+    "devanagari", "latin", or None when there's too little ink to tell.
+    Devanagari letters hang from a headline (shirorekha) joining each word,
+    so one row in the upper part of the text covers most of its width and
+    carries on across the gaps between letters. Latin capitals (T, E, F)
+    can fill that row too, but their bars stop at each letter. Costs a
+    resize and a threshold.
+    """
+    gray = np.asarray(image.convert("L"))
+    height, width = gray.shape
+    if height < 8 or width < 8:
+        return None
+    scale = 48 / height
+    gray = cv2.resize(gray, (max(8, round(width * scale)), 48), interpolation=cv2.INTER_AREA)
+    _, ink = cv2.threshold(gray, 0, 1, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    if ink.mean() > 0.5:
+        ink = 1 - ink  # light text on a dark background
+
+    rows = ink.mean(axis=1)
+    band = np.flatnonzero(rows > 0.02)
+    inked_width = ink.any(axis=0).mean()
+    if band.size < 6 or inked_width == 0:
+        return None
+
+    # The headline sits above the middle of the text band (matras may rise
+    # above it, descenders hang below); underlines and strike-through don't
+    peak = int(np.argmax(rows))
+    upper = band[0] + (band[-1] - band[0]) * 0.5
+    if peak > upper or rows[peak] / inked_width < headline_coverage:
+        return "latin"
+
+    # Split the letter bodies below the headline into runs of inked columns
+    bottom = peak
+    while bottom + 1 < len(rows) and rows[bottom + 1] >= rows[peak] * 0.5:
+        bottom += 1
+    headline = ink[max(peak - 1, 0):bottom + 1].any(axis=0)
+    runs = []  # [first, last] column of each run
+    for x in np.flatnonzero(ink[bottom + 1:].any(axis=0)):
+        if runs and x == runs[-1][1] + 1:
+            runs[-1][1] = x
+        else:
+            runs.append([x, x])
+
+    # A headline bridges a gap between letters, or spans a whole word
+    # whose letters touch; spaces between words are bridged by neither
+    if any(headline[a[1] + 1:b[0]].all() for a, b in zip(runs, runs[1:])):
+        return "devanagari"
+    text_height = band[-1] - band[0] + 1
+    for first, last in runs:
+        if last - first + 1 > 1.5 * text_height and headline[first:last + 1].mean() >= 0.9:
+            return "devanagari"
+    return "latin"
@@ -0,0 +1,198 @@
+"""
+Offline re-OCR of an uploaded recording
+
+Runs in a worker process of app.py's re-OCR pool, so it never touches the
+database: it reads the video, talks to the OCR service and returns plain
+data that app.py writes back as the region transcripts.
+
+The video is decoded once, front to back. A region is sampled when its
+crop changes (mean difference of a small greyscale thumbnail above
+change_threshold) or when max_gap seconds passed since its last sample,
+so a static slide costs one crop instead of one per second. Sampled crops
+are recognized in batches of batch_size by the OCR service (trt_infer.py
+/recognize). Each sample's text holds until the region's next sample;
+consecutive samples with near-identical text are merged into one segment.
+"""
+import base64
+import difflib
+import json
+import time
+import urllib.error
+import urllib.request
+
+import cv2
+import numpy as np
+
+THUMB_SIZE = (32, 16)  # (width, height) used for change detection
+# A /recognize shed by admission control (429/503) is retried after its
+# Retry-After, up to OCR_RETRIES times and OCR_RETRY_MAX_WAIT seconds a wait
+OCR_RETRIES = 8
+OCR_RETRY_MAX_WAIT = 60
+
+
+def crop_region(frame, region):
+    """Region crop clipped to the frame, or None if it falls outside"""
+    height, width = frame.shape[:2]
+    x0 = max(0, int(region['x']))
+    y0 = max(0, int(region['y']))
+    x1 = min(width, int(region['x'] + region['w']))
+    y1 = min(height, int(region['y'] + region['h']))
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return frame[y0:y1, x0:x1]
+
+
+def thumbnail(crop):
+    grey = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(grey, THUMB_SIZE, interpolation=cv2.INTER_AREA).astype(np.int16)
+
+
+def sample_frames(video_path, regions, change_threshold, max_gap, stats):
+    """
+    Yield (region_index, timestamp, crop) for every region sample.
+    Timestamps are seconds from the start of the video.
+    """
+    capture = cv2.VideoCapture(video_path)
+    if not capture.isOpened():
+        raise ValueError(f'Cannot open video: {video_path}')
+
+    last = {}  # region_index -> (timestamp, thumbnail) of the last sample
+    try:
+        while True:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            timestamp = capture.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+            stats['frames_decoded'] += 1
+            stats['duration'] = max(stats['duration'], timestamp)
+
+            for region in regions:
+                crop = crop_region(frame, region)
+                if crop is None:
+                    continue
+                thumb = thumbnail(crop)
+                previous = last.get(region['region_index'])
+                if previous and timestamp - previous[0] < max_gap \
+                        and np.abs(thumb - previous[1]).mean() < change_threshold:
+                    continue
+                last[region['region_index']] = (timestamp, thumb)
+                stats['samples'] += 1
+                yield region['region_index'], timestamp, crop
+    finally:
+        capture.release()
+
+
+def retry_delay(retry_after, attempt):
+    """Seconds to wait before retrying a shed request"""
+    try:
+        delay = float(retry_after)
+    except (TypeError, ValueError):
+        delay = 2 ** attempt  # missing, or an HTTP date
+    return min(max(delay, 0.5), OCR_RETRY_MAX_WAIT)
+
+
+def recognize(crops, options):
+    """(text, confidence) for each crop of a batch, from the OCR service"""
+    images = []
+    for crop in crops:
+        ok, jpeg = cv2.imencode('.jpg', crop, [cv2.IMWRITE_JPEG_QUALITY, options['jpeg_quality']])
+        images.append(base64.b64encode(jpeg.tobytes()).decode('ascii'))
+
+    # Bulk work queues behind live streams; a batch not started before we
+    # stop waiting for the response isn't worth running
+    request = urllib.request.Request(
+        options['ocr_url'],
+        data=json.dumps({
+            'model_name': options['model_name'],
+            'images': images,
+            'priority': 'bulk',
+            'deadline_ms': int(options['ocr_timeout'] * 1000)
+        }).encode(),
+        headers={'Content-Type': 'application/json'}
+    )
+    for attempt in range(OCR_RETRIES + 1):
+        try:
+            with urllib.request.urlopen(request, timeout=options['ocr_timeout']) as response:
+                body = json.loads(response.read())
+            break
+        except urllib.error.HTTPError as e:
+            if e.code not in (429, 503) or attempt == OCR_RETRIES:
+                raise
+            time.sleep(retry_delay(e.headers.get('Retry-After'), attempt))
+    results = body.get('recognized_texts')
+    if results is None or len(results) != len(crops):
+        raise RuntimeError(f"OCR service error: {body.get('error', 'bad response')}")
+    return [(text, confidence) for text, confidence in results]
+
+
+def build_segments(samples, end_of_video, similarity_threshold):
+    """
+    samples: [(timestamp, text, confidence), ...] for one region, in time order.
+    Returns [{'text', 'start_time', 'end_time', 'confidence', 'frame_count',
+              'words'}, ...]
+    """
+    segments = []
+    for i, (timestamp, text, confidence) in enumerate(samples):
+        text = ' '.join(text.split())
+        end = samples[i + 1][0] if i + 1 < len(samples) else end_of_video
+        current = segments[-1] if segments else None
+        if current and difflib.SequenceMatcher(None, current['text'], text).ratio() >= similarity_threshold:
+            current['end_time'] = max(current['end_time'], end)
+            current['confidence'] = max(current['confidence'], confidence)
+            current['frame_count'] += 1
+            continue
+        if text:
+            segments.append({
+                'text': text,
+                'start_time': timestamp,
+                'end_time': max(end, timestamp),
+                'confidence': confidence,
+                'frame_count': 1
+            })
+        elif current:
+            current['end_time'] = max(current['end_time'], timestamp)
+
+    # Spread a segment's words evenly over its span
+    for segment in segments:
+        words = segment['text'].split()
+        step = (segment['end_time'] - segment['start_time']) / len(words)
+        segment['words'] = [{
+            'word': word,
+            'start_time': segment['start_time'] + i * step,
+            'end_time': segment['start_time'] + (i + 1) * step,
+            'confidence': segment['confidence']
+        } for i, word in enumerate(words)]
+    return segments
+
+
+def run_reocr(video_path, regions, options):
+    """
+    Re-OCR one video.
+    regions: [{'region_index', 'x', 'y', 'w', 'h'}, ...] in video pixels
+    options: ocr_url, ocr_timeout, model_name, batch_size, jpeg_quality,
+             change_threshold, max_gap, similarity_threshold
+    Returns {'regions': {region_index: [segment, ...]}, 'frames_decoded',
+             'samples', 'duration'}
+    """
+    stats = {'frames_decoded': 0, 'samples': 0, 'duration': 0.0}
+    texts = {region['region_index']: [] for region in regions}
+    batch = []
+
+    def flush():
+        results = recognize([crop for _, _, crop in batch], options)
+        for (region_index, timestamp, _), (text, confidence) in zip(batch, results):
+            texts[region_index].append((timestamp, text, confidence))
+        batch.clear()
+
+    for sample in sample_frames(video_path, regions, options['change_threshold'], options['max_gap'], stats):
+        # Crops are views into a frame that the decoder may reuse
+        batch.append((sample[0], sample[1], sample[2].copy()))
+        if len(batch) >= options['batch_size']:
+            flush()
+    if batch:
+        flush()
+
+    return dict(stats, regions={
+        region_index: build_segments(samples, stats['duration'], options['similarity_threshold'])
+        for region_index, samples in texts.items()
+    })
@@ -0,0 +1,78 @@
+"""
+In-process cache of serialized API responses for app.py
+
+Entries are serialized responses (body, ETag and the like), stored under
+a request key together with the version they were built from. app.py
+keeps per-recording version counters in the session store and bumps them
+on every write, so an entry built from an older version is simply
+rebuilt on its next read; nothing has to find and delete stale entries,
+and workers sharing a Redis session store see each other's writes.
+
+The cache is bounded by total body size and evicts least recently used
+entries first, keeping sticky entries (completed recordings) longest.
+"""
+import threading
+from collections import OrderedDict
+
+
+class ResponseCache:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        # key -> (version, value, size), least recently used first. Sticky
+        # entries (responses that are not expected to change) are only
+        # evicted once no other entries are left.
+        self.entries = OrderedDict()
+        self.sticky = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version):
+        """Value cached for key at this version, or None"""
+        with self.lock:
+            for entries in (self.sticky, self.entries):
+                entry = entries.get(key)
+                if entry is not None and entry[0] == version:
+                    entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, key, version, value, size, sticky=False):
+        """Cache value (about size bytes) for key at this version"""
+        # One entry may not take over a large part of the cache
+        if size > self.max_bytes // 4:
+            return
+        with self.lock:
+            self._pop(key)
+            (self.sticky if sticky else self.entries)[key] = (version, value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                entries = self.entries or self.sticky
+                _, (_, _, evicted) = entries.popitem(last=False)
+                self.size -= evicted
+
+    def _pop(self, key):
+        for entries in (self.sticky, self.entries):
+            entry = entries.pop(key, None)
+            if entry:
+                self.size -= entry[2]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.sticky.clear()
+            self.size = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                'entries': len(self.entries) + len(self.sticky),
+                'sticky': len(self.sticky),
+                'bytes': self.size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
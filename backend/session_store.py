@@ -0,0 +1,166 @@
+"""
+Shared streaming-session state for app.py
+
+Streaming state (which recording a connection is feeding, its regions,
+open transcript segments, rate-control stats) lives behind this small
+key/value interface instead of a module-level dict, so several worker
+processes can serve the same stream and a client can reconnect to any
+of them.
+
+    MemorySessionStore  single process, for development
+    RedisSessionStore   any Redis-protocol server (Redis, KeyDB, Dragonfly,
+                        or a local stand-in), shared by all workers
+
+Values are JSON documents in both stores, so code that works against the
+in-memory store behaves the same against Redis (e.g. dict keys are
+always strings). A value can also be a set of fields (a Redis hash),
+each its own JSON document: writers that update different fields, or
+increment one, don't overwrite each other. Member sets are timestamped,
+so members left behind by a crashed worker stop being counted once they
+go stale.
+"""
+import json
+import threading
+import time
+
+
+class MemorySessionStore:
+    """In-process store with the same semantics as RedisSessionStore"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = {}  # key -> (json, expires_at or None)
+        self.members = {}  # name -> {member: last touched (wall clock)}
+
+    def _alive(self, key, now):
+        entry = self.values.get(key)
+        if entry and entry[1] is not None and entry[1] <= now:
+            del self.values[key]
+            return None
+        return entry
+
+    def get(self, key):
+        with self.lock:
+            entry = self._alive(key, time.monotonic())
+            return json.loads(entry[0]) if entry else None
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self.lock:
+            self.values[key] = (json.dumps(value), expires_at)
+
+    def delete(self, *keys):
+        with self.lock:
+            for key in keys:
+                self.values.pop(key, None)
+
+    def incr(self, key):
+        with self.lock:
+            entry = self._alive(key, time.monotonic())
+            value = (json.loads(entry[0]) if entry else 0) + 1
+            self.values[key] = (json.dumps(value), entry[1] if entry else None)
+            return value
+
+    def get_fields(self, key):
+        with self.lock:
+            entry = self._alive(key, time.monotonic())
+            return {field: json.loads(value) for field, value in entry[0].items()} if entry else None
+
+    def set_fields(self, key, fields, ttl=None):
+        now = time.monotonic()
+        with self.lock:
+            entry = self._alive(key, now)
+            values = dict(entry[0]) if entry else {}
+            values.update((field, json.dumps(value)) for field, value in fields.items())
+            self.values[key] = (values, now + ttl if ttl else (entry[1] if entry else None))
+
+    def incr_field(self, key, field, amount=1, ttl=None):
+        now = time.monotonic()
+        with self.lock:
+            entry = self._alive(key, now)
+            values = dict(entry[0]) if entry else {}
+            value = json.loads(values.get(field, '0')) + amount
+            values[field] = json.dumps(value)
+            self.values[key] = (values, now + ttl if ttl else (entry[1] if entry else None))
+            return value
+
+    def touch_member(self, name, member):
+        with self.lock:
+            self.members.setdefault(name, {})[member] = time.time()
+
+    def remove_member(self, name, member):
+        with self.lock:
+            self.members.get(name, {}).pop(member, None)
+
+    def count_members(self, name, max_age):
+        cutoff = time.time() - max_age
+        with self.lock:
+            members = self.members.get(name, {})
+            for member in [m for m, touched in members.items() if touched < cutoff]:
+                del members[member]
+            return len(members)
+
+
+class RedisSessionStore:
+    """Store backed by a Redis-protocol server via redis-py"""
+
+    def __init__(self, url, prefix='ocr:'):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, json.dumps(value), ex=int(ttl) if ttl else None)
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+    def incr(self, key):
+        return self.client.incr(self.prefix + key)
+
+    def get_fields(self, key):
+        raw = self.client.hgetall(self.prefix + key)
+        return {field.decode(): json.loads(value) for field, value in raw.items()} if raw else None
+
+    def set_fields(self, key, fields, ttl=None):
+        if not fields:
+            return
+        pipe = self.client.pipeline()
+        pipe.hset(self.prefix + key, mapping={field: json.dumps(value) for field, value in fields.items()})
+        if ttl:
+            pipe.expire(self.prefix + key, int(ttl))
+        pipe.execute()
+
+    def incr_field(self, key, field, amount=1, ttl=None):
+        pipe = self.client.pipeline()
+        pipe.hincrby(self.prefix + key, field, amount)
+        if ttl:
+            pipe.expire(self.prefix + key, int(ttl))
+        return pipe.execute()[0]
+
+    def touch_member(self, name, member):
+        self.client.zadd(self.prefix + name, {member: time.time()})
+
+    def remove_member(self, name, member):
+        self.client.zrem(self.prefix + name, member)
+
+    def count_members(self, name, max_age):
+        # Members of workers that died without cleaning up age out
+        key = self.prefix + name
+        pipe = self.client.pipeline()
+        pipe.zremrangebyscore(key, '-inf', time.time() - max_age)
+        pipe.zcard(key)
+        return pipe.execute()[1]
+
+
+def create_session_store(url=None):
+    """memory:// (or nothing) for a local store, redis://... for a shared one"""
+    if not url or url.startswith('memory://'):
+        return MemorySessionStore()
+    return RedisSessionStore(url)
@@ -0,0 +1,81 @@
+"""
+Capture files of /stream WebSocket traffic (trt_infer.py)
+
+With STREAM_CAPTURE_DIR set, trt_infer.py appends every message received
+on /stream to a capture file, so live camera traffic can be replayed
+against a server later with stream_replay.py.
+
+A capture is an append-only file: an 8 byte magic, then one record per
+message in arrival order:
+
+    >I  connection  connection number, per server process
+    >d  arrival     wall-clock seconds (time.time()) when it was received
+    >I  length      of the message
+        message     the message unchanged: >I metadata length, JSON
+                    metadata, JPEG bytes
+
+Records are written whole under a lock and flushed, so a capture can be
+read while it is still being written; a truncated last record (the
+server stopped mid-write) is ignored.
+"""
+import struct
+import threading
+import time
+
+MAGIC = b'OCRCAP1\n'
+RECORD = struct.Struct('>IdI')
+
+
+class CaptureWriter:
+    """Appends /stream messages to one capture file, up to max_bytes"""
+
+    def __init__(self, path, max_bytes=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.file = open(path, 'ab')
+        if self.file.tell() == 0:
+            self.file.write(MAGIC)
+        self.size = self.file.tell()
+        self.records = 0
+        self.full = False
+
+    def write(self, connection, message, arrival=None):
+        """Append one message; False once the file has reached max_bytes"""
+        if isinstance(message, str):
+            message = message.encode('utf-8')
+        header = RECORD.pack(connection, arrival or time.time(), len(message))
+        with self.lock:
+            if self.max_bytes and self.size + len(header) + len(message) > self.max_bytes:
+                self.full = True
+                return False
+            self.file.write(header)
+            self.file.write(message)
+            self.file.flush()
+            self.size += len(header) + len(message)
+            self.records += 1
+        return True
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+    def snapshot(self):
+        with self.lock:
+            return {'path': self.path, 'records': self.records, 'bytes': self.size, 'full': self.full}
+
+
+def read_capture(path):
+    """Yield (connection, arrival, message) for every whole record of a capture"""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f'Not a /stream capture: {path}')
+        while True:
+            header = f.read(RECORD.size)
+            if len(header) < RECORD.size:
+                return
+            connection, arrival, length = RECORD.unpack(header)
+            message = f.read(length)
+            if len(message) < length:
+                return
+            yield connection, arrival, message
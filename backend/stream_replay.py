@@ -0,0 +1,276 @@
+"""
+Replay captured /stream traffic against an OCR server (trt_infer.py)
+
+Reads a capture written with STREAM_CAPTURE_DIR (see stream_capture.py)
+and plays every captured connection back over its own WebSocket, keeping
+the original gaps between messages (divided by --speed; 0 sends as fast
+as the server takes them). --copies N replays each connection N times at
+once, to multiply a real traffic shape.
+
+Responses are matched to messages by (region_index, timestamp). It
+reports response latency per region and overall, throughput, dropped
+frames (shed by admission control, or past their deadline), failed
+frames (OCR errors), and messages without a response, and writes the
+results as JSON for comparing runs. Only recognized frames count
+towards latency.
+
+Usage:
+    # Capture live traffic on the server
+    STREAM_CAPTURE_DIR=captures python trt_infer.py
+
+    # Replay it at 4x, with 10 copies of every camera
+    python stream_replay.py captures/stream-20250101-120000-1234.cap \\
+        --url ws://localhost:5050/stream --speed 4 --copies 10
+
+Requires simple-websocket (installed with flask-sock).
+"""
+import argparse
+import json
+import struct
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from simple_websocket import Client, ConnectionClosed
+
+from stream_capture import read_capture
+
+# ocr_text of /stream responses for frames that weren't recognized
+DROPPED_TEXTS = {'OCR_DROPPED'}  # past their deadline in the scheduler
+FAILED_TEXTS = {'OCR_ERROR', 'OCR_FAILED'}  # inference error, undecodable JPEG
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    k = (len(values) - 1) * pct / 100.0
+    lo, hi = int(k), min(int(k) + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def message_key(message):
+    """(region_index, timestamp) of a /stream message, or None if malformed"""
+    if len(message) < 4:
+        return None
+    length = struct.unpack('>I', message[:4])[0]
+    try:
+        metadata = json.loads(message[4:4 + length].decode('utf-8'))
+        return metadata['region_index'], metadata['timestamp']
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def load_sessions(path):
+    """{connection: [(seconds after the connection's first message, message), ...]}"""
+    sessions = {}
+    for connection, arrival, message in read_capture(path):
+        sessions.setdefault(connection, []).append((arrival, message))
+    return {
+        connection: [(arrival - records[0][0], message) for arrival, message in records]
+        for connection, records in sessions.items()
+    }
+
+
+class ReplayClient(threading.Thread):
+    """Plays one captured connection over one WebSocket"""
+
+    def __init__(self, name, records, args, stats):
+        super().__init__(daemon=True)
+        self.name = name
+        self.records = records
+        self.args = args
+        self.stats = stats
+        self.pending = {}  # (region_index, timestamp) -> deque of send times
+        self.pending_lock = threading.Lock()
+
+    def record(self, key, value=1):
+        with self.stats['lock']:
+            self.stats[key] = self.stats.get(key, 0) + value
+
+    def error(self, message):
+        with self.stats['lock']:
+            errors = self.stats['errors']
+            errors[message] = errors.get(message, 0) + 1
+
+    def on_response(self, data, received_at):
+        key = (data.get('region_index'), data.get('timestamp'))
+        with self.pending_lock:
+            sent = self.pending.get(key)
+            sent_at = sent.popleft() if sent else None
+            if sent is not None and not sent:
+                del self.pending[key]
+        region = str(key[0])
+        # A recognized frame's ocr_text is a list of [text, confidence]
+        text = data.get('ocr_text')
+        outcome = None
+        if data.get('dropped') or (isinstance(text, str) and text in DROPPED_TEXTS):
+            outcome = 'dropped'
+        elif isinstance(text, str) and text in FAILED_TEXTS:
+            outcome = 'failed'
+        with self.stats['lock']:
+            region_stats = self.stats['regions'].setdefault(
+                region, {'latency_ms': [], 'dropped': 0, 'failed': 0}
+            )
+            if outcome:
+                region_stats[outcome] += 1
+                self.stats[outcome] = self.stats.get(outcome, 0) + 1
+            elif sent_at is not None:
+                latency = (received_at - sent_at) * 1000
+                region_stats['latency_ms'].append(latency)
+                self.stats['latency_ms'].append(latency)
+            self.stats['received'] = self.stats.get('received', 0) + 1
+            self.stats['last_response_at'] = max(self.stats.get('last_response_at', 0), received_at)
+
+    def receive(self, ws):
+        while True:
+            try:
+                data = ws.receive()
+            except ConnectionClosed:
+                return
+            if data is None:
+                return
+            received_at = time.perf_counter()
+            try:
+                self.on_response(json.loads(data), received_at)
+            except ValueError:
+                self.error('unparseable response')
+            except Exception as e:
+                # One odd response must not stop the rest being counted
+                self.error(f'response: {type(e).__name__}: {e}')
+
+    def run(self):
+        args = self.args
+        try:
+            ws = Client.connect(args.url)
+        except Exception as e:
+            self.error(f'connect: {type(e).__name__}: {e}')
+            return
+
+        receiver = threading.Thread(target=self.receive, args=(ws,), daemon=True)
+        receiver.start()
+        try:
+            start = time.perf_counter()
+            elapsed = 0.0
+            previous = 0.0
+            # The server closes a connection idle for 5s; long pauses are
+            # shortened to max_gap of wall-clock time at this speed
+            max_gap = args.max_gap * args.speed if args.speed > 0 else args.max_gap
+            for offset, message in self.records:
+                elapsed += min(offset - previous, max_gap)
+                previous = offset
+                if args.speed > 0:
+                    time.sleep(max(0.0, start + elapsed / args.speed - time.perf_counter()))
+
+                key = message_key(message)
+                if key is not None:
+                    with self.pending_lock:
+                        self.pending.setdefault(key, deque()).append(time.perf_counter())
+                ws.send(message)
+                self.record('sent')
+                self.record('bytes_sent', len(message))
+
+            # Give in-flight messages a moment to come back
+            settle = time.monotonic() + args.settle
+            while self.pending and time.monotonic() < settle:
+                time.sleep(0.05)
+            with self.pending_lock:
+                self.record('lost', sum(len(sent) for sent in self.pending.values()))
+            self.record('completed')
+
+        except ConnectionClosed:
+            self.error('connection closed by server')
+        except Exception as e:
+            self.error(f'{type(e).__name__}: {e}')
+        finally:
+            ws.close()
+            receiver.join(5)
+
+
+def latency_summary(values):
+    return {
+        'count': len(values),
+        'p50': percentile(values, 50),
+        'p90': percentile(values, 90),
+        'p99': percentile(values, 99),
+        'max': max(values) if values else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay captured /stream traffic against an OCR server')
+    parser.add_argument('capture', help='capture file written with STREAM_CAPTURE_DIR')
+    parser.add_argument('--url', default='ws://localhost:5050/stream')
+    parser.add_argument('--speed', type=float, default=1.0, help='playback speed; 0 for as fast as possible')
+    parser.add_argument('--copies', type=int, default=1, help='concurrent replays of each captured connection')
+    parser.add_argument('--connections', type=int, help='replay only the first N captured connections')
+    parser.add_argument('--max-gap', type=float, default=4.0,
+                        help='longest pause between messages, in wall-clock seconds')
+    parser.add_argument('--ramp', type=float, default=0.0, help='seconds over which replays start')
+    parser.add_argument('--settle', type=float, default=10.0, help='seconds to wait for the last responses')
+    parser.add_argument('--output', default=f"replay-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    args = parser.parse_args()
+
+    sessions = load_sessions(args.capture)
+    connections = sorted(sessions)[:args.connections]
+    if not connections:
+        parser.error(f'{args.capture} has no messages')
+    stats = {'lock': threading.Lock(), 'latency_ms': [], 'regions': {}, 'errors': {}}
+
+    clients = [
+        ReplayClient(f'{connection}.{copy}', sessions[connection], args, stats)
+        for connection in connections
+        for copy in range(args.copies)
+    ]
+    wall_start = time.perf_counter()
+    for client in clients:
+        client.start()
+        time.sleep(args.ramp / len(clients))
+    for client in clients:
+        client.join()
+    wall = time.perf_counter() - wall_start
+    # Throughput over the time responses were flowing, not the settle wait
+    busy = stats.get('last_response_at', wall_start + wall) - wall_start
+
+    results = {
+        'config': {k: v for k, v in vars(args).items()},
+        'started_at': datetime.utcnow().isoformat(),
+        'capture': {
+            'connections': len(sessions),
+            'messages': sum(len(records) for records in sessions.values()),
+            'seconds': max(records[-1][0] for records in sessions.values())
+        },
+        'replays': len(clients),
+        'replays_completed': stats.get('completed', 0),
+        'wall_seconds': round(wall, 2),
+        'frames': {
+            'sent': stats.get('sent', 0),
+            'received': stats.get('received', 0),
+            'dropped': stats.get('dropped', 0),
+            'failed': stats.get('failed', 0),
+            'lost': stats.get('lost', 0),
+            'bytes_sent': stats.get('bytes_sent', 0),
+            'throughput_fps': round(stats.get('received', 0) / busy, 2) if busy > 0 else None
+        },
+        'latency_ms': latency_summary(stats['latency_ms']),
+        'regions': {
+            region: dict(
+                latency_summary(region_stats['latency_ms']),
+                dropped=region_stats['dropped'],
+                failed=region_stats['failed']
+            )
+            for region, region_stats in sorted(stats['regions'].items())
+        },
+        'errors': stats['errors']
+    }
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    print(json.dumps({k: results[k] for k in ('frames', 'latency_ms', 'regions', 'errors')}, indent=2))
+    print(f'Results written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,16 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    """app.py imported against a scratch SQLite database"""
+    workdir = tmp_path_factory.mktemp('app')
+    os.chdir(workdir)  # uploads/ and thumbnails/ are relative paths
+    os.environ['DATABASE_URL'] = f"sqlite:///{workdir / 'recordings.db'}"
+    return importlib.import_module('app')
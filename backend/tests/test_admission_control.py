@@ -0,0 +1,97 @@
+import pytest
+
+from admission_control import AdmissionController, Rejected
+
+
+class FakeScheduler:
+    def __init__(self, depth=0, batch_seconds=0.05):
+        self.depth = depth
+        self.batch_seconds = batch_seconds
+
+    def queue_depth(self):
+        return self.depth
+
+
+@pytest.fixture
+def scheduler():
+    return FakeScheduler()
+
+
+@pytest.fixture
+def admission(scheduler):
+    return AdmissionController(scheduler, {'recognize': 2, 'stream': 8}, max_images=100, max_batches=10)
+
+
+def rejection(admission, endpoint, images):
+    with pytest.raises(Rejected) as info:
+        admission.admit(endpoint, images)
+    return info.value
+
+
+def test_endpoint_limit_answers_429(admission):
+    admission.admit('recognize', 1)
+    admission.admit('recognize', 1)
+
+    e = rejection(admission, 'recognize', 1)
+    assert (e.status, e.reason) == (429, 'too_many_requests')
+    # Other endpoints have their own limit
+    admission.admit('stream', 1)
+
+    admission.release('recognize', 1)
+    admission.admit('recognize', 1)
+
+
+def test_image_budget_answers_503(admission):
+    admission.admit('recognize', 80)
+
+    e = rejection(admission, 'recognize', 30)
+    assert (e.status, e.reason) == (503, 'too_many_images')
+    admission.admit('recognize', 20)
+
+
+def test_a_request_bigger_than_the_budget_runs_alone(admission):
+    admission.admit('recognize', 500)
+    e = rejection(admission, 'stream', 1)
+    assert e.reason == 'too_many_images'
+
+
+def test_full_queue_answers_503(admission, scheduler):
+    scheduler.depth = 10
+    e = rejection(admission, 'stream', 1)
+    assert (e.status, e.reason) == (503, 'queue_full')
+
+
+def test_endpoint_limit_is_checked_before_capacity(admission, scheduler):
+    admission.admit('recognize', 1)
+    admission.admit('recognize', 1)
+    scheduler.depth = 10
+    assert rejection(admission, 'recognize', 1).status == 429
+
+
+@pytest.mark.parametrize('depth, batch_seconds, retry_after', [
+    (0, 0.05, 1),  # never less than a second
+    (10, 0.05, 1),
+    (30, 0.05, 2),  # 1.5s rounds up
+    (64, 0.5, 32),
+])
+def test_retry_after_is_the_time_to_drain_the_queue(admission, scheduler, depth, batch_seconds, retry_after):
+    scheduler.depth = depth
+    scheduler.batch_seconds = batch_seconds
+    admission.max_batches = 1000
+    admission.limits['recognize'] = 0
+
+    assert rejection(admission, 'recognize', 1).retry_after == retry_after
+
+
+def test_shed_requests_are_counted(admission, scheduler):
+    admission.admit('recognize', 1)
+    admission.admit('recognize', 1)
+    rejection(admission, 'recognize', 1)
+    scheduler.depth = 10
+    rejection(admission, 'stream', 1)
+    rejection(admission, 'stream', 1)
+
+    snapshot = admission.snapshot()
+    assert snapshot['shed'] == {'recognize:too_many_requests': 1, 'stream:queue_full': 2}
+    assert snapshot['active'] == {'recognize': 2}
+    assert snapshot['inflight_images'] == 2
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+
+def make_recording(app_module, title, created_at, words):
+    db = app_module.db
+    recording = app_module.Recording(title=title, status='completed', created_at=created_at)
+    db.session.add(recording)
+    db.session.flush()
+    region = app_module.Region(recording_id=recording.id, region_index=0)
+    db.session.add(region)
+    db.session.flush()
+    db.session.add_all([
+        app_module.RegionWord(region_id=region.id, word=word, start_time=float(i), end_time=i + 0.5, confidence=0.9)
+        for i, word in enumerate(words)
+    ])
+    db.session.commit()
+    return recording, region
+
+
+def test_word_ids_are_not_reused_after_archiving(app_module):
+    db = app_module.db
+    old = datetime.utcnow() - timedelta(days=app_module.app.config['ARCHIVE_AFTER_DAYS'] + 1)
+
+    with app_module.app.app_context():
+        _, archived_region = make_recording(app_module, 'old', old, ['exit', 'gate', 'platform'])
+        newest, _ = make_recording(app_module, 'new', datetime.utcnow(), ['north', 'south'])
+
+        recordings, words = app_module.archive_old_recordings()
+        assert (recordings, words) == (1, 3)
+        archived_ids = [word.id for word in app_module.archived_words(archived_region.id)]
+        assert [word.word for word in app_module.archived_words(archived_region.id)] == ['exit', 'gate', 'platform']
+
+        # Deleting the newest words lowers max(id) of the rows left
+        response = app_module.app.test_client().delete(f'/api/recordings/{newest.uuid}')
+        assert response.status_code == 200
+
+        word = app_module.RegionWord(region_id=archived_region.id, word='late', start_time=9.0)
+        db.session.add(word)
+        db.session.commit()
+        assert word.id > max(archived_ids)
+
+        # Archived words stay searchable; the new one is indexed too
+        hits = db.session.execute(text(
+            "SELECT rowid FROM region_words_fts WHERE region_words_fts MATCH 'exit OR late'"
+        )).scalars().all()
+        assert sorted(hits) == sorted([archived_ids[0], word.id])
+
+        region = db.session.get(app_module.Region, archived_region.id)
+        assert [w['word'] for w in region.to_dict()['words']] == ['exit', 'gate', 'platform', 'late']
+
+
+def test_archived_transcript_windows_skip_archives_out_of_range(app_module, monkeypatch):
+    old = datetime.utcnow() - timedelta(days=app_module.app.config['ARCHIVE_AFTER_DAYS'] + 1)
+
+    with app_module.app.app_context():
+        recording, region = make_recording(app_module, 'windowed', old, ['a', 'b', 'c', 'd', 'e', 'f'])
+        app_module.archive_old_recordings()
+        archive = app_module.db.session.get(app_module.RegionArchive, region.id)
+        assert (archive.first_start_time, archive.last_start_time) == (0.0, 5.0)
+
+        def window(start=None, end=None, after=None):
+            return [w.word for w in app_module.archived_words_in_window(region.id, start, end, after)]
+        assert window() == ['a', 'b', 'c', 'd', 'e', 'f']
+        assert window(2.0, 4.0) == ['c', 'd']
+        assert window(end=1.0) == ['a']
+        ids = [w.id for w in app_module.archived_words(region.id)]
+        assert window(after=(True, 3.0, ids[3])) == ['e', 'f']
+
+        # Windows past either end of the archive never unpack it
+        def unpack(*args):
+            raise AssertionError('archive unpacked')
+        monkeypatch.setattr(app_module, 'sorted_region_archive', unpack)
+        assert window(5.5) == []
+        assert window(end=0.0) == []
+        assert window(after=(True, 6.0, 1)) == []
+        monkeypatch.undo()
+
+        url = f'/api/recordings/{recording.uuid}/regions/0/transcript'
+        client = app_module.app.test_client()
+        data = client.get(url, query_string={'kind': 'words', 'start': 1.0, 'limit': 2}).get_json()['data']
+        assert [item['word'] for item in data['items']] == ['b', 'c']
+        data = client.get(url, query_string={'kind': 'words', 'limit': 2, 'cursor': data['next_cursor']}).get_json()['data']
+        assert [item['word'] for item in data['items']] == ['d', 'e']
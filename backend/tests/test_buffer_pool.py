@@ -0,0 +1,83 @@
+import pytest
+
+from buffer_pool import BufferPool
+
+MIN = BufferPool.MIN_SIZE
+
+
+class Allocator:
+    """Hands out bytearrays and records what was allocated and freed"""
+
+    def __init__(self):
+        self.allocated = []
+        self.freed = []
+
+    def __call__(self, size):
+        buffer = bytearray(size)
+        self.allocated.append(buffer)
+        return buffer
+
+    def free(self, buffer):
+        self.freed.append(buffer)
+
+
+@pytest.fixture
+def device():
+    return Allocator()
+
+
+@pytest.fixture
+def pool(device):
+    return BufferPool(4 * MIN, allocate={'host': bytearray, 'device': device}, free={'device': device.free})
+
+
+@pytest.mark.parametrize('nbytes, size', [
+    (1, MIN),
+    (MIN, MIN),
+    (MIN + 1, MIN + MIN // 4),
+    (MIN + MIN // 4, MIN + MIN // 4),
+    (2 * MIN - 1, 2 * MIN),
+    (2 * MIN + 1, 2 * MIN + MIN // 2),
+    (3 * 2 ** 20 + 1, 3 * 2 ** 20 + 2 ** 19),
+])
+def test_size_classes_are_quarter_power_of_two_steps(nbytes, size):
+    assert BufferPool.size_class(nbytes) == size
+
+
+def test_size_classes_waste_at_most_a_quarter():
+    for nbytes in range(MIN + 1, 64 * MIN, 997):
+        size = BufferPool.size_class(nbytes)
+        assert nbytes <= size <= nbytes * 1.25
+
+
+def test_released_buffers_are_reused_by_their_size_class(pool, device):
+    first = pool.lease('device', MIN + 100)
+    pool.release(first)
+
+    again = pool.lease('device', MIN + 200)  # same class
+    assert again.buffer is first.buffer
+    other = pool.lease('device', 2 * MIN)  # a different class
+    assert other.buffer is not first.buffer
+
+    assert len(device.allocated) == 2
+    stats = pool.snapshot()['device']
+    assert (stats['hits'], stats['misses'], stats['leased']) == (1, 2, 2)
+
+
+def test_idle_buffers_beyond_the_cap_are_freed(pool, device):
+    leases = [pool.lease('device', 2 * MIN) for _ in range(3)]
+    for lease in leases:
+        pool.release(lease)
+
+    # Two 2*MIN buffers fit the 4*MIN cap; the third is given back
+    assert device.freed == [leases[2].buffer]
+    stats = pool.snapshot()['device']
+    assert (stats['free'], stats['free_bytes'], stats['leased']) == (2, 4 * MIN, 0)
+    assert pool.snapshot()['device']['size_classes'] == [2 * MIN]
+
+
+def test_host_buffers_without_a_free_function_are_dropped(pool):
+    leases = [pool.lease('host', 3 * MIN) for _ in range(2)]
+    for lease in leases:
+        pool.release(lease)
+    assert pool.snapshot()['host']['free'] == 1
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from preprocessing import classify_script
+
+# Synthetic crops, 48 px high (the classifier's working height): text
+# from row 10 to row 40, ink drawn as black rectangles on white
+TOP, BOTTOM = 10, 41
+
+
+def crop(rects, width=160, invert=False):
+    pixels = np.full((48, width), 255, dtype=np.uint8)
+    for x0, y0, x1, y1 in rects:
+        pixels[y0:y1, x0:x1] = 0
+    if invert:
+        pixels = 255 - pixels
+    return Image.fromarray(pixels).convert('RGB')
+
+
+def headline(x0, x1):
+    return (x0, TOP, x1, TOP + 3)
+
+
+def stem(x, top=TOP + 3, width=4):
+    return (x, top, x + width, BOTTOM)
+
+
+def devanagari_word(x0, letters=4, letter_width=22, gap=6):
+    """Letters (a stem and a bowl each) apart below one headline"""
+    rects = [headline(x0, x0 + letters * (letter_width + gap) - gap)]
+    for i in range(letters):
+        left = x0 + i * (letter_width + gap)
+        rects += [stem(left + letter_width - 4), (left, 22, left + letter_width - 4, 26)]
+    return rects
+
+
+def capital_t(x0, width=22):
+    return [headline(x0, x0 + width), stem(x0 + width // 2 - 2)]
+
+
+def lowercase(x0):
+    """x-height letters: no ink in the top part of the band"""
+    return [(x0, 22, x0 + 12, BOTTOM), (x0 + 16, 22, x0 + 28, BOTTOM), (x0 + 32, TOP, x0 + 36, BOTTOM)]
+
+
+def test_headline_across_letter_gaps_is_devanagari():
+    assert classify_script(crop(devanagari_word(10))) == 'devanagari'
+
+
+def test_two_devanagari_words_with_a_space_between():
+    assert classify_script(crop(devanagari_word(5, letters=2) + devanagari_word(75, letters=3))) == 'devanagari'
+
+
+def test_light_text_on_a_dark_background():
+    assert classify_script(crop(devanagari_word(10), invert=True)) == 'devanagari'
+
+
+def test_headline_over_touching_letters_is_devanagari():
+    # Letter bodies joined into one wide run under an unbroken headline
+    rects = [headline(10, 130), (10, 30, 130, 34)] + [stem(x) for x in (10, 40, 70, 100, 126)]
+    assert classify_script(crop(rects)) == 'devanagari'
+
+
+def test_all_caps_top_bars_are_latin():
+    # T T T T: each bar stops at its letter
+    rects = [r for i in range(5) for r in capital_t(8 + i * 30)]
+    assert classify_script(crop(rects)) == 'latin'
+
+
+def test_caps_joined_at_the_baseline_are_latin():
+    # Serifs touching on the baseline make one wide run, but the top row
+    # still breaks between letters
+    rects = [r for i in range(5) for r in capital_t(8 + i * 30)] + [(8, BOTTOM - 3, 150, BOTTOM)]
+    assert classify_script(crop(rects)) == 'latin'
+
+
+def test_lowercase_latin_has_no_headline():
+    assert classify_script(crop(lowercase(10) + lowercase(60) + lowercase(110))) == 'latin'
+
+
+@pytest.mark.parametrize('image', [
+    Image.new('RGB', (200, 6), 'white'),  # too small
+    Image.new('RGB', (200, 48), 'white'),  # no ink
+])
+def test_too_little_to_tell(image):
+    assert classify_script(image) is None
@@ -0,0 +1,105 @@
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+
+from inference_scheduler import ClientDisconnected, DeadlineExceeded, InferenceScheduler
+
+
+class FakeManager:
+    """Runs batches by recording them; the first batch waits for `gate`"""
+
+    def __init__(self, batch_size=2):
+        self.batch_size = batch_size
+        self.gate = threading.Event()
+        self.started = threading.Event()
+        self.ran = []
+
+    @contextmanager
+    def lease(self, model_name):
+        yield self
+
+    def execute_batch(self, images):
+        if not self.ran:
+            self.started.set()
+            self.gate.wait(5)
+        self.ran.append(list(images))
+        return [f'text-{image}' for image in images]
+
+
+@pytest.fixture
+def manager():
+    return FakeManager()
+
+
+@pytest.fixture
+def scheduler(manager):
+    scheduler = InferenceScheduler(manager)
+    yield scheduler
+    manager.gate.set()
+
+
+def block_worker(scheduler, manager):
+    """Occupy the worker with one batch so later submissions queue up"""
+    futures = scheduler.submit(scheduler.new_job('english', 'bulk'), ['busy'])
+    assert manager.started.wait(5)
+    return futures
+
+
+def test_higher_classes_run_first_and_arrival_order_holds_within_a_class(scheduler, manager):
+    block_worker(scheduler, manager)
+
+    bulk = scheduler.submit(scheduler.new_job('english', 'bulk'), ['b1', 'b2', 'b3'])
+    interactive = scheduler.submit(scheduler.new_job('english', 'interactive'), ['i1'])
+    realtime = scheduler.submit(scheduler.new_job('english', 'realtime'), ['r1'])
+    realtime_later = scheduler.submit(scheduler.new_job('english', 'realtime'), ['r2'])
+    assert scheduler.queue_depth() == 5
+
+    manager.gate.set()
+    for future in bulk + interactive + realtime + realtime_later:
+        future.result(5)
+
+    # Bulk requests are split into batch_size chunks
+    assert manager.ran == [['busy'], ['r1'], ['r2'], ['i1'], ['b1', 'b2'], ['b3']]
+    assert bulk[0].result() == ['text-b1', 'text-b2']
+
+
+def test_batches_past_their_deadline_are_dropped_unrun(scheduler, manager):
+    block_worker(scheduler, manager)
+
+    late = scheduler.submit(scheduler.new_job('english', 'realtime', time.monotonic() + 0.01), ['late1', 'late2', 'late3'])
+    on_time = scheduler.submit(scheduler.new_job('english', 'interactive', time.monotonic() + 60), ['ok'])
+    time.sleep(0.05)
+    manager.gate.set()
+
+    assert on_time[0].result(5) == ['text-ok']
+    with pytest.raises(DeadlineExceeded):
+        late[0].result(5)
+    # The request's other chunk is cancelled with it
+    assert late[1].cancelled()
+    assert ['late1', 'late2'] not in manager.ran and ['late3'] not in manager.ran
+
+    metrics = scheduler.snapshot()['classes']
+    assert metrics['realtime']['expired'] == 1
+    assert metrics['interactive']['batches'] == 1
+
+
+def test_run_stops_when_the_client_goes_away(scheduler, manager):
+    block_worker(scheduler, manager)
+
+    results = scheduler.run(['a', 'b', 'c'], 'english', 'interactive', should_cancel=lambda: True)
+    with pytest.raises(ClientDisconnected):
+        next(results)
+    manager.gate.set()
+
+    # The dropped batches are skipped once the worker reaches them
+    deadline = time.monotonic() + 5
+    while scheduler.queue_depth() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert manager.ran == [['busy']]
+
+
+def test_unknown_priority_is_rejected(scheduler):
+    with pytest.raises(ValueError):
+        scheduler.new_job('english', 'urgent')
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from preprocessing import C, H, W, preprocess_images
+
+
+def solid(color, size=(200, 50), mode='RGB'):
+    return Image.new(mode, size, color)
+
+
+@pytest.mark.parametrize('dtype', [np.float32, np.float16])
+def test_float_inputs_are_normalized_to_unit_range(dtype):
+    batch = preprocess_images([solid((0, 255, 51)), solid((255, 255, 255))], dtype)
+
+    assert batch.shape == (2, C, H, W)
+    assert batch.dtype == dtype
+    assert np.allclose(batch[0, 0], -1.0)
+    assert np.allclose(batch[0, 1], 1.0)
+    assert np.allclose(batch[0, 2], 51 * 2 / 255 - 1, atol=1e-3)
+    assert np.allclose(batch[1], 1.0)
+
+
+def test_uint8_inputs_keep_raw_pixels():
+    batch = preprocess_images([solid((10, 20, 30))], np.uint8)
+
+    assert batch.dtype == np.uint8
+    assert [int(batch[0, c].min()) for c in range(C)] == [10, 20, 30]
+    assert [int(batch[0, c].max()) for c in range(C)] == [10, 20, 30]
+
+
+def test_grey_crops_are_converted_and_written_into_out():
+    out = np.zeros((4, C, H, W), dtype=np.float32)
+    result = preprocess_images([solid(255, mode='L')], np.float32, out=out[:1])
+
+    assert np.shares_memory(result, out)
+    assert np.allclose(out[0], 1.0)
+    assert not out[1:].any()  # rows past the batch are left alone
@@ -0,0 +1,20 @@
+def test_streamed_frames_refresh_the_list_at_most_once_per_interval(app_module):
+    store = app_module.session_store
+    version_key = app_module.recording_version_key('streaming')
+
+    def versions():
+        return store.get(app_module.RECORDINGS_VERSION) or 0, store.get(version_key) or 0
+
+    list_version, recording_version = versions()
+    for _ in range(5):
+        app_module.invalidate_recording('streaming', list_changed=False)
+    assert versions() == (list_version + 1, recording_version + 5)
+
+    # A status, title or thumbnail change always reaches the list
+    app_module.invalidate_recording('streaming')
+    assert versions() == (list_version + 2, recording_version + 6)
+
+    # Once the interval has passed, the next frame refreshes it again
+    store.delete('version:recordings:refreshed:streaming')
+    app_module.invalidate_recording('streaming', list_changed=False)
+    assert versions() == (list_version + 3, recording_version + 7)
@@ -0,0 +1,171 @@
+import sys
+import threading
+import types
+
+import pytest
+
+from session_store import MemorySessionStore, RedisSessionStore
+
+
+class FakeRedis:
+    """The part of redis.Redis the session store uses, in memory"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.data = {}
+        self.ttls = {}
+
+    @classmethod
+    def from_url(cls, url):
+        return cls()
+
+    @staticmethod
+    def _bytes(value):
+        return value if isinstance(value, bytes) else str(value).encode()
+
+    def get(self, key):
+        with self.lock:
+            return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        with self.lock:
+            self.data[key] = self._bytes(value)
+            if ex:
+                self.ttls[key] = ex
+
+    def delete(self, *keys):
+        with self.lock:
+            for key in keys:
+                self.data.pop(key, None)
+                self.ttls.pop(key, None)
+
+    def incr(self, key):
+        with self.lock:
+            value = int(self.data.get(key, b'0')) + 1
+            self.data[key] = self._bytes(value)
+            return value
+
+    def hgetall(self, key):
+        with self.lock:
+            return dict(self.data.get(key, {}))
+
+    def hset(self, key, mapping):
+        with self.lock:
+            fields = self.data.setdefault(key, {})
+            for field, value in mapping.items():
+                fields[self._bytes(field)] = self._bytes(value)
+
+    def hincrby(self, key, field, amount):
+        with self.lock:
+            fields = self.data.setdefault(key, {})
+            value = int(fields.get(self._bytes(field), b'0')) + amount
+            fields[self._bytes(field)] = self._bytes(value)
+            return value
+
+    def expire(self, key, seconds):
+        with self.lock:
+            self.ttls[key] = seconds
+
+    def zadd(self, key, mapping):
+        with self.lock:
+            self.data.setdefault(key, {}).update(mapping)
+
+    def zrem(self, key, member):
+        with self.lock:
+            self.data.get(key, {}).pop(member, None)
+
+    def zremrangebyscore(self, key, low, high):
+        with self.lock:
+            members = self.data.get(key, {})
+            for member in [m for m, score in members.items() if float(low) <= score <= float(high)]:
+                del members[member]
+
+    def zcard(self, key):
+        with self.lock:
+            return len(self.data.get(key, {}))
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Queues commands and runs them together, like a MULTI/EXEC pipeline"""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((getattr(self.client, name), args, kwargs))
+        return queue
+
+    def execute(self):
+        return [command(*args, **kwargs) for command, args, kwargs in self.commands]
+
+
+@pytest.fixture(params=['memory', 'redis'])
+def store(request, monkeypatch):
+    if request.param == 'memory':
+        return MemorySessionStore()
+    monkeypatch.setitem(sys.modules, 'redis', types.SimpleNamespace(Redis=FakeRedis))
+    return RedisSessionStore('redis://localhost:6379/0')
+
+
+def test_values_round_trip_as_json(store):
+    store.set('stream', {'regions': {1: 7}})
+    assert store.get('stream') == {'regions': {'1': 7}}
+    assert store.incr('version') == 1
+    assert store.incr('version') == 2
+    store.delete('stream', 'version')
+    assert store.get('stream') is None
+    assert store.get('version') is None
+
+
+def test_fields_written_separately_are_all_kept(store):
+    store.set_fields('stream', {'recording_uuid': 'abc', 'region_count': 2}, ttl=60)
+
+    # Two frames handled at once read the same state...
+    first = store.get_fields('stream')
+    second = store.get_fields('stream')
+
+    # ...and each writes back only what it changed
+    first['load'] = {'latency_ms': 40.0, 'queue_depth': 0.0}
+    store.set_fields('stream', {'load': first['load']}, ttl=60)
+    second['rate'] = {'target_interval_ms': 500}
+    store.set_fields('stream', {'rate': second['rate']}, ttl=60)
+
+    assert store.get_fields('stream') == {
+        'recording_uuid': 'abc',
+        'region_count': 2,
+        'load': {'latency_ms': 40.0, 'queue_depth': 0.0},
+        'rate': {'target_interval_ms': 500}
+    }
+
+    store.delete('stream')
+    assert store.get_fields('stream') is None
+
+
+def test_concurrent_field_increments_are_not_lost(store):
+    store.set_fields('stream', {'recording_uuid': 'abc'})
+
+    def take_turns():
+        for _ in range(200):
+            store.incr_field('stream', 'next_region', 3, ttl=60)
+
+    threads = [threading.Thread(target=take_turns) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert store.get_fields('stream') == {'recording_uuid': 'abc', 'next_region': 8 * 200 * 3}
+
+
+def test_stale_members_stop_counting(store):
+    store.touch_member('live', 'a')
+    store.touch_member('live', 'b')
+    assert store.count_members('live', max_age=60) == 2
+    store.remove_member('live', 'a')
+    assert store.count_members('live', max_age=60) == 1
+    assert store.count_members('live', max_age=-1) == 0
@@ -0,0 +1,82 @@
+import threading
+import time
+from collections import deque
+
+import pytest
+
+from stream_replay import ReplayClient
+
+
+@pytest.fixture
+def client():
+    stats = {'lock': threading.Lock(), 'latency_ms': [], 'regions': {}, 'errors': {}}
+    return ReplayClient('0.0', [], None, stats)
+
+
+def send(client, region_index, timestamp, sent_at):
+    client.pending.setdefault((region_index, timestamp), deque()).append(sent_at)
+
+
+def test_recognized_frame_counts_towards_latency(client):
+    send(client, 0, 1.5, 10.0)
+    client.on_response({
+        'region_index': 0,
+        'ocr_text': [['EXIT', 0.98]],
+        'model_used': 'english_iitd',
+        'timestamp': 1.5,
+        'frame_count': 1
+    }, 10.25)
+
+    stats = client.stats
+    assert stats['received'] == 1
+    assert stats['latency_ms'] == [pytest.approx(250.0)]
+    assert stats['regions']['0'] == {'latency_ms': [pytest.approx(250.0)], 'dropped': 0, 'failed': 0}
+    assert not client.pending
+
+
+@pytest.mark.parametrize('response, outcome', [
+    ({'dropped': True, 'reason': 'queue_full'}, 'dropped'),
+    ({'ocr_text': 'OCR_DROPPED', 'model_used': 'english_iitd'}, 'dropped'),
+    ({'ocr_text': 'OCR_ERROR', 'model_used': 'english_iitd'}, 'failed'),
+    ({'ocr_text': 'OCR_FAILED', 'model_used': 'english_iitd'}, 'failed'),
+])
+def test_unrecognized_frames_are_not_latencies(client, response, outcome):
+    send(client, 1, 2.0, 10.0)
+    client.on_response(dict(response, region_index=1, timestamp=2.0), 10.01)
+
+    stats = client.stats
+    assert stats[outcome] == 1
+    assert stats['regions']['1'][outcome] == 1
+    assert stats['latency_ms'] == []
+    assert not client.pending
+
+
+class FakeSocket:
+    def __init__(self, messages):
+        self.messages = deque(messages)
+
+    def receive(self):
+        return self.messages.popleft() if self.messages else None
+
+
+def test_receiver_survives_bad_responses(client, monkeypatch):
+    send(client, 0, 3.0, time.perf_counter())
+    calls = []
+    on_response = client.on_response
+
+    def flaky(data, received_at):
+        calls.append(data)
+        if len(calls) == 1:
+            raise KeyError('boom')
+        on_response(data, received_at)
+
+    monkeypatch.setattr(client, 'on_response', flaky)
+    client.receive(FakeSocket([
+        'not json',
+        '{"region_index": 0, "timestamp": 3.0, "ocr_text": "OCR_ERROR"}',
+        '{"region_index": 0, "timestamp": 3.0, "ocr_text": [["EXIT", 0.9]]}',
+    ]))
+
+    assert client.stats['errors'] == {'unparseable response': 1, "response: KeyError: 'boom'": 1}
+    assert client.stats['received'] == 1
+    assert len(client.stats['latency_ms']) == 1
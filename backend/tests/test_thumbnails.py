@@ -0,0 +1,38 @@
+import base64
+import io
+import os
+
+import pytest
+from PIL import Image
+
+
+def encode(color):
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 48), color).save(buffer, 'PNG')
+    return 'data:image/png;base64,' + base64.b64encode(buffer.getvalue()).decode()
+
+
+@pytest.fixture
+def store(app_module, tmp_path):
+    return app_module.ThumbnailStore(str(tmp_path), {'small': (16, 16), 'large': (32, 32)}, 80)
+
+
+def test_new_thumbnail_replaces_the_old_variants(store, tmp_path):
+    old_key = store.save('rec', encode('red'))
+    new_key = store.save('rec', encode('blue'))
+
+    assert new_key != old_key
+    assert sorted(os.listdir(tmp_path / 'rec')) == [f'{new_key}_large.jpg', f'{new_key}_small.jpg']
+
+
+def test_failed_save_keeps_the_old_variants(store, tmp_path, monkeypatch):
+    old_key = store.save('rec', encode('red'))
+    replacement = encode('blue')
+
+    def fail_to_encode(self, *args, **kwargs):
+        raise OSError('disk full')
+    monkeypatch.setattr(Image.Image, 'save', fail_to_encode)
+
+    with pytest.raises(OSError):
+        store.save('rec', replacement)
+    assert sorted(os.listdir(tmp_path / 'rec')) == [f'{old_key}_large.jpg', f'{old_key}_small.jpg']
@@ -0,0 +1,35 @@
+def test_word_pages_reach_past_words_without_a_start_time(app_module):
+    db = app_module.db
+
+    with app_module.app.app_context():
+        recording = app_module.Recording(title='legacy', status='completed')
+        db.session.add(recording)
+        db.session.flush()
+        region = app_module.Region(recording_id=recording.id, region_index=0)
+        db.session.add(region)
+        db.session.flush()
+        # Words saved before timing was recorded have no start_time
+        db.session.add_all([
+            app_module.RegionWord(region_id=region.id, word=word, start_time=start_time)
+            for word, start_time in [('mind', None), ('the', None), ('gap', 1.0), ('please', 2.0)]
+        ])
+        db.session.commit()
+        url = f'/api/recordings/{recording.uuid}/regions/0/transcript'
+
+    client = app_module.app.test_client()
+    words, cursors, cursor = [], [], None
+    while True:
+        params = {'kind': 'words', 'limit': 1}
+        if cursor:
+            params['cursor'] = cursor
+        response = client.get(url, query_string=params)
+        assert response.status_code == 200
+        data = response.get_json()['data']
+        words += [item['word'] for item in data['items']]
+        cursor = data['next_cursor']
+        if not cursor:
+            break
+        cursors.append(cursor)
+
+    assert words == ['mind', 'the', 'gap', 'please']
+    assert cursors[0].startswith('null:')
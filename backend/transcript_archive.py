@@ -0,0 +1,120 @@
+"""
+Packed, compressed form of a region's words for app.py's cold tier
+
+Once a recording is old enough, app.py replaces each region's
+region_words rows with one blob from pack_words(). The blob is columnar:
+the word ids, start/end times and confidences are each a typed array,
+and the words themselves are a table of distinct strings plus one index
+per word. The whole payload is zlib-compressed. Ids are stored as deltas
+from the previous word, so they compress well; times and confidences
+keep their full float64 value, so read-back is exact.
+
+    magic  b'RWA1'
+    >I     word count
+    >I     string table length (bytes)
+    zlib(id deltas int64 | starts float64 | ends float64 | confidences float64 |
+         string indexes uint32 | string table: NUL-separated UTF-8)
+
+All arrays are little-endian. A missing time or confidence is stored as
+NaN. unpack_words() returns ArchivedWord tuples in id order, with the
+same fields as RegionWord.to_dict().
+"""
+import math
+import struct
+import sys
+import zlib
+from array import array
+from collections import namedtuple
+
+MAGIC = b'RWA1'
+HEADER = struct.Struct('>II')
+
+class ArchivedWord(namedtuple('ArchivedWord', 'id word start_time end_time confidence')):
+    """A word read back from an archive; stands in for a RegionWord row"""
+    __slots__ = ()
+
+    def to_dict(self):
+        return self._asdict()
+
+
+def _to_bytes(values):
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_bytes(typecode, data, count):
+    values = array(typecode)
+    values.frombytes(data[:count * values.itemsize])
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values, data[count * values.itemsize:]
+
+
+def _deltas(values):
+    previous = 0
+    for value in values:
+        yield value - previous
+        previous = value
+
+
+def _nan(value):
+    return math.nan if value is None else value
+
+
+def _none(value):
+    return None if math.isnan(value) else value
+
+
+def pack_words(words):
+    """words: (id, word, start_time, end_time, confidence) rows, any order"""
+    words = sorted(words, key=lambda w: w[0])
+    strings = {}
+    # NUL separates the string table; OCR output never contains one
+    indexes = array('I', (strings.setdefault(w[1].replace('\0', ''), len(strings)) for w in words))
+
+    ids = array('q', _deltas(w[0] for w in words))
+    starts = array('d', (_nan(w[2]) for w in words))
+    ends = array('d', (_nan(w[3]) for w in words))
+    confidences = array('d', (_nan(w[4]) for w in words))
+    table = '\0'.join(strings).encode('utf-8')
+
+    payload = b''.join([
+        _to_bytes(ids), _to_bytes(starts), _to_bytes(ends),
+        _to_bytes(confidences), _to_bytes(indexes), table
+    ])
+    return MAGIC + HEADER.pack(len(words), len(table)) + zlib.compress(payload, 9)
+
+
+def start_time_range(words):
+    """(first, last) start_time of (id, word, start_time, ...) rows; (None, None) if none has one"""
+    starts = [w[2] for w in words if w[2] is not None]
+    return (min(starts), max(starts)) if starts else (None, None)
+
+
+def unpack_words(blob):
+    """ArchivedWord tuples of a pack_words() blob, in id order"""
+    if blob[:len(MAGIC)] != MAGIC:
+        raise ValueError('Not a packed word archive')
+    count, table_length = HEADER.unpack_from(blob, len(MAGIC))
+    data = zlib.decompress(blob[len(MAGIC) + HEADER.size:])
+
+    ids, data = _from_bytes('q', data, count)
+    starts, data = _from_bytes('d', data, count)
+    ends, data = _from_bytes('d', data, count)
+    confidences, data = _from_bytes('d', data, count)
+    indexes, data = _from_bytes('I', data, count)
+    table = data[:table_length].decode('utf-8').split('\0') if count else []
+
+    words = []
+    word_id = 0
+    for i in range(count):
+        word_id += ids[i]
+        words.append(ArchivedWord(
+            word_id,
+            table[indexes[i]],
+            _none(starts[i]),
+            _none(ends[i]),
+            _none(confidences[i])
+        ))
+    return words
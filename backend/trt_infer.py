@@ -2,7 +2,7 @@ import json
 import numpy as np
 import time
 import torch
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 import os
 import logging
 import traceback
@@ -12,11 +12,24 @@ import io
 import tensorrt as trt
 import pycuda.driver as cuda
 import pycuda.autoinit
-from strhub.data.module import SceneTextDataModule
 from strhub.data.utils import Tokenizer
 
 from flask_sock import Sock
+from stream_capture import CaptureWriter
+from preprocessing import W, H, preprocess_images, classify_script
+from buffer_pool import BufferPool
+from inference_scheduler import (
+    PRIORITY_CLASSES, ClientDisconnected, DeadlineExceeded, InferenceScheduler
+)
+from admission_control import AdmissionController, Rejected
 import struct
+import threading
+import itertools
+import select
+import socket
+import functools
+from collections import deque
+from contextlib import contextmanager
 import json
 import os
 from datetime import datetime
@@ -33,14 +46,88 @@ logging.basicConfig(
 app = Flask(__name__)
 sock = Sock(app)
 # Constants
-C = 3
-H = 32
-W = 128
 INPUT = "input"
 OUTPUT = "output"
 
+# Model registry file (see TRTModelManager.load_manifest); when set, it
+# replaces the built-in mapping and is re-read when it changes
+MODEL_MANIFEST = os.environ.get("MODEL_MANIFEST")
+# Seconds between checks of the manifest and the loaded engine file; 0 disables
+MODEL_WATCH_INTERVAL = float(os.environ.get("MODEL_WATCH_INTERVAL", 0))
+# Required in the X-Admin-Token header of /admin requests when set
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+
+# Default time budget of a /stream frame; a frame still queued after it is dropped
+STREAM_DEADLINE_MS = float(os.environ.get("STREAM_DEADLINE_MS", 1000))
+# Idle pinned-host / device bytes (each) kept by the buffer pool for reuse
+BUFFER_POOL_MAX_FREE_MB = int(os.environ.get("BUFFER_POOL_MAX_FREE_MB", 1024))
+
+# Admission control. Each endpoint runs at most its ADMISSION_LIMITS entry
+# of requests (/stream: frames) at once, answering 429 beyond that. Across
+# endpoints at most MAX_INFLIGHT_IMAGES images are admitted and
+# MAX_QUEUED_BATCHES batches queued; beyond that requests get 503 and
+# /stream frames are dropped.
+ADMISSION_LIMITS = {
+    endpoint: int(limit)
+    for endpoint, limit in (
+        item.split("=") for item in
+        os.environ.get("ADMISSION_LIMITS", "recognize=16,recognize_batch=4,stream=64").split(",")
+    )
+}
+MAX_INFLIGHT_IMAGES = int(os.environ.get("MAX_INFLIGHT_IMAGES", 4000))
+MAX_QUEUED_BATCHES = int(os.environ.get("MAX_QUEUED_BATCHES", 64))
+
+# Script identification for model_name "auto". Each detected
+# script maps to a language of model_to_language; crops whose script isn't
+# recognized, or has no model, go to SCRIPT_DEFAULT_MODEL. A region's
+# choice is reused for SCRIPT_RECHECK_FRAMES frames before re-checking.
+SCRIPT_LANGUAGES = dict(
+    (script.strip(), language.strip())
+    for script, _, language in (
+        item.partition("=") for item in
+        os.environ.get("SCRIPT_LANGUAGES", "latin=English,devanagari=Hindi").split(",")
+    )
+    if script.strip() and language.strip()
+)
+SCRIPT_DEFAULT_MODEL = os.environ.get("SCRIPT_DEFAULT_MODEL", "english_iitd")
+SCRIPT_RECHECK_FRAMES = int(os.environ.get("SCRIPT_RECHECK_FRAMES", 30))
+# Fraction of a word's width its densest row must cover to count as a headline
+SCRIPT_HEADLINE_COVERAGE = float(os.environ.get("SCRIPT_HEADLINE_COVERAGE", 0.6))
+
+# When set, every /stream message is appended to a capture file in this
+# directory (see stream_capture.py; replay with stream_replay.py). Capture
+# stops once the file reaches STREAM_CAPTURE_MAX_MB.
+STREAM_CAPTURE_DIR = os.environ.get("STREAM_CAPTURE_DIR")
+STREAM_CAPTURE_MAX_MB = int(os.environ.get("STREAM_CAPTURE_MAX_MB", 1024))
+
+
+@contextmanager
+def cuda_context():
+    """Make the process's CUDA context current on this thread"""
+    pycuda.autoinit.context.push()
+    try:
+        yield
+    finally:
+        pycuda.autoinit.context.pop()
+
+
+buffer_pool = BufferPool(
+    BUFFER_POOL_MAX_FREE_MB * 1024 * 1024,
+    allocate={
+        "host": lambda size: cuda.pagelocked_empty(size, dtype=np.uint8),
+        "device": cuda.mem_alloc
+    },
+    # Pinned host memory is unpinned when the array is garbage collected
+    free={"device": lambda buffer: buffer.free()}
+)
+
+
 class TRTExecutor:
-    """TensorRT engine executor for a single model"""
+    """
+    TensorRT engine executor for a single model.
+    Host buffers take the dtype of the engine's tensors, so FP16 engines
+    and engines that take raw uint8 pixels need no extra conversion.
+    """
     def __init__(self, engine_path, charset_path, language, batch_size=200):
         self.batch_size = batch_size
         self.language = language
@@ -51,9 +138,6 @@ class TRTExecutor:
             charset = json.load(f)
         self.tokenizer = Tokenizer(charset[language])
 
-        # Load transform
-        self.transform = SceneTextDataModule.get_transform([H, W])
-
         # Initialize TensorRT engine
         self.logger = trt.Logger(trt.Logger.WARNING)
         with open(engine_path, "rb") as f, trt.Runtime(self.logger) as runtime:
@@ -65,62 +149,85 @@ class TRTExecutor:
         # Store CUDA context for thread safety
         self.cuda_context = pycuda.autoinit.context
 
-        # Allocate memory
-        self.host_input = cuda.pagelocked_empty(
-            int(np.prod(self.context.get_tensor_shape(INPUT))),
-            dtype=np.float32
-        )
-        self.device_input = cuda.mem_alloc(self.host_input.nbytes)
+        # float32, float16 or uint8, as the engine was built
+        self.input_dtype = np.dtype(trt.nptype(engine.get_tensor_dtype(INPUT)))
+        self.output_dtype = np.dtype(trt.nptype(engine.get_tensor_dtype(OUTPUT)))
+        if self.input_dtype not in (np.float32, np.float16, np.uint8):
+            raise ValueError(f"Unsupported input dtype {self.input_dtype} in {engine_path}")
+        self.input_shape = tuple(self.context.get_tensor_shape(INPUT))
+        self.output_shape = tuple(self.context.get_tensor_shape(OUTPUT))
+
+        # Lease memory from the pool (returned in cleanup)
+        input_count = int(np.prod(self.input_shape))
+        output_count = int(np.prod(self.output_shape))
+        input_bytes = input_count * self.input_dtype.itemsize
+        output_bytes = output_count * self.output_dtype.itemsize
+        self.buffers = [
+            buffer_pool.lease("host", input_bytes),
+            buffer_pool.lease("device", input_bytes),
+            buffer_pool.lease("host", output_bytes),
+            buffer_pool.lease("device", output_bytes)
+        ]
+
+        self.host_input = self.buffers[0].array(self.input_dtype, input_count)
+        self.device_input = self.buffers[1].buffer
         self.context.set_tensor_address(INPUT, int(self.device_input))
 
-        self.host_output = cuda.pagelocked_empty(
-            int(np.prod(self.context.get_tensor_shape(OUTPUT))),
-            dtype=np.float32
-        )
-        self.device_output = cuda.mem_alloc(self.host_output.nbytes)
+        self.host_output = self.buffers[2].array(self.output_dtype, output_count)
+        self.device_output = self.buffers[3].buffer
         self.context.set_tensor_address(OUTPUT, int(self.device_output))
 
-        logging.info(f"TensorRT engine loaded for {language}")
+        # Batches currently using this executor; it is freed only at zero
+        self.inflight = 0
+        self.idle = threading.Condition()
+
+        self.bytes_to_device = 0
+
+        logging.info(f"TensorRT engine loaded for {language} (input {self.input_dtype})")
+
+    def acquire(self):
+        with self.idle:
+            self.inflight += 1
+
+    def release(self):
+        with self.idle:
+            self.inflight -= 1
+            if self.inflight == 0:
+                self.idle.notify_all()
+
+    def wait_idle(self):
+        with self.idle:
+            while self.inflight:
+                self.idle.wait()
+
+    def warm_up(self):
+        """Run one blank batch so the first real one doesn't pay for lazy init"""
+        self.execute_batch([Image.new("RGB", (W, H))])
 
     def execute_batch(self, images):
         """Execute inference on a batch of images"""
-        # Transform images
-        images = torch.stack([
-            self.transform(image) if image.mode == "RGB"
-            else self.transform(image).repeat(3, 1, 1)
-            for image in images
-        ]).to(self.device)
-
-        # Pad if needed
-        needs_padding = images.shape[0] < self.batch_size
-        if needs_padding:
-            pad = torch.zeros(
-                self.batch_size - images.shape[0],
-                *images.shape[1:],
-                device=self.device
-            )
-            images = torch.cat([images, pad], dim=0)
+        count = len(images)
+
+        # Preprocess straight into the pinned buffer. Only the rows in use
+        # are copied each way; the engine's fixed batch still computes the
+        # remaining rows (stale data), whose outputs are never read.
+        host_input = self.host_input.reshape(self.input_shape)[:count]
+        host_output = self.host_output.reshape(self.output_shape)[:count]
+        preprocess_images(images, self.input_dtype, out=host_input)
 
-        # Copy to device and execute
         # Copy to device and execute
         self.cuda_context.push()
         try:
-            np.copyto(self.host_input, images.cpu().numpy().ravel())
-            cuda.memcpy_htod_async(self.device_input, self.host_input, self.stream)
+            cuda.memcpy_htod_async(self.device_input, host_input, self.stream)
             self.context.execute_async_v3(stream_handle=self.stream.handle)
-            cuda.memcpy_dtoh_async(self.host_output, self.device_output, self.stream)
+            cuda.memcpy_dtoh_async(host_output, self.device_output, self.stream)
             self.stream.synchronize()
         finally:
             self.cuda_context.pop()
+        self.bytes_to_device += host_input.nbytes
 
-        # Get predictions
-        pred = torch.tensor(
-            self.host_output.reshape(self.context.get_tensor_shape(OUTPUT))
-        ).to(self.device)
-
-        # Remove padding
-        if needs_padding:
-            pred = pred[:images.shape[0] - pad.shape[0]]
+        # Get predictions (copied out: the buffer is reused by the next batch)
+        pred = torch.tensor(host_output, dtype=torch.float32).to(self.device)
 
         pred = pred.softmax(-1)
 
@@ -142,23 +249,35 @@ class TRTExecutor:
         return list(zip(labels, avg_confidences))
 
     def cleanup(self):
-        """Free GPU memory"""
+        """Return buffers to the pool and free the engine"""
         try:
-            self.device_input.free()
-            self.device_output.free()
             del self.context
             del self.stream
+            del self.host_input, self.host_output
+            for lease in self.buffers:
+                buffer_pool.release(lease)
+            self.buffers = []
             logging.info(f"Cleaned up TensorRT resources for {self.language}")
         except Exception as e:
             logging.error(f"Error during cleanup: {str(e)}")
 
 
 class TRTModelManager:
-    """Manager for loading/unloading TRT engines on demand"""
+    """
+    Manager for loading/unloading TRT engines on demand.
+    A new executor is built before a busy one is replaced, and the replaced
+    one is freed only after its in-flight batches finish, so switching or
+    hot-reloading a model never stalls running requests. When switching
+    away from an idle executor it is freed first, so the new one reuses
+    its buffers instead of holding both models' memory at once.
+    """
     def __init__(self):
         self.current_executor = None
         self.current_model = None
         self.batch_size = 200
+        self.lock = threading.RLock()
+        self.engine_mtime = None  # mtime of the loaded engine file
+        self.reload_status = {"state": "idle"}
 
         # Model name to TRT engine path mapping
         self.model_engines = {
@@ -228,6 +347,44 @@ class TRTModelManager:
 
         self.charset_path = "charset.json"
 
+        self.manifest_mtime = None
+        if MODEL_MANIFEST and os.path.exists(MODEL_MANIFEST):
+            self.load_manifest(MODEL_MANIFEST)
+
+        self.scheduler = InferenceScheduler(self)
+
+    def load_manifest(self, path):
+        """
+        Replace the model registry from a JSON manifest:
+        {
+            "charset_path": "charset.json",
+            "models": {
+                "english_iitd": {"engine": "checkpoints/trt/English.trt", "language": "English"},
+                ...
+            }
+        }
+        If the loaded model's engine path changed, it is hot-reloaded.
+        """
+        mtime = os.path.getmtime(path)
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        models = manifest["models"]
+        engines = {name: spec["engine"] for name, spec in models.items()}
+        languages = {name: spec["language"] for name, spec in models.items()}
+
+        with self.lock:
+            previous_engine = self.model_engines.get(self.current_model)
+            self.model_engines = engines
+            self.model_to_language = languages
+            self.charset_path = manifest.get("charset_path", self.charset_path)
+            self.manifest_mtime = mtime
+            current = self.current_model
+
+        logging.info(f"Model manifest loaded from {path}: {len(engines)} models")
+        if current in engines and engines[current] != previous_engine:
+            self.reload(current)
+
     def get_engine_path(self, model_name):
         """Get TRT engine path for given model name"""
         engine_file = self.model_engines.get(model_name)
@@ -242,42 +399,124 @@ class TRTModelManager:
 
         return engine_file
 
-    def load_model(self, model_name):
-        """Load TRT engine, unloading previous if necessary"""
-        # If same model is already loaded, return
-        if self.current_model == model_name and self.current_executor:
-            logging.info(f"Model {model_name} already loaded, reusing")
-            return self.current_executor
-
-        # Unload current model if exists
-        if self.current_executor:
-            logging.info(f"Unloading current model: {self.current_model}")
-            self.current_executor.cleanup()
-            self.current_executor = None
-            self.current_model = None
-            torch.cuda.empty_cache()
-
-        # Load new model
-        try:
-            logging.info(f"Loading TRT engiextendne for model: {model_name}")
+    def build_executor(self, model_name, warm_up=False):
+        """A new executor for model_name; the current one is left alone"""
+        logging.info(f"Loading TRT engine for model: {model_name}")
+        with self.lock:
             engine_path = self.get_engine_path(model_name)
             language = self.model_to_language[model_name]
-
-            self.current_executor = TRTExecutor(
-                engine_path,
-                self.charset_path,
-                language,
-                self.batch_size
-            )
+            charset_path = self.charset_path
+        mtime = os.path.getmtime(engine_path)
+
+        with cuda_context():
+            executor = TRTExecutor(engine_path, charset_path, language, self.batch_size)
+            if warm_up:
+                executor.warm_up()
+        executor.engine_mtime = mtime
+        return executor
+
+    def swap(self, model_name, executor):
+        """Make executor current; the previous one is retired"""
+        with self.lock:
+            old = self.current_executor
+            self.current_executor = executor
             self.current_model = model_name
+            self.engine_mtime = executor.engine_mtime
+        if old:
+            logging.info(f"Retiring executor for {old.language}")
+            self.retire(old)
+
+    def retire(self, executor):
+        """Free an executor in the background once its in-flight batches are done"""
+        def drain():
+            executor.wait_idle()
+            with cuda_context():
+                executor.cleanup()
+            torch.cuda.empty_cache()
+
+        threading.Thread(target=drain, name="trt-drain", daemon=True).start()
+
+    def load_model(self, model_name):
+        """Load TRT engine, replacing the previous one if necessary"""
+        with self.lock:
+            # If same model is already loaded, return
+            if self.current_model == model_name and self.current_executor:
+                return self.current_executor
+
+            # Nothing can acquire the old executor while we hold the lock
+            old = self.current_executor
+            if old is not None and old.inflight == 0:
+                self.current_executor = None
+                self.current_model = None
+                with cuda_context():
+                    old.cleanup()
+                torch.cuda.empty_cache()
+
+            try:
+                executor = self.build_executor(model_name)
+            except Exception as e:
+                logging.error(f"Error loading model {model_name}: {str(e)}")
+                logging.error(traceback.format_exc())
+                raise
 
+            self.swap(model_name, executor)
             logging.info(f"Model {model_name} loaded successfully")
-            return self.current_executor
+            return executor
 
-        except Exception as e:
-            logging.error(f"Error loading model {model_name}: {str(e)}")
-            logging.error(traceback.format_exc())
-            raise
+    @contextmanager
+    def lease(self, model_name):
+        """Executor for model_name that won't be freed until the block exits"""
+        with self.lock:
+            executor = self.load_model(model_name)
+            executor.acquire()
+        try:
+            yield executor
+        finally:
+            executor.release()
+
+    def reload(self, model_name=None):
+        """
+        Rebuild an executor (default: the loaded model) in the background,
+        warm it up and swap it in. Requests keep using the old executor
+        until the swap. Returns the reload status.
+        """
+        with self.lock:
+            model_name = model_name or self.current_model
+            if model_name is None:
+                raise ValueError("No model loaded")
+            self.get_engine_path(model_name)
+            if self.reload_status["state"] == "building":
+                raise RuntimeError(f"Already reloading {self.reload_status['model']}")
+            self.reload_status = {"state": "building", "model": model_name, "started_at": time.time()}
+            loaded_model = self.current_model
+
+        def build():
+            try:
+                executor = self.build_executor(model_name, warm_up=True)
+            except Exception as e:
+                logging.error(f"Reload of {model_name} failed: {str(e)}")
+                logging.error(traceback.format_exc())
+                with self.lock:
+                    self.reload_status.update(state="failed", error=str(e), finished_at=time.time())
+                return
+
+            with self.lock:
+                # A switch to another model while building wins over the reload
+                if self.current_model not in (model_name, loaded_model):
+                    logging.info(f"Reload of {model_name} superseded by {self.current_model}")
+                    self.reload_status.update(state="superseded", finished_at=time.time())
+                    superseded = True
+                else:
+                    self.swap(model_name, executor)
+                    self.reload_status.update(state="done", finished_at=time.time())
+                    superseded = False
+            if superseded:
+                self.retire(executor)
+                return
+            logging.info(f"Model {model_name} hot-reloaded")
+
+        threading.Thread(target=build, name="trt-reload", daemon=True).start()
+        return dict(self.reload_status)
 
     def base64_to_pil_image(self, base64_str):
         """Convert base64 string to PIL Image"""
@@ -296,39 +535,170 @@ class TRTModelManager:
             logging.error(f"Error converting base64 to PIL image: {str(e)}")
             raise
 
-    def infer_multiple_images(self, images, model_name):
-        """Process multiple images in batches"""
+    def infer_multiple_images(self, images, model_name, priority="interactive", deadline=None, should_cancel=None):
+        """
+        Process multiple images in batches, scheduled by priority class.
+        deadline is a time.monotonic() value; raises DeadlineExceeded if a
+        batch is still queued when it passes. should_cancel: see
+        InferenceScheduler.run.
+        """
         try:
-            logging.info(f"Starting inference for {len(images)} images with model: {model_name}")
-
-            # Load the model
-            executor = self.load_model(model_name)
+            logging.info(f"Starting inference for {len(images)} images with model: {model_name} ({priority})")
 
             recognized_texts = []
-
-            for i in range(0, len(images), self.batch_size):
-                batch_start = i
-                batch_end = min(i + self.batch_size, len(images))
-                logging.info(f"Processing batch {i//self.batch_size + 1}, images {batch_start} to {batch_end}")
-
-                batch_images = images[batch_start:batch_end]
-                batch_results = executor.execute_batch(batch_images)
-                print(batch_results)
+            for batch_results in self.scheduler.run(images, model_name, priority, deadline, should_cancel):
                 recognized_texts.extend(batch_results)
 
-                logging.info(f"Batch {i//self.batch_size + 1} complete. Total results: {len(recognized_texts)}")
-
             logging.info(f"All batches processed. Total results: {len(recognized_texts)}")
             return recognized_texts
 
+        except (DeadlineExceeded, ClientDisconnected):
+            raise
         except Exception as e:
             logging.error(f"Error in infer_multiple_images: {str(e)}")
             logging.error(traceback.format_exc())
             raise
 
+    def model_for_language(self, language):
+        """Model recognizing language; "<language>_iitd" if there are several"""
+        with self.lock:
+            candidates = [name for name, lang in self.model_to_language.items() if lang == language]
+        preferred = f"{language.lower()}_iitd"
+        if preferred in candidates:
+            return preferred
+        return candidates[0] if candidates else None
+
+    def infer_routed(self, images, model_names, priority="interactive", deadline=None, should_cancel=None):
+        """
+        Images each with their own model: the images of one model are
+        batched together, one model after another, so a mixed request costs
+        one model switch per model rather than per image. Results are in
+        input order.
+        """
+        groups = {}
+        for i, model_name in enumerate(model_names):
+            groups.setdefault(model_name, []).append(i)
+
+        results = [None] * len(images)
+        for model_name, indices in groups.items():
+            texts = self.infer_multiple_images(
+                [images[i] for i in indices], model_name, priority, deadline, should_cancel
+            )
+            for i, text in zip(indices, texts):
+                results[i] = text
+        return results
+
+
+class ModelWatcher(threading.Thread):
+    """
+    Polls the manifest and the loaded engine file and hot-reloads on change.
+    An engine file is only picked up once it has been unchanged for one
+    interval, so a copy in progress isn't loaded (renaming a finished file
+    into place is still the safest way to publish one).
+    """
+    def __init__(self, manager, manifest_path, interval):
+        super().__init__(name="trt-watch", daemon=True)
+        self.manager = manager
+        self.manifest_path = manifest_path
+        self.interval = interval
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.check()
+            except Exception as e:
+                logging.error(f"Model watch error: {str(e)}")
+
+    def check(self):
+        manager = self.manager
+        now = time.time()
+
+        if self.manifest_path and os.path.exists(self.manifest_path):
+            mtime = os.path.getmtime(self.manifest_path)
+            if mtime != manager.manifest_mtime and now - mtime >= self.interval:
+                manager.load_manifest(self.manifest_path)
+
+        with manager.lock:
+            model_name = manager.current_model
+            engine_path = manager.model_engines.get(model_name)
+            loaded_mtime = manager.engine_mtime
+            building = manager.reload_status["state"] == "building"
+        if not model_name or not engine_path or building or not os.path.exists(engine_path):
+            return
+
+        mtime = os.path.getmtime(engine_path)
+        if mtime != loaded_mtime and now - mtime >= self.interval:
+            logging.info(f"Engine file changed: {engine_path}")
+            manager.reload(model_name)
+
+
+class ScriptRouter:
+    """
+    Chooses a model per crop by script. A crop sent with a region key (a
+    /stream region, or /recognize 'region_keys') reuses that region's last
+    choice for recheck_frames frames, so the classifier runs once every
+    recheck_frames frames per region rather than on every tick.
+    """
+    def __init__(self, manager, languages, default_model, recheck_frames, max_regions=10000):
+        self.manager = manager
+        self.languages = languages
+        self.default_model = default_model
+        self.recheck_frames = recheck_frames
+        self.max_regions = max_regions
+        self.lock = threading.Lock()
+        self.routes = {}  # region key -> [model_name, script, frames until re-check]
+        self.classified = 0
+        self.reused = 0
+        self.scripts = {}  # script -> crops classified as it
+
+    def model_for_script(self, script):
+        language = self.languages.get(script)
+        return (language and self.manager.model_for_language(language)) or self.default_model
+
+    def route(self, image, key=None):
+        """(model_name, script) for a PIL crop"""
+        if key is not None:
+            with self.lock:
+                route = self.routes.get(key)
+                if route and route[2] > 0:
+                    route[2] -= 1
+                    self.reused += 1
+                    return route[0], route[1]
+
+        script = classify_script(image, SCRIPT_HEADLINE_COVERAGE)
+        model_name = self.model_for_script(script)
+        with self.lock:
+            self.classified += 1
+            self.scripts[script] = self.scripts.get(script, 0) + 1
+            if key is not None:
+                if key not in self.routes and len(self.routes) >= self.max_regions:
+                    self.routes.pop(next(iter(self.routes)))  # oldest region
+                self.routes[key] = [model_name, script, self.recheck_frames]
+        return model_name, script
+
+    def forget(self, owner):
+        """Drop the routes of every region key (owner, ...)"""
+        with self.lock:
+            for key in [k for k in self.routes if isinstance(k, tuple) and k[0] == owner]:
+                del self.routes[key]
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "regions": len(self.routes),
+                "classified": self.classified,
+                "reused": self.reused,
+                "scripts": {str(script): count for script, count in self.scripts.items()}
+            }
+
 
 # Initialize model manager
 model_manager = TRTModelManager()
+script_router = ScriptRouter(model_manager, SCRIPT_LANGUAGES, SCRIPT_DEFAULT_MODEL, SCRIPT_RECHECK_FRAMES)
+admission = AdmissionController(model_manager.scheduler, ADMISSION_LIMITS, MAX_INFLIGHT_IMAGES, MAX_QUEUED_BATCHES)
+if MODEL_WATCH_INTERVAL > 0:
+    ModelWatcher(model_manager, MODEL_MANIFEST, MODEL_WATCH_INTERVAL).start()
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -337,7 +707,8 @@ def health_check():
         'status': 'healthy',
         'cuda_available': torch.cuda.is_available(),
         'current_loaded_model': model_manager.current_model,
-        'available_models': list(model_manager.model_engines.keys())
+        'available_models': list(model_manager.model_engines.keys()),
+        'reload': model_manager.reload_status
     })
 
 @app.route('/models', methods=['GET'])
@@ -348,9 +719,206 @@ def list_models():
         'current_loaded_model': model_manager.current_model
     })
 
+def disconnect_check():
+    """
+    A callable telling whether the current request's client has closed its
+    connection. Needs the socket, which only Werkzeug's server exposes;
+    elsewhere it always answers False.
+    """
+    sock = request.environ.get('werkzeug.socket')
+    if sock is None:
+        return None
+
+    def closed():
+        try:
+            readable, _, _ = select.select([sock], [], [], 0)
+            return bool(readable) and sock.recv(1, socket.MSG_PEEK) == b''
+        except (OSError, ValueError):
+            return True
+    return closed
+
+def admission_limited(endpoint, count_images):
+    """Admit the request through `admission` (429/503 + Retry-After when full)"""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            data = request.get_json(silent=True) or {}
+            try:
+                images = count_images(data)
+            except (TypeError, AttributeError):
+                images = 0
+
+            try:
+                admission.admit(endpoint, images)
+            except Rejected as e:
+                response = jsonify({
+                    'error': 'Too many requests' if e.status == 429 else 'Server overloaded',
+                    'reason': e.reason,
+                    'retry_after': e.retry_after
+                })
+                response.status_code = e.status
+                response.headers['Retry-After'] = str(e.retry_after)
+                return response
+
+            try:
+                response = app.make_response(view(*args, **kwargs))
+            except Exception:
+                admission.release(endpoint, images)
+                raise
+            # Runs once the body is sent, so streamed responses hold their slot
+            response.call_on_close(lambda: admission.release(endpoint, images))
+            return response
+        return wrapper
+    return decorator
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Scheduler queue depth and per-class queue latency"""
+    executor = model_manager.current_executor
+    return jsonify(dict(
+        model_manager.scheduler.snapshot(),
+        current_loaded_model=model_manager.current_model,
+        input_dtype=str(executor.input_dtype) if executor else None,
+        bytes_to_device=executor.bytes_to_device if executor else 0,
+        buffer_pool=buffer_pool.snapshot(),
+        admission=admission.snapshot(),
+        script_routing=script_router.snapshot(),
+        stream_capture=stream_capture.snapshot() if stream_capture else None,
+        reload=model_manager.reload_status
+    ))
+
+def parse_scheduling(data, default_priority):
+    """(priority, deadline) from a request body's 'priority' and 'deadline_ms'"""
+    priority = data.get('priority', default_priority)
+    if priority not in PRIORITY_CLASSES:
+        raise ValueError(f"priority must be one of {list(PRIORITY_CLASSES)}")
+    deadline_ms = data.get('deadline_ms')
+    deadline = time.monotonic() + float(deadline_ms) / 1000 if deadline_ms is not None else None
+    return priority, deadline
+
+@app.route('/admin/reload', methods=['GET', 'POST'])
+def admin_reload():
+    """
+    Hot-reload a model in the background (POST), or report progress (GET)
+    Expected data (all optional): {
+        'model_name': 'english_iitd',   # default: the loaded model
+        'manifest': true                # re-read MODEL_MANIFEST first
+    }
+    """
+    if ADMIN_TOKEN and request.headers.get('X-Admin-Token') != ADMIN_TOKEN:
+        return jsonify({'error': 'Forbidden'}), 403
+
+    if request.method == 'GET':
+        return jsonify({'reload': model_manager.reload_status})
+
+    data = request.get_json(silent=True) or {}
+    try:
+        if data.get('manifest'):
+            if not MODEL_MANIFEST:
+                return jsonify({'error': 'MODEL_MANIFEST is not set'}), 400
+            model_manager.load_manifest(MODEL_MANIFEST)
+            if not data.get('model_name'):
+                return jsonify({'reload': model_manager.reload_status, 'manifest_reloaded': True}), 202
+
+        status = model_manager.reload(data.get('model_name'))
+        return jsonify({'reload': status}), 202
+
+    except (ValueError, FileNotFoundError) as e:
+        return jsonify({'error': str(e)}), 400
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 409
+
+def stream_recognition(base64_images, model_name, priority, deadline, per_image):
+    """
+    NDJSON body of a streaming /recognize: a record per batch, or per
+    image, as soon as its batch is recognized, then a summary record.
+    Images are decoded one batch ahead of the GPU and results aren't kept,
+    so decoded images and results take the same memory however many images
+    are sent; the request body itself (base64 strings) is still parsed
+    whole beforehand. If the client goes away the generator is closed and
+    the request's queued batches dropped.
+    """
+    scheduler = model_manager.scheduler
+    job = scheduler.new_job(model_name, priority, deadline)
+    batch_size = model_manager.batch_size
+    started = time.time()
+    first_result_at = None
+    done = 0
+
+    def records(start, future):
+        nonlocal first_result_at, done
+        batch = future.result()
+        if first_result_at is None:
+            first_result_at = time.time()
+        done += len(batch)
+        results = [
+            {'index': start + i, 'text': text, 'confidence': confidence}
+            for i, (text, confidence) in enumerate(batch)
+        ]
+        if per_image:
+            for result in results:
+                yield json.dumps(dict(result, type='result')) + '\n'
+        else:
+            yield json.dumps({'type': 'batch', 'results': results}) + '\n'
+
+    pending = deque()  # (index of the batch's first image, future)
+    try:
+        for start in range(0, len(base64_images), batch_size):
+            try:
+                images = [model_manager.base64_to_pil_image(b) for b in base64_images[start:start + batch_size]]
+            except Exception as e:
+                raise ValueError(f'Failed to process images {start}-{start + batch_size - 1}: {str(e)}')
+            pending.append((start, scheduler.submit(job, images)[0]))
+
+            # Keep one batch queued while waiting on the one before it
+            while len(pending) > 1 or (pending and pending[0][1].done()):
+                yield from records(*pending.popleft())
+        while pending:
+            yield from records(*pending.popleft())
+
+        yield json.dumps({
+            'type': 'summary',
+            'success': True,
+            'model_used': model_name,
+            'priority': priority,
+            'num_images': done,
+            'time_to_first_result': round(first_result_at - started, 3) if first_result_at else None,
+            'inference_time': round(time.time() - started, 3)
+        }) + '\n'
+
+    except Exception as e:
+        logging.error(f"Streaming recognition failed: {str(e)}")
+        yield json.dumps({
+            'type': 'summary',
+            'success': False,
+            'error': str(e),
+            'deadline_exceeded': isinstance(e, DeadlineExceeded),
+            'num_images': done
+        }) + '\n'
+    finally:
+        job.cancelled = True
+
 @app.route('/recognize', methods=['POST'])
+@admission_limited('recognize', lambda data: len(data.get('images', [])))
 def recognize_text():
-    """Main OCR endpoint"""
+    """
+    Main OCR endpoint
+    Expected data: {
+        'model_name': 'english_iitd',
+        'images': ['base64...', ...],
+        'priority': 'interactive',      # realtime | interactive | bulk
+        'deadline_ms': 2000,            # optional; 504 if not started in time
+        'stream': 'batch',              # optional: 'batch' | 'image' NDJSON records
+        'region_keys': ['cam1-0', ...]  # optional, with model_name 'auto'
+    }
+    model_name 'auto' picks a model per image by script (see ScriptRouter)
+    and adds the chosen 'models' and detected 'scripts' per image; images
+    with a region key reuse that region's earlier choice.
+    With 'stream' (or Accept: application/x-ndjson) the response is NDJSON:
+    {"type": "batch", "results": [{"index", "text", "confidence"}, ...]}
+    or {"type": "result", "index", "text", "confidence"} per image, ending
+    with {"type": "summary", "success", "num_images", "time_to_first_result", ...}
+    """
     try:
         data = request.get_json()
 
@@ -366,6 +934,31 @@ def recognize_text():
         if not base64_images:
             return jsonify({'error': 'images list is required'}), 400
 
+        try:
+            priority, deadline = parse_scheduling(data, 'interactive')
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+
+        auto = model_name == 'auto'
+        region_keys = data.get('region_keys') or [None] * len(base64_images)
+        if len(region_keys) != len(base64_images):
+            return jsonify({'error': 'region_keys must have one entry per image'}), 400
+
+        stream = data.get('stream')
+        if stream not in (None, 'batch', 'image'):
+            return jsonify({'error': "stream must be 'batch' or 'image'"}), 400
+        if stream or 'application/x-ndjson' in request.headers.get('Accept', ''):
+            if auto:
+                return jsonify({'error': "model_name 'auto' can't be streamed"}), 400
+            if model_name not in model_manager.model_engines:
+                return jsonify({'error': f'Unknown model name: {model_name}'}), 400
+            return Response(
+                stream_with_context(stream_recognition(
+                    base64_images, model_name, priority, deadline, per_image=(stream == 'image')
+                )),
+                mimetype='application/x-ndjson'
+            )
+
         logging.info(f"Processing {len(base64_images)} images with model: {model_name}")
 
         # Convert base64 images to PIL images
@@ -378,19 +971,40 @@ def recognize_text():
         # Run inference (model will be loaded/switched automatically)
         try:
             start_time = time.time()
-            results = model_manager.infer_multiple_images(images, model_name)
+            if auto:
+                routes = [
+                    script_router.route(image, None if key is None else ('recognize', str(key)))
+                    for image, key in zip(images, region_keys)
+                ]
+                results = model_manager.infer_routed(
+                    images, [m for m, _ in routes], priority, deadline, should_cancel=disconnect_check()
+                )
+            else:
+                results = model_manager.infer_multiple_images(
+                    images, model_name, priority, deadline, should_cancel=disconnect_check()
+                )
             inference_time = time.time() - start_time
 
             logging.info(f"Recognition completed successfully for {len(results)} images in {inference_time:.2f}s")
 
-            return jsonify({
+            response = {
                 'recognized_texts': results,
                 'model_used': model_name,
                 'num_images': len(images),
+                'priority': priority,
                 'inference_time': round(inference_time, 3),
                 'success': True
-            })
-
+            }
+            if auto:
+                response['models'] = [m for m, _ in routes]
+                response['scripts'] = [script for _, script in routes]
+            return jsonify(response)
+
+        except DeadlineExceeded as e:
+            return jsonify({'error': str(e)}), 504
+        except ClientDisconnected:
+            admission.count('recognize', 'client_disconnected')
+            return jsonify({'error': 'Client disconnected'}), 499
         except Exception as e:
             logging.error(f"Inference failed: {str(e)}")
             return jsonify({'error': f'Inference failed: {str(e)}'}), 500
@@ -401,8 +1015,9 @@ def recognize_text():
         return jsonify({'error': f'Request processing failed: {str(e)}'}), 500
 
 @app.route('/recognize_batch', methods=['POST'])
+@admission_limited('recognize_batch', lambda data: sum(len(r.get('images', [])) for r in data.get('requests', [])))
 def recognize_batch():
-    """Batch OCR endpoint for multiple models"""
+    """Batch OCR endpoint for multiple models; scheduled as bulk by default"""
     try:
         data = request.get_json()
 
@@ -414,7 +1029,13 @@ def recognize_batch():
         if not requests_data:
             return jsonify({'error': 'requests list is required'}), 400
 
+        try:
+            priority, deadline = parse_scheduling(data, 'bulk')
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+
         results = []
+        should_cancel = disconnect_check()
 
         for req_idx, req_data in enumerate(requests_data):
             # model_name = req_data.get('model_name')
@@ -427,7 +1048,9 @@ def recognize_batch():
 
                 # Run inference (model will be loaded/switched automatically)
                 start_time = time.time()
-                recognized_texts = model_manager.infer_multiple_images(images, model_name)
+                recognized_texts = model_manager.infer_multiple_images(
+                    images, model_name, priority, deadline, should_cancel=should_cancel
+                )
                 inference_time = time.time() - start_time
 
                 results.append({
@@ -439,6 +1062,10 @@ def recognize_batch():
                     'error': None
                 })
 
+            except ClientDisconnected:
+                # Nobody is left to read the rest; skip the remaining requests
+                admission.count('recognize_batch', 'client_disconnected')
+                return jsonify({'error': 'Client disconnected'}), 499
             except Exception as e:
                 logging.error(f"Error processing request {req_idx}: {str(e)}")
                 results.append({
@@ -471,23 +1098,40 @@ model_manager
 
 frame_count = 0
 region_counts = {}
+stream_connection_ids = itertools.count()  # script routes are kept per connection and region
+
+stream_capture = None
+if STREAM_CAPTURE_DIR:
+    os.makedirs(STREAM_CAPTURE_DIR, exist_ok=True)
+    stream_capture = CaptureWriter(
+        os.path.join(STREAM_CAPTURE_DIR, f"stream-{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}.cap"),
+        STREAM_CAPTURE_MAX_MB * 1024 * 1024
+    )
+    logging.info(f"Capturing /stream traffic to {stream_capture.path}")
 
 # Add OCR processing function
-def perform_ocr_on_region(image_data, metadata, region_idx):
+def perform_ocr_on_region(image_data, metadata, region_idx, route_key=None):
     """
-    Perform OCR on the annotated region and return text
+    Perform OCR on the annotated region and return (text, model_name).
+    The model is metadata's 'model_name' (SCRIPT_DEFAULT_MODEL when not
+    sent); with 'auto' it is chosen by script through script_router,
+    cached under route_key.
     """
+    model_name = metadata.get('model_name') or SCRIPT_DEFAULT_MODEL
     try:
         # Convert bytes to numpy arratrty
         nparr = np.frombuffer(image_data, np.uint8)
         img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
 
         if img is None:
-            return "OCR_FAILED"
-
-        model_name="english_iitd"
-        img = [Image.fromarray(i) for i in img]
-        text=model_manager.infer_multiple_images(img,model_name)
+            return "OCR_FAILED", model_name
+
+        img = [Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))]
+        if model_name == 'auto':
+            model_name, _ = script_router.route(img[0], route_key)
+        # Live frames go ahead of bulk work and are dropped once stale
+        deadline = time.monotonic() + metadata.get('deadline_ms', STREAM_DEADLINE_MS) / 1000
+        text=model_manager.infer_multiple_images(img, model_name, 'realtime', deadline)
         # For now, return random text - replace with actual OCR (Tesseract, etc.)
         # You can install: pip install pytesseract
         # import pytesseract
@@ -507,19 +1151,22 @@ def perform_ocr_on_region(image_data, metadata, region_idx):
         # text = text.strip() if text else "NO_TEXT_DETECTED"
         # # -----------------------------------
 
-        return text
+        return text, model_name
 
         # return text
 
+    except DeadlineExceeded:
+        return "OCR_DROPPED", model_name
     except Exception as e:
         print(f"OCR error in region {region_idx}: {e}")
-        return "OCR_ERROR"
+        return "OCR_ERROR", model_name
 
 # Modify the WebSocket handler to send back OCR results
 @sock.route('/stream')
 def stream(ws):
     global frame_count, region_counts
     print("Client connected to WebSocket")
+    connection_id = next(stream_connection_ids)
 
     try:
         while True:
@@ -527,6 +1174,9 @@ def stream(ws):
             if data is None:
                 break
 
+            if stream_capture:
+                stream_capture.write(connection_id, data)
+
             if len(data) < 4:
                 continue
 
@@ -542,6 +1192,18 @@ def stream(ws):
             region_idx = metadata['region_index']
             total_regions = metadata['total_regions']
 
+            # Overloaded: drop the frame, the next one is already coming
+            try:
+                admission.admit('stream', 1)
+            except Rejected as e:
+                ws.send(json.dumps({
+                    'region_index': region_idx,
+                    'timestamp': metadata['timestamp'],
+                    'dropped': True,
+                    'reason': e.reason
+                }))
+                continue
+
             if region_idx not in region_counts:
                 region_counts[region_idx] = 0
             region_counts[region_idx] += 1
@@ -549,12 +1211,18 @@ def stream(ws):
             frame_count += 1
 
             # Perform OCR on this region
-            ocr_text = perform_ocr_on_region(image_data, metadata, region_idx)
+            try:
+                ocr_text, model_name = perform_ocr_on_region(
+                    image_data, metadata, region_idx, route_key=(connection_id, region_idx)
+                )
+            finally:
+                admission.release('stream', 1)
 
             # Send OCR result back to client
             response = {
                 'region_index': region_idx,
                 'ocr_text': ocr_text,
+                'model_used': model_name,
                 'timestamp': metadata['timestamp'],
                 'frame_count': region_counts[region_idx]
             }
@@ -566,6 +1234,7 @@ def stream(ws):
     except Exception as e:
         print(f"WebSocket error: {e}")
     finally:
+        script_router.forget(connection_id)
         print(f"Client disconnected. Total frames: {frame_count}")
 def process_annotated_region(image_data, metadata, region_idx):
     """
@@ -615,5 +1284,6 @@ if __name__ == '__main__':
         host='0.0.0.0',
         port=5050,
         debug=False,
-        threaded=False
+        # Requests only queue work; the scheduler thread owns the GPU
+        threaded=True
     )
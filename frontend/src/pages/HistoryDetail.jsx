@@ -4,10 +4,66 @@ import { useParams, Link } from 'react-router-dom';
 
 const API_URL = 'http://localhost:5000';
 
-function RegionCard({ region }) {
+const TRANSCRIPT_WINDOW = 60; // seconds of transcript fetched per request
+const TRANSCRIPT_LOOKAHEAD = 15; // fetch the next window this early
+
+const formatDuration = (seconds) => {
+    if (seconds == null) return '';
+    return seconds < 60 ? `${seconds.toFixed(1)}s` : `${Math.floor(seconds / 60)}m ${Math.round(seconds % 60)}s`;
+};
+
+function RegionCard({ recordingUuid, region, origin, playhead }) {
     const [copied, setCopied] = useState(false);
-    const uniqueWords = [...new Set(region.words.map(w => w.word))];
-    const textToCopy = uniqueWords.join(', ');
+    const [segments, setSegments] = useState([]);
+    const [loadedUntil, setLoadedUntil] = useState(null);
+    const loadingRef = useRef(false);
+    const now = origin != null ? origin + playhead : null;
+
+    // Fetch every page of the [start, start + TRANSCRIPT_WINDOW) window
+    const loadWindow = async (start) => {
+        if (loadingRef.current) return;
+        loadingRef.current = true;
+        const end = start + TRANSCRIPT_WINDOW;
+        const items = [];
+        let cursor = null;
+        try {
+            do {
+                const params = new URLSearchParams({ kind: 'segments', start, end, limit: 500 });
+                if (cursor) params.set('cursor', cursor);
+                const response = await fetch(`${API_URL}/api/recordings/${recordingUuid}/regions/${region.region_index}/transcript?${params}`);
+                const data = await response.json();
+                if (!data.success) break;
+                items.push(...data.data.items);
+                cursor = data.data.next_cursor;
+            } while (cursor);
+
+            setSegments(prev => {
+                const seen = new Set(prev.map(s => s.id));
+                return [...prev, ...items.filter(s => !seen.has(s.id))]
+                    .sort((a, b) => a.start_time - b.start_time);
+            });
+            setLoadedUntil(end);
+        } catch (error) {
+            console.error('Error fetching transcript:', error);
+        }
+        loadingRef.current = false;
+    };
+
+    useEffect(() => {
+        if (origin != null) loadWindow(origin);
+    }, [origin]);
+
+    // Follow playback; a seek past the loaded range jumps straight there
+    useEffect(() => {
+        if (now == null || loadedUntil == null) return;
+        if (now > loadedUntil + TRANSCRIPT_WINDOW) {
+            loadWindow(now);
+        } else if (now + TRANSCRIPT_LOOKAHEAD >= loadedUntil) {
+            loadWindow(loadedUntil);
+        }
+    }, [now, loadedUntil]);
+
+    const textToCopy = segments.map(s => s.text).join('\n');
 
     const handleCopy = async () => {
         await navigator.clipboard.writeText(textToCopy);
@@ -21,7 +77,7 @@ function RegionCard({ region }) {
                 <h3 className="font-semibold text-blue-300">Region {region.region_index}</h3>
                 <div className="flex items-center gap-2">
                     <span className="text-xs text-gray-400 bg-gray-800 px-2 py-1 rounded">
-                        {region.words.length} words
+                        {region.word_count} words
                     </span>
                     <button
                         onClick={handleCopy}
@@ -40,12 +96,30 @@ function RegionCard({ region }) {
                 </div>
             </div>
 
-            <div className="text-sm text-gray-300 leading-relaxed font-mono bg-black/20 p-2 rounded">
-                {region.words.length > 0 ? (
-                    uniqueWords.join(', ')
+            <div className="text-sm text-gray-300 leading-relaxed font-mono bg-black/20 p-2 rounded space-y-1">
+                {segments.length > 0 ? (
+                    segments.map(segment => (
+                        <div
+                            key={segment.id}
+                            className={`flex gap-2 ${now != null && segment.start_time <= now && now < segment.end_time ? 'text-white' : ''}`}
+                        >
+                            <span className="text-xs text-gray-500 flex-shrink-0 w-14">
+                                {formatDuration(segment.end_time - segment.start_time)}
+                            </span>
+                            <span>{segment.text}</span>
+                        </div>
+                    ))
                 ) : (
                     <span className="text-gray-500 italic">No text detected</span>
                 )}
+                {loadedUntil != null && (
+                    <button
+                        onClick={() => loadWindow(loadedUntil)}
+                        className="text-xs text-blue-400 hover:text-blue-300 transition"
+                    >
+                        Load more
+                    </button>
+                )}
             </div>
         </div>
     );
@@ -55,11 +129,12 @@ function HistoryDetail() {
     const { uuid } = useParams();
     const [recording, setRecording] = useState(null);
     const [loading, setLoading] = useState(true);
+    const [playhead, setPlayhead] = useState(0);
     const videoRef = useRef(null);
 
     const fetchRecordingDetails = async () => {
         try {
-            const response = await fetch(`${API_URL}/api/recordings/${uuid}`);
+            const response = await fetch(`${API_URL}/api/recordings/${uuid}?transcript=0`);
             const data = await response.json();
             if (data.success) {
                 setRecording(data.data);
@@ -116,6 +191,10 @@ function HistoryDetail() {
                     <h1 className="text-2xl font-bold">{recording.title}</h1>
                     <div className="flex items-center gap-4 text-sm text-gray-400 mt-1">
                         <span className="flex items-center gap-1"><Clock size={14} /> {new Date(recording.created_at).toLocaleString()}</span>
+                        <span className="flex items-center gap-1"><FileText size={14} /> {recording.word_count} words</span>
+                        {recording.first_timestamp != null && (
+                            <span>{formatDuration(recording.last_timestamp - recording.first_timestamp)} transcribed</span>
+                        )}
                         <span className="bg-blue-600/20 text-blue-400 px-2 py-0.5 rounded text-xs">{recording.status}</span>
                     </div>
                 </div>
@@ -130,6 +209,7 @@ function HistoryDetail() {
                                 ref={videoRef}
                                 src={videoUrl}
                                 controls
+                                onTimeUpdate={(e) => setPlayhead(e.target.currentTime)}
                                 className="max-w-full max-h-full object-contain"
                             />
                         </div>
@@ -149,7 +229,13 @@ function HistoryDetail() {
 
                     <div className="flex-1 overflow-y-auto p-4 space-y-4">
                         {recording.regions.map((region) => (
-                            <RegionCard key={region.id} region={region} />
+                            <RegionCard
+                                key={region.id}
+                                recordingUuid={recording.uuid}
+                                region={region}
+                                origin={recording.time_origin}
+                                playhead={playhead}
+                            />
                         ))}
                     </div>
                 </div>
@@ -87,8 +87,8 @@ function HistoryList() {
                                     <tr key={recording.uuid} className="hover:bg-ohif-primary/10 transition group cursor-pointer">
                                         <td className="px-6 py-3 w-32">
                                             <Link to={`/history/${recording.uuid}`} className="block relative aspect-video bg-black rounded-sm overflow-hidden w-24 border border-ohif-border group-hover:border-ohif-primary transition-colors">
-                                                {recording.thumbnail ? (
-                                                    <img src={recording.thumbnail} alt="" className="w-full h-full object-cover opacity-80 group-hover:opacity-100 transition-opacity" />
+                                                {recording.thumbnail_url ? (
+                                                    <img src={`${API_URL}${recording.thumbnail_url}`} alt="" loading="lazy" className="w-full h-full object-cover opacity-80 group-hover:opacity-100 transition-opacity" />
                                                 ) : (
                                                     <div className="w-full h-full flex items-center justify-center text-ohif-text-muted"><Video size={16} /></div>
                                                 )}
@@ -101,6 +101,7 @@ function HistoryList() {
                                         </td>
                                         <td className="px-6 py-3 text-ohif-text">
                                             {recording.regions?.length || 0}
+                                            <span className="ml-2 text-ohif-text-muted text-xs">{recording.word_count || 0} words</span>
                                         </td>
                                         <td className="px-6 py-3">
                                             <span className="text-ohif-text">{new Date(recording.created_at).toLocaleDateString()}</span>
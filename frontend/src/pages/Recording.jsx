@@ -29,6 +29,12 @@ function Recording() {
     const streamIntervalRef = useRef(null);
     const requestRef = useRef(null); // RequestAnimationFrame
     const socketRef = useRef(null);
+    // Capture settings, adjusted by the server's rate_control events
+    const rateRef = useRef({ intervalMs: 1000, quality: 0.6, maxRegions: Infinity });
+    const nextRegionRef = useRef(0); // round-robin start when maxRegions < regions
+    const streamingUuidRef = useRef(null); // recording being streamed, for resume on reconnect
+    const fullFrameRef = useRef(false); // server crops regions from one full frame per tick
+    const frameCanvasRef = useRef(null); // reused for full-frame captures
 
     // Refs for Render Loop
     const regionsRef = useRef(regions);
@@ -174,7 +180,7 @@ function Recording() {
     const stopEverything = () => {
         console.log('[DEBUG] Stopping everything...');
         if (socketRef.current) socketRef.current.close();
-        if (streamIntervalRef.current) clearInterval(streamIntervalRef.current);
+        if (streamIntervalRef.current) clearTimeout(streamIntervalRef.current);
         if (videoRef.current && videoRef.current.srcObject) {
             videoRef.current.srcObject.getTracks().forEach(track => {
                 console.log('[DEBUG] Stopping track:', track.label);
@@ -188,7 +194,9 @@ function Recording() {
         console.log('[DEBUG] Initializing socket...');
         import('https://cdn.socket.io/4.5.4/socket.io.min.js').then(() => {
             console.log('[DEBUG] Socket.io loaded, connecting to:', API_URL);
-            socketRef.current = window.io(API_URL);
+            // WebSocket only: with several backend workers, long-polling
+            // requests could land on a worker that doesn't hold the connection
+            socketRef.current = window.io(API_URL, { transports: ['websocket'] });
             socketRef.current.on('region_text_result', (data) => {
                 console.log('[DEBUG] Received region text result:', data);
                 setRegionTexts(prev => ({
@@ -200,8 +208,27 @@ function Recording() {
                     }
                 }));
             });
+            socketRef.current.on('rate_control', (data) => {
+                console.log('[DEBUG] Rate control:', data);
+                rateRef.current = {
+                    intervalMs: data.target_interval_ms,
+                    quality: data.jpeg_quality,
+                    maxRegions: data.max_regions_per_tick
+                };
+            });
+            socketRef.current.on('stream_started', (data) => {
+                console.log('[DEBUG] Stream started, full frame mode:', data.full_frame);
+                fullFrameRef.current = data.full_frame;
+            });
+            socketRef.current.on('frame_dropped', (data) => {
+                console.warn('[DEBUG] Frame dropped by server:', data);
+            });
             socketRef.current.on('connect', () => {
                 console.log('[DEBUG] Socket connected');
+                // Reconnected mid-stream (possibly to another worker): pick up where we left off
+                if (streamingUuidRef.current) {
+                    socketRef.current.emit('start_stream', { recording_uuid: streamingUuidRef.current, resume: true });
+                }
             });
             socketRef.current.on('disconnect', () => {
                 console.log('[DEBUG] Socket disconnected');
@@ -376,7 +403,12 @@ function Recording() {
             await fetch(`${API_URL}/api/recordings/${currentRecordingUuid}/regions`, {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ num_regions: regions.length })
+                body: JSON.stringify({
+                    regions: regions.map(r => ({
+                        x: Math.round(r.x), y: Math.round(r.y),
+                        w: Math.round(r.width), h: Math.round(r.height)
+                    }))
+                })
             });
 
             const stream = canvasRef.current.captureStream(30);
@@ -411,9 +443,14 @@ function Recording() {
 
             setIsRecording(true);
 
+            streamingUuidRef.current = currentRecordingUuid;
             socketRef.current.emit('start_stream', { recording_uuid: currentRecordingUuid });
-            streamIntervalRef.current = setInterval(captureAndSendRegions, 1000);
-            console.log('[DEBUG] Stream interval started');
+            const tick = () => {
+                captureAndSendRegions();
+                streamIntervalRef.current = setTimeout(tick, rateRef.current.intervalMs);
+            };
+            streamIntervalRef.current = setTimeout(tick, rateRef.current.intervalMs);
+            console.log('[DEBUG] Stream capture loop started');
 
         } catch (error) {
             console.error('[DEBUG] Start stream error:', error);
@@ -421,43 +458,117 @@ function Recording() {
         }
     };
 
+    // Regions are sent as binary JPEG attachments (no base64 round trip)
     const captureAndSendRegions = () => {
         if (!videoRef.current) return;
-        const tmpCanvas = document.createElement('canvas');
-        const ctx = tmpCanvas.getContext('2d');
         const video = videoRef.current;
+        const timestamp = Date.now() / 1000;
+        const { quality, maxRegions } = rateRef.current;
+
+        // Full frame mode: one JPEG per tick, the server crops the regions
+        if (fullFrameRef.current) {
+            if (!frameCanvasRef.current) frameCanvasRef.current = document.createElement('canvas');
+            const frameCanvas = frameCanvasRef.current;
+            frameCanvas.width = video.videoWidth;
+            frameCanvas.height = video.videoHeight;
+            frameCanvas.getContext('2d').drawImage(video, 0, 0);
+            frameCanvas.toBlob(async (blob) => {
+                if (!blob || !socketRef.current) return;
+                socketRef.current.emit('process_frame', {
+                    image: await blob.arrayBuffer(),
+                    timestamp
+                });
+            }, 'image/jpeg', quality);
+            return;
+        }
+
+        // When the server limits regions per tick, rotate through them
+        let batch = regionsRef.current;
+        if (batch.length > maxRegions) {
+            const start = nextRegionRef.current % batch.length;
+            batch = [...batch.slice(start), ...batch.slice(0, start)].slice(0, maxRegions);
+            nextRegionRef.current = start + maxRegions;
+        }
 
-        regionsRef.current.forEach(region => {
+        batch.forEach(region => {
+            const tmpCanvas = document.createElement('canvas');
             tmpCanvas.width = region.width;
             tmpCanvas.height = region.height;
-            ctx.drawImage(video, region.x, region.y, region.width, region.height, 0, 0, region.width, region.height);
+            tmpCanvas.getContext('2d').drawImage(video, region.x, region.y, region.width, region.height, 0, 0, region.width, region.height);
+
+            tmpCanvas.toBlob(async (blob) => {
+                if (!blob || !socketRef.current) return;
+                socketRef.current.emit('process_region_image', {
+                    region_index: region.index,
+                    image: await blob.arrayBuffer(),
+                    timestamp
+                });
+            }, 'image/jpeg', quality);
+        });
+    };
 
-            const imageData = tmpCanvas.toDataURL('image/jpeg', 0.6);
-            socketRef.current.emit('process_region_image', {
-                region_index: region.index,
-                image: imageData,
-                timestamp: Date.now() / 1000
-            });
+    // Chunked, resumable upload: init -> PUT chunks at offset -> finalize
+    const uploadInChunks = async (blob, filename, duration, maxRetries = 5) => {
+        const base = `${API_URL}/api/recordings/${currentRecordingUuid}/uploads`;
+        const initRes = await fetch(base, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ filename, total_size: blob.size, mime_type: blob.type })
+        });
+        const init = await initRes.json();
+        if (!init.success) return init;
+
+        const { upload_id: uploadId, chunk_size: chunkSize } = init.data;
+        let offset = init.data.offset;
+        let retries = 0;
+
+        while (offset < blob.size) {
+            try {
+                const res = await fetch(`${base}/${uploadId}?offset=${offset}`, {
+                    method: 'PUT',
+                    headers: { 'Content-Type': 'application/octet-stream' },
+                    body: blob.slice(offset, offset + chunkSize)
+                });
+                const data = await res.json();
+                if (!data.success && res.status !== 409) return data;
+                offset = data.data.offset;
+                retries = 0;
+            } catch (err) {
+                if (++retries > maxRetries) throw err;
+                console.warn('[DEBUG] Chunk failed, resuming:', err);
+                await new Promise(resolve => setTimeout(resolve, 1000 * retries));
+                const status = await fetch(`${base}/${uploadId}`).then(r => r.json()).catch(() => null);
+                if (status?.success) offset = status.data.offset;
+            }
+        }
+
+        // crypto.subtle only exists on secure origins (https, localhost);
+        // elsewhere the upload is finalized without a checksum
+        let sha256;
+        if (window.crypto?.subtle) {
+            const digest = await crypto.subtle.digest('SHA-256', await blob.arrayBuffer());
+            sha256 = Array.from(new Uint8Array(digest)).map(b => b.toString(16).padStart(2, '0')).join('');
+        }
+        const res = await fetch(`${base}/${uploadId}/finalize`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ sha256, duration })
         });
+        return res.json();
     };
 
     const handleStopStream = async () => {
         console.log('[DEBUG] Stopping stream');
-        clearInterval(streamIntervalRef.current);
+        clearTimeout(streamIntervalRef.current);
+        streamingUuidRef.current = null;
         if (mediaRecorderRef.current) mediaRecorderRef.current.stop();
 
         setTimeout(async () => {
             const blob = new Blob(recordedChunksRef.current, { type: 'video/webm' });
             console.log('[DEBUG] Final recording blob size:', blob.size);
-            const formData = new FormData();
-            formData.append('file', blob, 'recording.webm');
-            formData.append('duration', Math.floor(Date.now() / 1000));
 
             try {
-                const res = await fetch(`${API_URL}/api/recordings/${currentRecordingUuid}/upload`, {
-                    method: 'POST', body: formData
-                });
-                const data = await res.json();
+                const data = await uploadInChunks(blob, 'recording.webm', Math.floor(Date.now() / 1000));
                 console.log('[DEBUG] Upload response:', data);
                 if (data.success) {
                     socketRef.current.emit('stop_stream');